@@ -0,0 +1,227 @@
+"""
+Monte Carlo lookahead autopilot: scores short rollouts from cloned game state within a per-tick time budget
+"""
+
+import argparse
+import random
+import sys
+import time
+import numpy as np
+
+# Held keys an autopilot decision sets, in InputFrame field names
+DRIVE_FIELDS = ("up", "down", "left", "right", "shoot")
+# Candidate actions. The gun costs nothing but its cooldown, so every default candidate fires;
+# the search is over how to rotate and move
+DEFAULT_ACTIONS = (
+    {"up": True, "shoot": True},
+    {"up": True, "left": True, "shoot": True},
+    {"up": True, "right": True, "shoot": True},
+    {"left": True, "shoot": True},
+    {"right": True, "shoot": True},
+    {"down": True, "shoot": True},
+)
+# Rollout score terms: kills, damage levels and losing the tank; enemies enclosed by the trail,
+# how close the trail is to closing a loop and how close free enemies are to the tank
+DEFAULT_WEIGHTS = {"kill": 10.0, "damage": 25.0, "death": 100.0, "enclosed": 4.0, "loop": 1.0, "risk": 2.0}
+LOOP_GAP = 200  # Head-to-tail distance (pixels) at which a trail counts as nowhere near a loop
+RISK_RADIUS = 80  # Enemies further than this from the head carry no contact risk
+
+class Autopilot:
+    """Drives the tank by simulating where each candidate action leads.
+
+    Every `interval` ticks it commits to one of `actions` (held-key dicts).
+    While that action plays out it already knows the state the game will be
+    in when it ends - the game is deterministic, so stepping a clone with the
+    committed action gets there exactly - and spends up to `budget` seconds
+    per tick running rollouts from that predicted state: restore a private
+    clone from the snapshot, hold a candidate for `interval` ticks, continue
+    with random candidates to `horizon` ticks, and score the result with
+    `weights` (see DEFAULT_WEIGHTS). The candidate with the best mean score
+    is committed next. Rollouts are resumable, so a budget smaller than one
+    rollout still makes progress every tick.
+
+    With `budget=None` each decision instead gets exactly `rollouts`
+    rollouts, which makes the driving reproducible for a given `seed` (sweeps
+    and benchmarks); with a budget the rollout count depends on machine
+    speed. `frame_class` is the game's InputFrame and `width`/`height` the
+    wrapping screen size. rollout_ticks and search_time measure the
+    simulation throughput the search achieved.
+    """
+    def __init__(self, frame_class, width, height, budget=0.005, interval=10, horizon=30, rollouts=None,
+                 actions=DEFAULT_ACTIONS, weights=None, seed=None, clock=time.perf_counter):
+        if budget is None and not rollouts:
+            raise ValueError("an autopilot without a time budget needs a rollout count")
+        self.width = width
+        self.height = height
+        self.budget = budget
+        self.interval = interval
+        self.horizon = max(horizon, interval)
+        self.rollouts = rollouts
+        self.actions = [{field: bool(action.get(field)) for field in DRIVE_FIELDS} for action in actions]
+        self.frames = [frame_class(**action) for action in self.actions]
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.action = 0  # Candidate being played
+        self.remaining = 0  # Ticks until the next decision
+        self.clone = None  # Private game the rollouts run in
+        self.buffer = None  # Snapshot of the real game
+        self.root = None  # Snapshot of the predicted state at the next decision
+        self.root_kills = 0
+        self.root_damage = 0
+        self.totals = np.zeros(len(self.actions))
+        self.counts = np.zeros(len(self.actions), dtype=np.int64)
+        self.completed = 0  # Rollouts finished for the next decision
+        self.cursor = None  # [candidate, ticks done, frame held] of the rollout in progress
+        self.decisions = 0
+        self.rollout_ticks = 0
+        self.search_time = 0.0
+
+    def drive(self, state):
+        """Held keys (every DRIVE_FIELDS entry) for the game's next tick"""
+        start = self.clock()
+        if self.remaining <= 0:
+            if self.root is not None and self.budget is None:
+                self.search(None)
+            if self.counts.any():
+                means = np.where(self.counts > 0, self.totals / np.maximum(self.counts, 1), -np.inf)
+                self.action = int(np.argmax(means))
+            self.decisions += 1
+            self.predict(state)
+        self.remaining -= 1
+        if self.budget is not None:
+            self.search(start + self.budget)
+        self.search_time += self.clock() - start
+        return dict(self.actions[self.action])
+
+    def predict(self, state):
+        """Step the clone through the committed action to the next decision point and root the search there"""
+        self.buffer = state.snapshot(self.buffer)
+        if self.clone is None:
+            self.clone = state.clone(self.buffer)
+        else:
+            self.clone.restore(self.buffer)
+        clone = self.clone
+        frame = self.frames[self.action]
+        for _ in range(self.interval):
+            if not clone.step(frame):
+                break
+        self.rollout_ticks += self.interval
+        self.root = clone.snapshot(self.root)
+        self.root_kills = clone.shot_kills + clone.trap_kills
+        self.root_damage = clone.tank_snake.damage_level
+        self.remaining = self.interval
+        self.totals[:] = 0
+        self.counts[:] = 0
+        self.completed = 0
+        self.cursor = None
+
+    def search(self, deadline):
+        """Run rollouts until `deadline` (clock time) or, without one, until the rollout count is reached"""
+        clone = self.clone
+        candidates = len(self.actions)
+        while self.rollouts is None or self.completed < self.rollouts:
+            if self.cursor is None:
+                candidate = self.completed % candidates
+                clone.restore(self.root)
+                self.cursor = [candidate, 0, self.frames[candidate]]
+            cursor = self.cursor
+            while cursor[1] < self.horizon and clone.running:
+                if cursor[1] % self.interval == 0 and cursor[1] and self.completed >= candidates:
+                    # After each candidate's first rollout (held throughout), continue at random
+                    cursor[2] = self.frames[self.rng.randrange(candidates)]
+                clone.step(cursor[2])
+                cursor[1] += 1
+                self.rollout_ticks += 1
+                if deadline is not None and self.clock() >= deadline:
+                    return
+            self.totals[cursor[0]] += self.score(clone)
+            self.counts[cursor[0]] += 1
+            self.completed += 1
+            self.cursor = None
+            if deadline is not None and self.clock() >= deadline:
+                return
+
+    def score(self, state):
+        """Value of where a rollout ended up, relative to the search root"""
+        weights = self.weights
+        tank_snake = state.tank_snake
+        kills = state.shot_kills + state.trap_kills - self.root_kills
+        score = weights["kill"] * kills - weights["damage"] * (tank_snake.damage_level - self.root_damage)
+        if not state.running:
+            score -= weights["death"]
+
+        head_x, head_y = tank_snake.segments.head()
+        enemies = state.enemies
+        n = enemies.count
+        xs = enemies.x[:n]
+        ys = enemies.y[:n]
+        if tank_snake.trap_active:
+            enclosed = np.count_nonzero(enemies.trapped[:n])
+        else:
+            enclosed = np.count_nonzero(tank_snake.trapped_mask(xs, ys))
+        score += weights["enclosed"] * enclosed
+
+        # The auto-trap polygon closes from the head back to the oldest visible segment
+        poly_x, poly_y, _ = tank_snake.segments.views(min_lifetime=180)
+        if len(poly_x) >= 8:
+            gap = self.wrapped_distance(poly_x[-1] - head_x, poly_y[-1] - head_y)
+            score += weights["loop"] * max(0.0, 1 - gap / LOOP_GAP)
+
+        free = ~enemies.trapped[:n].astype(bool)
+        if free.any():
+            distance = self.wrapped_distance(xs[free] - head_x, ys[free] - head_y)
+            score -= weights["risk"] * float(np.sum(np.clip(1 - distance / RISK_RADIUS, 0, None) ** 2))
+        return score
+
+    def wrapped_distance(self, dx, dy):
+        """Length of the shortest offset across the wrapping screen"""
+        dx = (dx + self.width / 2) % self.width - self.width / 2
+        dy = (dy + self.height / 2) % self.height - self.height / 2
+        return np.sqrt(dx * dx + dy * dy)
+
+    def rollout_rate(self):
+        """Simulated ticks per second of search time so far"""
+        return self.rollout_ticks / self.search_time if self.search_time else 0.0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play headless games with the lookahead autopilot and report "
+                                                 "its results and rollout throughput")
+    parser.add_argument("--games", type=int, default=4, help="games to play (default: %(default)s)")
+    parser.add_argument("--ticks", type=int, default=1800, help="tick limit per game (default: %(default)s)")
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="search milliseconds per tick, 0 for a fixed rollout count (default: %(default)s)")
+    parser.add_argument("--rollouts", type=int, default=12,
+                        help="rollouts per decision when --budget is 0 (default: %(default)s)")
+    parser.add_argument("--interval", type=int, default=10, help="ticks per decision (default: %(default)s)")
+    parser.add_argument("--horizon", type=int, default=30, help="ticks per rollout (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    import sherman_tank_snake as game
+    budget = args.budget / 1000 if args.budget > 0 else None
+    rollout_ticks = 0
+    search_time = 0.0
+    worst_tick = 0.0
+    for seed in range(args.seed, args.seed + args.games):
+        state = game.GameState(seed)
+        pilot = Autopilot(game.InputFrame, game.SCREEN_WIDTH, game.SCREEN_HEIGHT, budget=budget,
+                          interval=args.interval, horizon=args.horizon,
+                          rollouts=None if budget else args.rollouts, seed=seed)
+        while state.frame_count < args.ticks:
+            start = time.perf_counter()
+            keys = pilot.drive(state)
+            worst_tick = max(worst_tick, time.perf_counter() - start)
+            if not state.step(game.InputFrame(**keys)):
+                break
+        rollout_ticks += pilot.rollout_ticks
+        search_time += pilot.search_time
+        print(f"🤖 seed {seed}: {state.frame_count} ticks, {'survived' if state.running else 'destroyed'}, "
+              f"{state.shot_kills} shot / {state.trap_kills} trap kills, "
+              f"damage {state.tank_snake.damage_level}/{state.tank_snake.max_damage}, {pilot.decisions} decisions")
+    print(f"⚡ {rollout_ticks:,} rollout ticks in {search_time:.2f}s: {rollout_ticks / search_time:,.0f} ticks/s; "
+          f"slowest tick {worst_tick * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,620 @@
+"""
+Batched simulation: N games held in stacked NumPy arrays and stepped together, tick for tick like GameState
+"""
+
+import argparse
+import random
+import sys
+import time
+import numpy as np
+from sherman_tank_snake import (GameState, EnemySwarm, Bullet, InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT,
+                                SNAPSHOT_LAYOUT, SNAPSHOT_HEADER, SNAPSHOT_SCALARS, RNG_WORDS, TRAPPED_WIDTH,
+                                snapshot_number)
+from headings import HEADINGS
+from replay import INPUT_BITS, unpack_input
+
+# Input bitfields use the replay layout: bit i is INPUT_BITS[i]
+BITS = {field: 1 << i for i, field in enumerate(INPUT_BITS)}
+# Values kept for an enemy that leaves the swarm while trapped (GameState snapshots hold them by value)
+GHOST_COLUMNS = ("x", "y", "speed", "size", "avoidance_radius", "trapped")
+
+class GameBatch:
+    """N independent games in one set of arrays, advanced together by step(inputs).
+
+    Every per-game quantity of GameState is a length-N array (tick, kills,
+    tank heading, speed, damage, trap timer, ...) and the variable-length
+    parts are padded 2-D arrays with a per-game count: the trail head first
+    (column 0 is the tank head), enemies in swarm order and bullets in
+    firing order. One step() moves every running game through the same
+    phases as GameState.step - input, movement and trail ageing, traps,
+    bullets, enemies, spawns - with whole-batch array operations; the only
+    per-game Python left is the spawn RNG (each game keeps its own
+    random.Random) and bookkeeping for enemies shot while trapped.
+
+    The batch follows the single-game rules exactly, including the parts
+    that decide floating-point results and ordering: trail pushes are
+    summed head first as EnemySwarm.update sums them, enemies leave by
+    swap-remove in the order GameState removes them, and heading vectors
+    come from a table of exactly the math.cos/math.sin values GameState
+    computes. snapshot(game) therefore returns the array
+    GameState.snapshot() would for that game, bit for bit (verify() checks
+    this), and game(i) hands one game over to a regular GameState.
+
+    Games stop advancing once they are over (tank destroyed or quit), like
+    a loop that stops calling GameState.step when it returns False.
+    """
+    def __init__(self, seeds, max_enemies=6, spawn_interval=300, wave_size=1, initial_enemies=4,
+                 max_length=12, invulnerable=False):
+        seeds = list(seeds)
+        n = self.num_games = len(seeds)
+        # Tunables come from a template game, so the two engines can't drift apart
+        template = GameState(initial_enemies=0, max_enemies=max_enemies, spawn_interval=spawn_interval,
+                             wave_size=wave_size, max_length=max_length, invulnerable=invulnerable)
+        tank_snake = template.tank_snake
+        for name in GameState.SNAPSHOT_FIELDS + GameState.TANK_SNAPSHOT_FIELDS:
+            setattr(self, name, getattr(template, name) if hasattr(template, name) else getattr(tank_snake, name))
+        self.lifetime = tank_snake.segments.lifetime
+        bullet = Bullet(0, 0, 0)
+        self.bullet_speed = bullet.speed
+        self.bullet_size = bullet.size
+        enemy = EnemySwarm(capacity=1).add(0, 0)
+        self.enemy_defaults = (enemy.speed, enemy.size, enemy.avoidance_radius)
+
+        # Per-game values (the same names as the GameState/TankSnake attributes they mirror)
+        self.frame_count = np.zeros(n, dtype=np.int64)
+        self.running = np.ones(n, dtype=bool)
+        self.shot_kills = np.zeros(n, dtype=np.int64)
+        self.trap_kills = np.zeros(n, dtype=np.int64)
+        self.last_shot_time = np.zeros(n, dtype=np.int64)
+        self.direction = np.full(n, float(tank_snake.direction))
+        self.speed = np.full(n, float(tank_snake.speed))
+        self.rotation_speed = np.full(n, float(tank_snake.rotation_speed))
+        self.move_counter = np.zeros(n, dtype=np.int64)
+        self.trap_active = np.zeros(n, dtype=bool)
+        self.trap_timer = np.zeros(n, dtype=np.int64)
+        self.damage_level = np.zeros(n, dtype=np.int64)
+        head_x, head_y = tank_snake.segments.head()
+        self.previous_head_x = np.full(n, float(head_x))
+        self.previous_head_y = np.full(n, float(head_y))
+
+        # Trail, head first: column 0 is the tank head, trail_count entries per game
+        capacity = max_length + 1
+        self.trail_x = np.full((n, capacity), float(head_x))
+        self.trail_y = np.full((n, capacity), float(head_y))
+        self.trail_birth = np.full((n, capacity), np.inf)
+        self.trail_count = np.ones(n, dtype=np.int64)
+        self.trail_tick = np.zeros(n, dtype=np.int64)
+        self.trail_slots = np.arange(capacity)
+
+        # Enemies in swarm order; uid identifies an enemy across swap-removes, rank is its place in the trap list
+        self.enemy_count = np.zeros(n, dtype=np.int64)
+        self.next_uid = np.zeros(n, dtype=np.int64)
+        self._allocate_enemies(max(max_enemies, initial_enemies, 1))
+        self.ghosts = [[] for _ in range(n)]  # (rank, GHOST_COLUMNS values) of trapped enemies since shot
+
+        # Bullets in firing order
+        self.bullet_count = np.zeros(n, dtype=np.int64)
+        self._allocate_bullets(4)
+
+        self.rngs = [random.Random(seed) for seed in seeds]
+        for game in range(n):
+            for _ in range(initial_enemies):
+                self._spawn(game)
+
+    def _allocate_enemies(self, slots):
+        """(Re)allocate the enemy columns with `slots` slots per game, keeping their contents"""
+        n = self.num_games
+        old = getattr(self, "enemy_slots", np.arange(0))
+        for name in GameState.ENEMY_COLUMNS + ("uid", "rank"):
+            dtype = bool if name == "trapped" else np.int64 if name in ("uid", "rank") else float
+            column = np.zeros((n, slots), dtype=dtype)
+            if len(old):
+                column[:, :len(old)] = getattr(self, "enemy_" + name)
+            setattr(self, "enemy_" + name, column)
+        self.enemy_columns = [getattr(self, "enemy_" + name) for name in GameState.ENEMY_COLUMNS + ("uid", "rank")]
+        self.enemy_slots = np.arange(slots)
+
+    def _allocate_bullets(self, slots):
+        """(Re)allocate the bullet columns with `slots` slots per game, keeping their contents"""
+        old = getattr(self, "bullet_slots", np.arange(0))
+        for name in GameState.BULLET_FIELDS:
+            column = np.zeros((self.num_games, slots))
+            if len(old):
+                column[:, :len(old)] = getattr(self, "bullet_" + name)
+            setattr(self, "bullet_" + name, column)
+        self.bullet_columns = [getattr(self, "bullet_" + name) for name in GameState.BULLET_FIELDS]
+        self.bullet_slots = np.arange(slots)
+
+    def __len__(self):
+        return self.num_games
+
+    def step(self, inputs):
+        """Advance every running game by one tick; `inputs` holds one replay-layout bitfield per game.
+
+        Returns the `running` array (games that are over are left as they were).
+        """
+        inputs = np.asarray(inputs)
+        live = self.running.copy()
+        if not live.any():
+            return self.running
+        self.frame_count += live
+        np.copyto(self.enemy_prev_x, self.enemy_x, where=live[:, None])
+        np.copyto(self.enemy_prev_y, self.enemy_y, where=live[:, None])
+
+        self.handle_input(live, inputs)
+        self.update_movement(live, inputs)
+        self.update_traps(live)
+        self.update_bullets(live)
+        self.update_enemies(live)
+        self.spawn_enemies(live)
+        return self.running
+
+    def handle_input(self, live, inputs):
+        """Quit, manual trap detonation and shooting"""
+        self.running[live & (inputs & BITS["quit"] != 0)] = False
+        detonate = live & (inputs & BITS["trap"] != 0) & self.trap_active
+        if detonate.any():
+            self.detonate_traps(np.flatnonzero(detonate))
+
+        shoot = live & (inputs & BITS["shoot"] != 0) & (self.frame_count - self.last_shot_time > self.shot_cooldown)
+        if shoot.any():
+            games = np.flatnonzero(shoot)
+            if self.bullet_count.max() == len(self.bullet_slots):
+                self._allocate_bullets(2 * len(self.bullet_slots))
+            slot = self.bullet_count[games]
+            direction = self.direction[games]
+            cos_a, sin_a = HEADINGS.vectors(direction)
+            for name, values in (("x", self.trail_x[games, 0]), ("y", self.trail_y[games, 0]),
+                                 ("direction", direction), ("velocity_x", cos_a * self.bullet_speed),
+                                 ("velocity_y", sin_a * self.bullet_speed), ("prev_x", self.trail_x[games, 0]),
+                                 ("prev_y", self.trail_y[games, 0])):
+                getattr(self, "bullet_" + name)[games, slot] = values
+            self.bullet_count[games] += 1
+            self.last_shot_time[games] = self.frame_count[games]
+
+    def update_movement(self, live, inputs):
+        """Rotation, driving, trail emission and expiry, and the screen wrap"""
+        np.copyto(self.previous_head_x, self.trail_x[:, 0], where=live)
+        np.copyto(self.previous_head_y, self.trail_y[:, 0], where=live)
+
+        # Right wins over left; damage slows turning on top of the damaged rotation speed
+        rotation = np.where(inputs & BITS["right"] != 0, self.rotation_speed,
+                            np.where(inputs & BITS["left"] != 0, -self.rotation_speed, 0.0))
+        rotation = np.where(self.damage_level > 0, rotation * (1 - self.damage_level * 0.2), rotation)
+        np.copyto(self.direction, np.mod(self.direction + rotation, 360), where=live)
+
+        forward = live & (inputs & BITS["up"] != 0)
+        reverse = live & ~forward & (inputs & BITS["down"] != 0)
+        games = np.flatnonzero(forward | reverse)
+        if len(games):
+            speed = np.where(forward[games], self.speed[games], -self.speed[games] * 0.6)
+            cos_a, sin_a = HEADINGS.vectors(self.direction[games])
+            self.trail_x[games, 0] += cos_a * speed
+            self.trail_y[games, 0] += sin_a * speed
+            self.move_counter[games] += 1
+            self.push_heads(games[self.move_counter[games] >= self.move_threshold])
+
+        # Age the trails and drop expired segments (always the oldest ones; the head never expires)
+        self.trail_tick += live
+        expired = (self.lifetime - (self.trail_tick[:, None] - self.trail_birth) <= 0) & \
+                  (self.trail_slots < self.trail_count[:, None])
+        self.trail_count -= np.count_nonzero(expired, axis=1)
+
+        head_x = self.trail_x[:, 0]
+        head_y = self.trail_y[:, 0]
+        np.copyto(head_x, np.where(head_x < 0, SCREEN_WIDTH, np.where(head_x > SCREEN_WIDTH, 0, head_x)), where=live)
+        np.copyto(head_y, np.where(head_y < 0, SCREEN_HEIGHT, np.where(head_y > SCREEN_HEIGHT, 0, head_y)), where=live)
+
+    def push_heads(self, games):
+        """Leave each game's head behind as a trail segment, dropping the oldest past max_length"""
+        if not len(games):
+            return
+        self.trail_birth[games, 0] = self.trail_tick[games]
+        for column in (self.trail_x, self.trail_y, self.trail_birth):
+            column[games, 1:] = column[games, :-1]
+        self.trail_birth[games, 0] = np.inf
+        count = self.trail_count[games] + 1
+        self.trail_count[games] = np.where((count > self.max_length) & (count > 1), count - 1, count)
+        self.move_counter[games] = 0
+
+    def visible_segments(self, min_lifetime=0):
+        """Trail entries per game with more than `min_lifetime` ticks left - a head-first prefix, as in TrailBuffer.views"""
+        visible = self.trail_birth > (self.trail_tick - self.lifetime + min_lifetime)[:, None]
+        return np.count_nonzero(visible & (self.trail_slots < self.trail_count[:, None]), axis=1)
+
+    def update_traps(self, live):
+        """Auto-trap checks and trap countdowns"""
+        check = live & (self.frame_count % self.trap_check_interval == 0) & ~self.trap_active & (self.trail_count >= 8)
+        if check.any():
+            self.check_auto_traps(np.flatnonzero(check))
+        armed = live & self.trap_active
+        self.trap_timer -= armed
+        expired = armed & (self.trap_timer <= 0)
+        if expired.any():
+            self.detonate_traps(np.flatnonzero(expired))
+
+    def check_auto_traps(self, games):
+        """Arm the trap in each of `games` whose trail polygon encloses an enemy"""
+        corners = self.visible_segments(min_lifetime=180)[games]
+        games = games[corners >= 8]
+        corners = corners[corners >= 8]
+        if not len(games):
+            return
+        inside = self.points_in_polygons(games, corners) & (self.enemy_slots < self.enemy_count[games, None])
+        armed = inside.any(axis=1)
+        games = games[armed]
+        inside = inside[armed]
+        self.trap_active[games] = True
+        self.trap_timer[games] = self.trap_duration
+        self.enemy_trapped[games] |= inside
+        self.enemy_rank[games] = np.cumsum(inside, axis=1) - 1
+
+    def points_in_polygons(self, games, corners):
+        """(games, enemy slots) mask of enemies inside each game's first `corners` trail points.
+
+        The same edges and crossing arithmetic as TankSnake.points_in_polygon,
+        with every game's polygon padded to the trail capacity.
+        """
+        xs = self.enemy_x[games][:, :, None]
+        ys = self.enemy_y[games][:, :, None]
+        following = (self.trail_slots + 1) % corners[:, None]
+        p1x = self.trail_x[games]
+        p1y = self.trail_y[games]
+        p2x = np.take_along_axis(p1x, following, axis=1)[:, None, :]
+        p2y = np.take_along_axis(p1y, following, axis=1)[:, None, :]
+        p1x = p1x[:, None, :]
+        p1y = p1y[:, None, :]
+        edges = (self.trail_slots < corners[:, None])[:, None, :]
+        dx = p2x - p1x
+        dy = np.where(p1y != p2y, p2y - p1y, 1.0)
+        crosses = edges & (ys > np.minimum(p1y, p2y)) & (ys <= np.maximum(p1y, p2y)) & (xs <= np.maximum(p1x, p2x))
+        crosses &= (p1x == p2x) | (xs <= (ys - p1y) * dx / dy + p1x)
+        return np.count_nonzero(crosses, axis=2) % 2 == 1
+
+    def detonate_traps(self, games):
+        """Detonate the traps of `games`, removing their trapped enemies in the order they were caught"""
+        self.trap_active[games] = False
+        self.trap_timer[games] = 0
+        trapped = self.enemy_trapped[games] & (self.enemy_slots < self.enemy_count[games, None])
+        order = np.argsort(np.where(trapped, self.enemy_rank[games], len(self.enemy_slots)), axis=1, kind="stable")
+        counts = np.count_nonzero(trapped, axis=1)
+        self.remove_enemies(games, np.take_along_axis(self.enemy_uid[games], order, axis=1), counts)
+        self.trap_kills[games] += counts
+        for game in games.tolist():
+            self.ghosts[game] = []
+
+    def remove_enemies(self, games, uids, counts):
+        """Swap-remove enemies by uid: the first counts[i] of uids[i] from games[i], in order"""
+        for r in range(uids.shape[1] if len(games) else 0):
+            pick = counts > r
+            if not pick.any():
+                break
+            g = games[pick]
+            last = self.enemy_count[g] - 1
+            slot = ((self.enemy_uid[g] == uids[pick, r, None]) & (self.enemy_slots <= last[:, None])).argmax(axis=1)
+            # A trapped enemy shot before its trap goes off stays in the trap list by value
+            ghost = self.enemy_trapped[g, slot] & self.trap_active[g]
+            for game, i in zip(g[ghost].tolist(), slot[ghost].tolist()):
+                self.ghosts[game].append((int(self.enemy_rank[game, i]),
+                                          [getattr(self, "enemy_" + name)[game, i] for name in GHOST_COLUMNS]))
+            for column in self.enemy_columns:
+                column[g, slot] = column[g, last]
+            self.enemy_count[g] = last
+
+    def update_bullets(self, live):
+        """Move bullets and resolve hits, one bullet position of every game at a time (firing order decides ties)"""
+        counts = np.where(live, self.bullet_count, 0)
+        rounds = int(counts.max())
+        if rounds == 0:
+            return
+        keep = self.bullet_slots < counts[:, None]
+        valid = self.enemy_slots < self.enemy_count[:, None]
+        shot = np.zeros(valid.shape, dtype=bool)
+        shots = np.zeros(self.num_games, dtype=np.int64)
+        shot_uids = np.zeros((self.num_games, rounds), dtype=np.int64)
+        for j in range(rounds):
+            games = np.flatnonzero(counts > j)
+            x = self.bullet_x[games, j]
+            y = self.bullet_y[games, j]
+            self.bullet_prev_x[games, j] = x
+            self.bullet_prev_y[games, j] = y
+            x = x + self.bullet_velocity_x[games, j]
+            y = y + self.bullet_velocity_y[games, j]
+            self.bullet_x[games, j] = x
+            self.bullet_y[games, j] = y
+            gone = (x < 0) | (x > SCREEN_WIDTH) | (y < 0) | (y > SCREEN_HEIGHT)
+            keep[games[gone], j] = False
+            games = games[~gone]
+
+            # Each bullet takes the lowest-slot enemy it touches that no earlier bullet took
+            distance = np.sqrt((x[~gone, None] - self.enemy_x[games])**2 + (y[~gone, None] - self.enemy_y[games])**2)
+            hit = valid[games] & ~shot[games] & (distance < self.bullet_size + self.enemy_size[games])
+            first = hit.argmax(axis=1)
+            games, first = games[hit.any(axis=1)], first[hit.any(axis=1)]
+            keep[games, j] = False
+            shot[games, first] = True
+            shot_uids[games, shots[games]] = self.enemy_uid[games, first]
+            shots[games] += 1
+
+        # Close the gaps left by spent bullets, keeping firing order
+        order = np.argsort(~keep, axis=1, kind="stable")
+        for column in self.bullet_columns:
+            column[:] = np.take_along_axis(column, order, axis=1)
+        self.bullet_count = np.where(live, np.count_nonzero(keep, axis=1), self.bullet_count)
+
+        games = np.flatnonzero(shots)
+        if len(games):
+            self.remove_enemies(games, shot_uids[games], shots[games])
+            self.shot_kills += shots
+
+    def update_enemies(self, live):
+        """Trail avoidance, pursuit, wrapping and enemy-tank collisions"""
+        valid = live[:, None] & (self.enemy_slots < self.enemy_count[:, None])
+        if not valid.any():
+            return
+        x = self.enemy_x
+        y = self.enemy_y
+        speed = self.enemy_speed
+        head_x = self.trail_x[:, :1]
+        head_y = self.trail_y[:, :1]
+
+        # Avoidance: every (enemy, visible trail point) pair inside the enemy's radius pushes it away
+        points = self.trail_slots < self.visible_segments()[:, None]
+        dx = x[:, :, None] - self.trail_x[:, None, :]
+        dy = y[:, :, None] - self.trail_y[:, None, :]
+        distance = np.sqrt(dx * dx + dy * dy)
+        radius = self.enemy_avoidance_radius[:, :, None]
+        close = valid[:, :, None] & points[:, None, :] & (distance < radius) & (distance > 0)
+        game, slot, point = np.nonzero(close)
+        if len(game):
+            # nonzero() lists each enemy's pairs in trail order (head first), the order the game sums them in
+            radius = self.enemy_avoidance_radius[game, slot]
+            pair_distance = distance[game, slot, point]
+            push = (radius - pair_distance) / radius * (speed[game, slot] * 2) / pair_distance
+            enemy = game * x.shape[1] + slot
+            np.add(x, np.bincount(enemy, weights=dx[game, slot, point] * push, minlength=x.size).reshape(x.shape),
+                   out=x, where=valid)
+            np.add(y, np.bincount(enemy, weights=dy[game, slot, point] * push, minlength=y.size).reshape(y.shape),
+                   out=y, where=valid)
+
+        # Pursuit along the shortest wrapped path; trapped enemies hold still
+        free = valid & ~self.enemy_trapped
+        dx = head_x - x
+        dy = head_y - y
+        dx = np.where(np.abs(dx) > SCREEN_WIDTH / 2, dx - np.copysign(SCREEN_WIDTH, dx), dx)
+        dy = np.where(np.abs(dy) > SCREEN_HEIGHT / 2, dy - np.copysign(SCREEN_HEIGHT, dy), dy)
+        distance = np.sqrt(dx * dx + dy * dy)
+        chase = free & (distance > 30)
+        safe_distance = np.where(chase, distance, 1.0)
+        np.add(x, np.where(chase, dx / safe_distance * speed, 0.0), out=x, where=valid)
+        np.add(y, np.where(chase, dy / safe_distance * speed, 0.0), out=y, where=valid)
+        x[free & (x < 0)] = SCREEN_WIDTH
+        x[free & (x > SCREEN_WIDTH)] = 0
+        y[free & (y < 0)] = SCREEN_HEIGHT
+        y[free & (y > SCREEN_HEIGHT)] = 0
+
+        # Tank collisions in slot order: each hit costs a damage level until one destroys the tank
+        distance = np.sqrt((x - head_x)**2 + (y - head_y)**2)
+        hit = valid & (distance < 25)
+        if not hit.any():
+            return
+        if self.invulnerable:
+            pushed = hit
+        else:
+            hits = np.cumsum(hit, axis=1)
+            needed = self.max_damage - self.damage_level
+            pushed = hit & ((hits < needed[:, None]) | (needed[:, None] <= 0))
+            taken = np.clip(np.minimum(hits[:, -1], needed), 0, None)
+            damaged = np.flatnonzero(taken)
+            self.damage_level[damaged] += taken[damaged]
+            level = self.damage_level[damaged]
+            self.speed[damaged] = self.base_speed * (1 - level * 0.15)
+            self.rotation_speed[damaged] = self.base_rotation_speed * (1 - level * 0.2)
+            self.running[(needed > 0) & (hits[:, -1] >= needed)] = False
+
+        # Bounce the enemies that hit off the tank, keeping them on screen
+        pushed &= distance > 0
+        safe_distance = np.where(pushed, distance, 1.0)
+        size = self.enemy_size
+        pushed_x = np.maximum(size, np.minimum(SCREEN_WIDTH - size, x + (x - head_x) / safe_distance * 30))
+        pushed_y = np.maximum(size, np.minimum(SCREEN_HEIGHT - size, y + (y - head_y) / safe_distance * 30))
+        np.copyto(x, pushed_x, where=pushed)
+        np.copyto(y, pushed_y, where=pushed)
+
+    def spawn_enemies(self, live):
+        """Spawn waves in the games that are due one, each from its own RNG"""
+        due = live & (self.enemy_count < self.max_enemies) & (self.frame_count % self.spawn_interval == 0)
+        for game in np.flatnonzero(due).tolist():
+            for _ in range(min(self.wave_size, self.max_enemies - int(self.enemy_count[game]))):
+                self._spawn(game)
+
+    def _spawn(self, game):
+        """Add an enemy at a random position, drawn exactly as GameState.spawn_enemy does"""
+        rng = self.rngs[game]
+        x = rng.randint(50, SCREEN_WIDTH - 50)
+        y = rng.randint(50, SCREEN_HEIGHT - 50)
+        i = int(self.enemy_count[game])
+        if i == len(self.enemy_slots):
+            self._allocate_enemies(2 * i)
+        speed, size, avoidance_radius = self.enemy_defaults
+        for name, value in zip(GameState.ENEMY_COLUMNS + ("uid", "rank"),
+                               (x, y, speed, size, avoidance_radius, False, x, y, self.next_uid[game], 0)):
+            getattr(self, "enemy_" + name)[game, i] = value
+        self.next_uid[game] += 1
+        self.enemy_count[game] = i + 1
+
+    def _value(self, name, game):
+        value = getattr(self, name)
+        return value[game] if isinstance(value, np.ndarray) else value
+
+    def snapshot(self, game, out=None):
+        """GameState.snapshot() of one game in the batch - the same array, value for value"""
+        n, m, b = int(self.enemy_count[game]), int(self.trail_count[game]), int(self.bullet_count[game])
+        trapped = [(int(self.enemy_rank[game, i]), [i] + [getattr(self, "enemy_" + name)[game, i] for name in GHOST_COLUMNS])
+                   for i in np.flatnonzero(self.enemy_trapped[game, :n]).tolist()]
+        trapped += [(rank, [-1] + values) for rank, values in self.ghosts[game]]
+        trapped.sort(key=lambda entry: entry[0])
+        t = len(trapped)
+        size = SNAPSHOT_HEADER + SNAPSHOT_SCALARS + RNG_WORDS + len(GameState.ENEMY_COLUMNS) * n + 3 * m + \
+            len(GameState.BULLET_FIELDS) * b + TRAPPED_WIDTH * t
+        if out is None or len(out) < size:
+            out = np.empty(size)
+
+        version, words, gauss_next = self.rngs[game].getstate()
+        out[:SNAPSHOT_HEADER] = (SNAPSHOT_LAYOUT, size, n, m, b, t)
+        pos = SNAPSHOT_HEADER
+        scalars = [self._value(name, game) for name in GameState.SNAPSHOT_FIELDS + GameState.TANK_SNAPSHOT_FIELDS]
+        scalars += [self.previous_head_x[game], self.previous_head_y[game], self.trail_tick[game], self.lifetime,
+                    version, gauss_next is not None, gauss_next or 0.0]
+        out[pos:pos + SNAPSHOT_SCALARS] = scalars
+        pos += SNAPSHOT_SCALARS
+        out[pos:pos + RNG_WORDS] = words
+        pos += RNG_WORDS
+        for name in GameState.ENEMY_COLUMNS:
+            out[pos:pos + n] = getattr(self, "enemy_" + name)[game, :n]
+            pos += n
+        for column in (self.trail_x, self.trail_y, self.trail_birth):
+            out[pos:pos + m] = column[game, m - 1::-1]  # Oldest first
+            pos += m
+        for i, name in enumerate(GameState.BULLET_FIELDS):
+            out[pos + i:pos + len(GameState.BULLET_FIELDS) * b:len(GameState.BULLET_FIELDS)] = \
+                getattr(self, "bullet_" + name)[game, :b]
+        pos += len(GameState.BULLET_FIELDS) * b
+        out[pos:pos + TRAPPED_WIDTH * t] = [value for _, values in trapped for value in values]
+        return out
+
+    def restore(self, game, snapshot):
+        """Put one game of the batch into the state of a GameState snapshot.
+
+        The snapshot's game settings (enemy cap, spawn waves, trail length,
+        ...) must match the batch's, since those are shared by every game.
+        """
+        layout, size, n, m, b, t = (int(value) for value in snapshot[:SNAPSHOT_HEADER])
+        if layout != SNAPSHOT_LAYOUT or len(snapshot) < size:
+            raise ValueError("not a snapshot of this game version")
+        pos = SNAPSHOT_HEADER
+        scalars = snapshot[pos:pos + SNAPSHOT_SCALARS].tolist()
+        pos += SNAPSHOT_SCALARS
+        for name in GameState.SNAPSHOT_FIELDS + GameState.TANK_SNAPSHOT_FIELDS:
+            value = scalars.pop(0)
+            target = getattr(self, name)
+            if isinstance(target, np.ndarray):
+                target[game] = value
+            elif snapshot_number(value) != target:
+                raise ValueError(f"snapshot has {name}={snapshot_number(value)}, the batch runs {name}={target}")
+        head_x, head_y, trail_tick, lifetime, version, has_gauss, gauss_next = scalars
+        if snapshot_number(lifetime) != self.lifetime:
+            raise ValueError(f"snapshot has trail lifetime {snapshot_number(lifetime)}, the batch {self.lifetime}")
+        self.previous_head_x[game] = head_x
+        self.previous_head_y[game] = head_y
+        self.trail_tick[game] = int(trail_tick)
+        words = tuple(snapshot[pos:pos + RNG_WORDS].astype(np.int64).tolist())
+        self.rngs[game].setstate((int(version), words, gauss_next if has_gauss else None))
+        pos += RNG_WORDS
+
+        if n > len(self.enemy_slots):
+            self._allocate_enemies(n)
+        for name in GameState.ENEMY_COLUMNS:
+            getattr(self, "enemy_" + name)[game, :n] = snapshot[pos:pos + n]
+            pos += n
+        self.enemy_count[game] = n
+        self.enemy_uid[game, :n] = np.arange(n)
+        self.next_uid[game] = n
+
+        if m > len(self.trail_slots):
+            raise ValueError(f"snapshot trail has {m} entries, the batch holds {len(self.trail_slots)}")
+        for column in (self.trail_x, self.trail_y, self.trail_birth):
+            column[game, :m] = snapshot[pos:pos + m][::-1]  # Head first
+            pos += m
+        self.trail_count[game] = m
+
+        width = len(GameState.BULLET_FIELDS)
+        while b > len(self.bullet_slots):
+            self._allocate_bullets(2 * len(self.bullet_slots))
+        bullets = snapshot[pos:pos + width * b].reshape(b, width)
+        for i, name in enumerate(GameState.BULLET_FIELDS):
+            getattr(self, "bullet_" + name)[game, :b] = bullets[:, i]
+        self.bullet_count[game] = b
+        pos += width * b
+
+        self.ghosts[game] = []
+        for rank, (index, *values) in enumerate(snapshot[pos:pos + TRAPPED_WIDTH * t].reshape(t, TRAPPED_WIDTH).tolist()):
+            if index >= 0:
+                self.enemy_rank[game, int(index)] = rank
+            else:
+                self.ghosts[game].append((rank, values))
+
+    def game(self, game, profiler=None, events=None):
+        """A standalone GameState continuing one game of the batch"""
+        return GameState.from_snapshot(self.snapshot(game), profiler=profiler, events=events)
+
+def driving_inputs(tick, loop_ticks, rng, quit_rate=0.0):
+    """Input bitfields for a batch: stress.circle_driving loops of a per-game length, with random
+    turns right, reversing, trap presses and (at `quit_rate`) quits mixed in"""
+    n = len(loop_ticks)
+    phase = tick % (loop_ticks + 30)
+    inputs = np.where(phase < loop_ticks, BITS["up"] | BITS["left"], BITS["up"])
+    if tick % 30 < 10:
+        inputs |= BITS["shoot"]
+    noise = rng.random((4, n))
+    inputs |= np.where(noise[0] < 0.05, BITS["right"], 0)
+    inputs = np.where(noise[1] < 0.02, inputs & ~BITS["up"] | BITS["down"], inputs)
+    inputs |= np.where(noise[2] < 0.003, BITS["trap"], 0)
+    inputs |= np.where(noise[3] < quit_rate, BITS["quit"], 0)
+    return inputs
+
+def verify(num_games=32, ticks=3000, seed=0, **options):
+    """Run a GameBatch and one GameState per game on the same inputs, comparing snapshots every tick.
+
+    Returns None if every game matched throughout, else (game, tick) of the first difference.
+    """
+    seeds = range(seed, seed + num_games)
+    batch = GameBatch(seeds, **options)
+    states = [GameState(game_seed, **options) for game_seed in seeds]
+    rng = np.random.default_rng(seed)
+    loop_ticks = rng.integers(40, 100, num_games)
+    for tick in range(ticks):
+        inputs = driving_inputs(tick, loop_ticks, rng, quit_rate=0.0002)
+        for state, bits in zip(states, inputs.tolist()):
+            if state.running:
+                state.step(InputFrame(**unpack_input(bits)))
+        batch.step(inputs)
+        for game, state in enumerate(states):
+            expected = state.snapshot()
+            if not np.array_equal(expected[:int(expected[1])], batch.snapshot(game)):
+                return game, tick
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many Sherman Tank Snake games at once in one batched simulation")
+    parser.add_argument("--games", type=int, default=1024, help="games in the batch (default: 1024)")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks to run (default: 600)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i (default: 0)")
+    parser.add_argument("--verify", type=int, metavar="GAMES", default=0,
+                        help="first check GAMES games tick for tick against GameState")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        start = time.perf_counter()
+        mismatch = verify(args.verify, args.ticks, args.seed)
+        if mismatch is not None:
+            print(f"❌ Game {mismatch[0]} differs from GameState at tick {mismatch[1]}")
+            return 1
+        print(f"✅ {args.verify} games matched GameState for {args.ticks} ticks ({time.perf_counter() - start:.1f}s)")
+
+    batch = GameBatch(range(args.seed, args.seed + args.games))
+    rng = np.random.default_rng(args.seed)
+    loop_ticks = rng.integers(40, 100, args.games)
+    inputs = [driving_inputs(tick, loop_ticks, rng) for tick in range(args.ticks)]
+    start = time.perf_counter()
+    for tick_inputs in inputs:
+        batch.step(tick_inputs)
+    elapsed = time.perf_counter() - start
+    print(f"⚡ {args.games} games x {args.ticks} ticks in {elapsed:.2f}s: "
+          f"{args.games * args.ticks / elapsed:,.0f} game ticks/s ({elapsed / args.ticks * 1000:.2f} ms per step)")
+    print(f"🏁 {int(batch.running.sum())} games still running, {int(batch.shot_kills.sum())} shot kills, "
+          f"{int(batch.trap_kills.sum())} trap kills")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the game's hot kernels, swept over enemy count and trail length
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import random
+import time
+
+import numpy as np
+import pygame
+
+from sherman_tank_snake import (TankSnake, EnemySwarm, Bullet, GameState,
+                                SCREEN_WIDTH, SCREEN_HEIGHT)
+from sprite_cache import SpriteCache
+
+ENEMY_COUNTS = [4, 16, 64, 256, 1024, 4096, 10000]
+TRAIL_LENGTHS = [12, 50, 200, 1000, 5000]
+DEFAULT_ENEMIES = 64   # Held fixed while a kernel sweeps trail length
+DEFAULT_TRAIL = 50     # Held fixed while a kernel sweeps enemy count
+BULLETS = 20           # Bullets in flight for the collision kernels
+TRAIL_RADIUS = 200     # Benchmark trails are laid out on a circle around the screen centre
+
+class Scene:
+    """Tank, trail and enemies for one benchmark size, built from a fixed seed"""
+    def __init__(self, enemies, trail, seed=0):
+        rng = random.Random(seed)
+        self.enemy_count = enemies
+        self.trail_length = trail
+        self.tank = make_tank(trail)
+        self.head = self.tank.segments.head()
+        self.trail_x, self.trail_y, _ = self.tank.segments.views()
+        self.polygon = list(zip(self.trail_x, self.trail_y))
+        self.trail_list = list(self.tank.segments)  # The old deque of (x, y, lifetime)
+
+        self.swarm = EnemySwarm()
+        for _ in range(enemies):
+            self.swarm.add(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        self.enemies = list(self.swarm)
+        self.start_x = self.swarm.x[:enemies].copy()
+        self.start_y = self.swarm.y[:enemies].copy()
+
+        self.bullet_starts = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                               rng.randrange(0, 360, 4)) for _ in range(BULLETS)]
+
+    def reset_enemies(self):
+        """Put every enemy back where it started, untrapped"""
+        n = self.enemy_count
+        self.swarm.x[:n] = self.start_x
+        self.swarm.y[:n] = self.start_y
+        self.swarm.trapped[:n] = False
+        self.swarm.enemy_grid_valid = False
+
+    def bullets(self):
+        return [Bullet(x, y, direction) for x, y, direction in self.bullet_starts]
+
+def make_tank(trail_length):
+    """Tank whose trail is `trail_length` entries (head included) on a circle"""
+    center_x, center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+    tank = TankSnake(center_x + TRAIL_RADIUS, center_y)
+    tank.max_length = trail_length
+    for i in range(1, trail_length):
+        angle = 2 * math.pi * i / trail_length
+        tank.segments.push_head()
+        tank.segments.set_head(center_x + TRAIL_RADIUS * math.cos(angle),
+                               center_y + TRAIL_RADIUS * math.sin(angle))
+    return tank
+
+# Kernels: each setup(scene) returns (run, reset); reset (or None) runs untimed before each call
+
+def bench_point_in_polygon(scene):
+    tank, polygon = scene.tank, scene.polygon
+    def run():
+        for enemy in scene.enemies:
+            tank.point_in_polygon((enemy.x, enemy.y), polygon)
+    return run, None
+
+def bench_points_in_polygon(scene):
+    n = scene.enemy_count
+    xs, ys = scene.swarm.x[:n], scene.swarm.y[:n]
+    def run():
+        TankSnake.points_in_polygon(xs, ys, scene.trail_x, scene.trail_y)
+    return run, None
+
+def bench_is_enemy_trapped(scene):
+    tank = scene.tank
+    def run():
+        for enemy in scene.enemies:
+            tank.is_enemy_trapped(enemy)
+    return run, None
+
+def bench_check_auto_trap(scene):
+    tank = scene.tank
+    def reset():
+        tank.trap_active = False
+        scene.reset_enemies()
+    def run():
+        tank.check_auto_trap(scene.swarm)
+    return run, reset
+
+def bench_update_segments(scene):
+    segments = scene.tank.segments
+    def run():
+        segments.tick = 0  # Keep the trail from expiring between calls
+        scene.tank.update_segments()
+    return run, None
+
+def bench_avoid_trail_segments(scene):
+    def run():
+        for enemy in scene.enemies:
+            enemy.avoid_trail_segments(scene.trail_list)
+    return run, scene.reset_enemies
+
+def bench_enemy_update(scene):
+    def run():
+        for enemy in scene.enemies:
+            enemy.update(scene.head)
+    return run, scene.reset_enemies
+
+def bench_swarm_update(scene):
+    def run():
+        scene.swarm.update(scene.head, scene.trail_x, scene.trail_y)
+    return run, scene.reset_enemies
+
+def bench_bullets_legacy(scene):
+    state = {}
+    def reset():
+        state["bullets"] = scene.bullets()
+        state["enemies"] = scene.enemies[:]
+    def run():
+        # The original main() loop: every bullet against every enemy
+        bullets, enemies = state["bullets"], state["enemies"]
+        for bullet in bullets[:]:
+            if bullet.update():
+                bullets.remove(bullet)
+            else:
+                for enemy in enemies[:]:
+                    distance = math.sqrt((bullet.x - enemy.x)**2 + (bullet.y - enemy.y)**2)
+                    if distance < bullet.size + enemy.size:
+                        bullets.remove(bullet)
+                        enemies.remove(enemy)
+                        print(f"🎯 Enemy shot! Remaining: {len(enemies)}")
+                        break
+    return run, reset
+
+def bench_bullets_hashed(scene):
+    game = GameState(seed=0)
+    def reset():
+        game.enemies = EnemySwarm(capacity=scene.enemy_count)
+        for x, y in zip(scene.start_x, scene.start_y):
+            game.enemies.add(x, y)
+        game.bullets = scene.bullets()
+    def run():
+        game.update_bullets()
+    return run, reset
+
+def bench_draw_primitives(scene):
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def run():
+        scene.tank.draw(surface)
+    return run, None
+
+def bench_draw_sprites(scene):
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = SpriteCache()
+    scene.tank.draw(surface, sprites)  # Warm the cache
+    def run():
+        scene.tank.draw(surface, sprites)
+    return run, None
+
+# name -> (setup, swept axes, description). The "both" axis grows enemies and trail
+# together, which is where all-pairs kernels show their quadratic cost
+SIZES_BOTH = [12, 50, 200, 1000, 5000]
+
+KERNELS = {
+    "point_in_polygon": (bench_point_in_polygon, ("enemies", "trail", "both"),
+                         "TankSnake.point_in_polygon, once per enemy"),
+    "points_in_polygon": (bench_points_in_polygon, ("enemies", "trail", "both"),
+                          "TankSnake.points_in_polygon, all enemies batched"),
+    "is_enemy_trapped": (bench_is_enemy_trapped, ("enemies", "trail", "both"),
+                         "TankSnake.is_enemy_trapped, once per enemy"),
+    "check_auto_trap": (bench_check_auto_trap, ("enemies", "trail", "both"),
+                        "TankSnake.check_auto_trap on an EnemySwarm"),
+    "update_segments": (bench_update_segments, ("trail",),
+                        "TankSnake.update_segments"),
+    "avoid_trail_segments": (bench_avoid_trail_segments, ("enemies", "trail", "both"),
+                             "Enemy.avoid_trail_segments, once per enemy"),
+    "enemy_update": (bench_enemy_update, ("enemies",),
+                     "Enemy.update, once per enemy"),
+    "swarm_update": (bench_swarm_update, ("enemies", "trail", "both"),
+                     "EnemySwarm.update (avoidance + pursuit, batched)"),
+    "bullets_legacy": (bench_bullets_legacy, ("enemies",),
+                       "Original main() bullet-enemy loop, all pairs"),
+    "bullets_hashed": (bench_bullets_hashed, ("enemies",),
+                       "GameState.update_bullets (enemy grid above DIRECT_SCAN_ENEMIES)"),
+    "draw_primitives": (bench_draw_primitives, ("trail",),
+                        "TankSnake.draw offscreen, no caches"),
+    "draw_sprites": (bench_draw_sprites, ("trail",),
+                     "TankSnake.draw offscreen with SpriteCache"),
+}
+
+def measure(run, reset, min_time, repeats):
+    """Best-of-`repeats` seconds per call, each sample lasting at least `min_time`"""
+    # One untimed warm-up call, which also tells us roughly how long a call takes
+    if reset:
+        reset()
+    start = time.perf_counter()
+    run()
+    first = time.perf_counter() - start
+    number = max(1, int(min_time / max(first, 1e-7)))
+
+    best = first
+    calls = 1
+    for _ in range(repeats):
+        if reset:
+            elapsed = 0.0
+            for _ in range(number):
+                reset()
+                start = time.perf_counter()
+                run()
+                elapsed += time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            elapsed = time.perf_counter() - start
+        best = min(best, elapsed / number)
+        calls += number
+    return best, first, calls
+
+def scaling_slope(sizes, times):
+    """Least-squares slope of log(time) against log(size): ~1 linear, ~2 quadratic"""
+    if len(sizes) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+def run_benchmarks(kernels, enemy_counts, trail_lengths, min_time, repeats, max_call, seed):
+    """Sweep every kernel over each of its axes; returns (results, scaling)"""
+    results = []
+    scaling = []
+    for name in kernels:
+        setup, axes, _ = KERNELS[name]
+        for axis in axes:
+            sizes = {"enemies": enemy_counts, "trail": trail_lengths, "both": SIZES_BOTH}[axis]
+            swept = []
+            for size in sizes:
+                enemies = size if axis in ("enemies", "both") else DEFAULT_ENEMIES
+                trail = size if axis in ("trail", "both") else DEFAULT_TRAIL
+                scene = Scene(enemies, trail, seed)
+                run, reset = setup(scene)
+                # The legacy bullet loop prints every hit; send that to /dev/null
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    best, first, calls = measure(run, reset, min_time, repeats)
+                result = {
+                    "kernel": name,
+                    "axis": axis,
+                    "size": size,
+                    "enemies": enemies,
+                    "trail": trail,
+                    "calls": calls,
+                    "ns_per_call": best * 1e9,
+                    "ns_per_item": best * 1e9 / size,
+                }
+                results.append(result)
+                swept.append(result)
+                print(f"  {name:<22} {axis:<8} {size:>6}  "
+                      f"{result['ns_per_call']:>14,.0f} ns/call  {result['ns_per_item']:>10,.1f} ns/item")
+                if first > max_call:
+                    print(f"  {name:<22} {axis:<8} skipping larger sizes ({first:.2f}s per call)")
+                    break
+
+            # Fit over the upper half of the sweep, where fixed per-call overhead no longer dominates
+            tail = swept[len(swept) // 2:] if len(swept) >= 4 else swept
+            slope = scaling_slope([r["size"] for r in tail], [r["ns_per_call"] for r in tail])
+            scaling.append({
+                "kernel": name,
+                "axis": axis,
+                "sizes": [r["size"] for r in swept],
+                "ns_per_call": [r["ns_per_call"] for r in swept],
+                "slope": slope,
+                "quadratic": slope is not None and slope >= 1.7,
+            })
+    return results, scaling
+
+def print_scaling(scaling):
+    print("\n📈 Scaling (log-log slope over the larger sizes: ~0 constant, ~1 linear, ~2 quadratic)")
+    for entry in scaling:
+        slope = "   n/a" if entry["slope"] is None else f"{entry['slope']:6.2f}"
+        flag = "  ⚠️ quadratic" if entry["quadratic"] else ""
+        print(f"  {entry['kernel']:<22} {entry['axis']:<8} {slope}{flag}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for Sherman Tank Snake's hot kernels")
+    parser.add_argument("--kernels", nargs="+", choices=sorted(KERNELS), default=list(KERNELS),
+                        help="kernels to run (default: all)")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="JSON results file (default: bench_results.json)")
+    parser.add_argument("--quick", action="store_true",
+                        help="shorter timing runs for a fast smoke check")
+    parser.add_argument("--max-call", type=float, default=1.0,
+                        help="skip larger sizes once one call takes longer than this many seconds")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for enemy and bullet placement")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    min_time, repeats = (0.005, 2) if args.quick else (0.05, 5)
+
+    print("⏱️  Sherman Tank Snake microbenchmarks")
+    print(f"   enemies {ENEMY_COUNTS} (trail {DEFAULT_TRAIL}), trail {TRAIL_LENGTHS} (enemies {DEFAULT_ENEMIES}),"
+          f" both {SIZES_BOTH}")
+    results, scaling = run_benchmarks(args.kernels, ENEMY_COUNTS, TRAIL_LENGTHS,
+                                      min_time, repeats, args.max_call, args.seed)
+    print_scaling(scaling)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "seed": args.seed,
+            "default_enemies": DEFAULT_ENEMIES,
+            "default_trail": DEFAULT_TRAIL,
+            "bullets": BULLETS,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
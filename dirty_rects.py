@@ -0,0 +1,61 @@
+"""
+Dirty-rectangle presentation: only push the parts of the screen that changed
+"""
+
+import pygame
+
+class DirtyRectRenderer:
+    """Erase-and-redraw renderer that updates only the regions touched this frame.
+
+    Each frame: erase() paints the background over everything drawn last
+    frame, the caller draws the scene (without clearing the screen) and hands
+    the rects it drew to present(). present() pushes last frame's rects plus
+    this frame's with pygame.display.update(). Once the dirty area passes
+    `full_frame_fraction` of the screen one full flip is cheaper, so it falls
+    back to that.
+    """
+    def __init__(self, screen, background=(0, 0, 0), full_frame_fraction=0.4):
+        self.screen = screen
+        self.background = background
+        self.full_frame_fraction = full_frame_fraction
+        self.screen_rect = screen.get_rect()
+        self.previous = None  # Rects drawn last frame; None forces a full redraw
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to clear and present the whole screen"""
+        self.previous = None
+
+    def erase(self):
+        """Paint the background over last frame's drawings"""
+        if self.previous is None:
+            self.screen.fill(self.background)
+            return
+        for rect in self.previous:
+            self.screen.fill(self.background, rect)
+
+    def present(self, rects):
+        """Show this frame's drawing; returns True if a full flip was used"""
+        drawn = []
+        for rect in rects:
+            if rect is None:
+                continue
+            rect = rect.clip(self.screen_rect)
+            if rect.width and rect.height:
+                drawn.append(rect)
+
+        full = self.previous is None
+        if not full:
+            dirty = self.previous + drawn
+            area = sum(rect.width * rect.height for rect in dirty)
+            full = area > self.full_frame_fraction * self.screen_rect.width * self.screen_rect.height
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+
+        self.previous = drawn
+        return full
@@ -0,0 +1,227 @@
+"""
+Structured game event bus: typed events in a preallocated ring, drained to sinks off the frame
+"""
+
+import collections
+import json
+import sys
+import threading
+import time
+import numpy as np
+
+# Event kinds and their fields, in the order emit() takes them
+EVENT_TYPES = {
+    "damage": ("level", "max_damage"),
+    "tank_hit": ("distance",),
+    "tank_destroyed": (),
+    "trap_armed": ("trapped",),
+    "trap_detonated": ("trigger", "enemies"),
+    "trap_kill": ("remaining",),
+    "enemy_shot": ("remaining",),
+    "enemy_spawned": ("x", "y", "enemies"),
+}
+# Fields that hold one of a fixed set of strings, stored as an index into the tuple
+FIELD_CODES = {
+    "trigger": ("timer", "manual"),
+}
+# Fields kept as floats when decoded; every other numeric field is an integer
+FLOAT_FIELDS = {"distance"}
+
+MAX_FIELDS = max(len(fields) for fields in EVENT_TYPES.values())
+KINDS = list(EVENT_TYPES)
+KIND_IDS = {kind: i for i, kind in enumerate(KINDS)}
+
+Event = collections.namedtuple("Event", "kind tick time fields")
+
+def decode_fields(kind, values):
+    """Field dict for an event's stored values"""
+    fields = {}
+    for name, value in zip(EVENT_TYPES[kind], values):
+        if name in FIELD_CODES:
+            fields[name] = FIELD_CODES[name][int(value)]
+        elif name in FLOAT_FIELDS:
+            fields[name] = float(value)
+        else:
+            fields[name] = int(value)
+    return fields
+
+class EventBus:
+    """Records game events without blocking the frame.
+
+    emit() writes the event into preallocated arrays (kind, tick, time and up
+    to MAX_FIELDS numeric values) and calls any in-process subscribers with
+    the decoded Event straight away. Sinks (console, JSON Lines) are fed by a
+    background thread that drains the ring every `flush_interval` seconds, so
+    a slow terminal or pipe never stalls the game. The thread only starts once
+    a sink is added; a bus with no sinks and no subscribers just fills the
+    ring. If the writer falls `capacity` events behind, the oldest are
+    dropped and counted in `dropped`.
+    """
+    def __init__(self, capacity=4096, flush_interval=0.1, clock=time.perf_counter):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.ticks = np.zeros(capacity, dtype=np.int64)
+        self.times = np.zeros(capacity)
+        self.values = np.zeros((capacity, MAX_FIELDS))
+        self.head = 0  # Events ever emitted; the next one goes in slot head % capacity
+        self.tail = 0  # Events already handed to the sinks
+        self.dropped = 0
+        self.tick = 0  # Stamped on every event; the game sets it each step
+        self.subscribers = []
+        self.sinks = []
+        self.lock = threading.Lock()  # Serializes drains (writer thread vs close)
+        self.stop = threading.Event()
+        self.thread = None
+
+    def subscribe(self, callback):
+        """Call `callback(event)` on the game thread for every event emitted"""
+        self.subscribers.append(callback)
+
+    def add_sink(self, sink):
+        """Hand events to `sink.write(event)` from the background writer thread"""
+        self.sinks.append(sink)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+            self.thread.start()
+
+    def emit(self, kind, *values):
+        """Record an event; `values` follow the field order in EVENT_TYPES[kind]"""
+        slot = self.head % self.capacity
+        now = self.clock()
+        self.kind[slot] = KIND_IDS[kind]
+        self.ticks[slot] = self.tick
+        self.times[slot] = now
+        for i, (name, value) in enumerate(zip(EVENT_TYPES[kind], values)):
+            if name in FIELD_CODES:
+                value = FIELD_CODES[name].index(value)
+            self.values[slot, i] = value
+        self.head += 1
+        if self.subscribers:
+            event = Event(kind, self.tick, now, decode_fields(kind, self.values[slot]))
+            for callback in self.subscribers:
+                callback(event)
+
+    def recent(self, n=None):
+        """The last `n` events still in the ring (all of them by default), oldest first"""
+        count = min(self.head, self.capacity)
+        if n is not None:
+            count = min(count, n)
+        return [self._event(index % self.capacity) for index in range(self.head - count, self.head)]
+
+    def _event(self, slot):
+        kind = KINDS[self.kind[slot]]
+        return Event(kind, int(self.ticks[slot]), float(self.times[slot]),
+                     decode_fields(kind, self.values[slot]))
+
+    def _run(self):
+        while not self.stop.wait(self.flush_interval):
+            self.drain()
+
+    def drain(self):
+        """Pass everything emitted since the last drain to the sinks"""
+        with self.lock:
+            head = self.head
+            tail = max(self.tail, head - self.capacity)
+            events = [self._event(index % self.capacity) for index in range(tail, head)]
+            # Anything the game overwrote while we decoded (or is half-way through writing) is lost
+            valid_from = min(len(events), max(0, self.head + 1 - self.capacity - tail))
+            self.dropped += (tail - self.tail) + valid_from
+            self.tail = head
+            events = events[valid_from:]
+            if not events:
+                return
+            for sink in self.sinks:
+                for event in events:
+                    sink.write(event)
+                sink.flush()
+
+    def close(self):
+        """Stop the writer thread, drain what is left and close the sinks"""
+        if self.thread is not None:
+            self.stop.set()
+            self.thread.join()
+            self.thread = None
+        self.drain()
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+class NullEventBus:
+    """An EventBus stand-in that drops every event, for games nobody is listening to"""
+    capacity = 0
+    head = 0
+    dropped = 0
+
+    def __init__(self):
+        self.tick = 0
+
+    def subscribe(self, callback):
+        raise ValueError("the null event bus drops every event; give the game an EventBus to subscribe to")
+
+    def add_sink(self, sink):
+        raise ValueError("the null event bus drops every event; give the game an EventBus to add sinks to")
+
+    def emit(self, kind, *values):
+        pass
+
+    def recent(self, n=None):
+        return []
+
+    def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+# Shared by every game and tank not given an event bus of its own
+NULL_EVENTS = NullEventBus()
+
+class JsonlSink:
+    """Writes each event as one JSON object per line"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w")
+        self.written = 0
+
+    def write(self, event):
+        record = {"kind": event.kind, "tick": event.tick, "time": round(event.time, 6)}
+        record.update(event.fields)
+        self.file.write(json.dumps(record) + "\n")
+        self.written += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+# Console messages per event kind; kinds without one are not shown
+CONSOLE_MESSAGES = {
+    "damage": "Tank damaged! Damage level: {level}",
+    "tank_hit": "💥 Tank hit by enemy! Distance: {distance:.1f}",
+    "tank_destroyed": "💀 Tank destroyed!",
+    "trap_armed": "🎯 Auto-trap activated! {trapped} enemies trapped!",
+    "trap_kill": "💥 Enemy destroyed by trap! Remaining: {remaining}",
+    "enemy_shot": "🎯 Enemy shot! Remaining: {remaining}",
+}
+
+class ConsoleSink:
+    """Prints the game's familiar one-line messages for the events that have one"""
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, event):
+        if event.kind == "trap_detonated" and event.fields["trigger"] == "manual":
+            self.stream.write("💥 Manual detonation!\n")
+            return
+        message = CONSOLE_MESSAGES.get(event.kind)
+        if message is not None:
+            self.stream.write(message.format(**event.fields) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
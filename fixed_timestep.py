@@ -0,0 +1,46 @@
+"""
+Accumulator-based fixed timestep for decoupling simulation from rendering
+"""
+
+import time
+
+class FixedTimestep:
+    """Decides how many fixed-length simulation ticks each rendered frame should run.
+
+    Real elapsed time is added to an accumulator and paid out in whole ticks of
+    1 / tick_rate seconds, so the game runs at the same speed whatever the
+    frame rate. What is left over becomes `alpha`, the fraction of a tick to
+    interpolate by when drawing. A frame never runs more than `max_steps`
+    ticks; after a long stall the leftover backlog is dropped instead of being
+    chased (the "spiral of death").
+    """
+    def __init__(self, tick_rate=60, max_steps=5, clock=time.perf_counter):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped_ticks = 0
+
+    def advance(self):
+        """Account for the time since the last call; returns the ticks to run now"""
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return 1  # Run one tick straight away so there is something to draw
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = min(int(self.accumulator / self.dt), self.max_steps)
+        self.accumulator -= steps * self.dt
+        if steps == self.max_steps and self.accumulator >= self.dt:
+            # Too far behind to catch up - drop the backlog and keep going
+            self.dropped_ticks += int(self.accumulator / self.dt)
+            self.accumulator %= self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """How far (0-1) rendering is between the previous and the current tick"""
+        return min(1.0, self.accumulator / self.dt)
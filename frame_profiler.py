@@ -0,0 +1,208 @@
+"""
+Per-phase frame-time profiler with rolling histograms and an on-screen overlay
+"""
+
+import time
+import numpy as np
+import pygame
+
+# Histogram bin edges in milliseconds: log-spaced from 10us to 1s
+BIN_EDGES_MS = np.geomspace(0.01, 1000.0, 41)
+
+class FrameProfiler:
+    """Splits each frame into named phases with lap marks and keeps recent history.
+
+    Call begin_frame() at the top of the frame, mark(phase) at the end of each
+    phase (the time since the previous mark is charged to it, so a phase that
+    runs several times in a frame adds up) and end_frame() at the bottom. The
+    last `history` frames are kept per phase, along with a histogram over the
+    same window that is updated incrementally as frames roll in and out.
+
+    A `tracer` (trace_export.TraceRecorder) gets every phase and the whole
+    frame as timeline events, whether or not the histograms are enabled.
+    With neither, every call returns straight away, so the marks can stay in
+    the game loop permanently.
+    """
+    def __init__(self, enabled=False, history=240, clock=time.perf_counter):
+        self.enabled = enabled
+        self.history = history
+        self.clock = clock
+        self.phases = []  # Phase names in first-seen order
+        self.phase_index = {}
+        self.current = np.zeros(8)  # Seconds charged to each phase this frame
+        self.samples = np.zeros((history, 8))  # Per-frame phase times, a ring of `history` rows
+        self.bins = np.zeros((history, 8), dtype=np.intp)  # Histogram bin of each sample
+        self.counts = np.zeros((8, len(BIN_EDGES_MS) + 1), dtype=np.int64)
+        self.frame_times = np.zeros(history)
+        self.frames = 0  # Frames recorded since the profiler was last reset
+        self.frame_start = None
+        self.last_mark = None
+        self.tracer = None
+
+    def set_enabled(self, enabled):
+        """Turn recording on or off; history starts afresh when switched on"""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        self.current[:] = 0
+        self.samples[:] = 0
+        self.bins[:] = 0
+        self.counts[:] = 0
+        self.frame_times[:] = 0
+        self.frames = 0
+        self.frame_start = self.last_mark = None
+
+    def begin_frame(self):
+        if not self.enabled and self.tracer is None:
+            return
+        self.frame_start = self.last_mark = self.clock()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`"""
+        if self.last_mark is None:
+            return
+        now = self.clock()
+        if self.tracer is not None:
+            self.tracer.complete(phase, self.last_mark, now)
+        if self.enabled:
+            index = self.phase_index.get(phase)
+            if index is None:
+                index = self._add_phase(phase)
+            self.current[index] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        now = self.clock()
+        if self.tracer is not None:
+            self.tracer.complete("frame", self.frame_start, now)
+        if not self.enabled:
+            self.frame_start = self.last_mark = None
+            return
+        row = self.frames % self.history
+        n = len(self.phases)
+        if self.frames >= self.history:
+            # Roll the oldest frame out of the histograms
+            np.subtract.at(self.counts, (np.arange(n), self.bins[row, :n]), 1)
+        bins = np.searchsorted(BIN_EDGES_MS, self.current[:n] * 1000)
+        np.add.at(self.counts, (np.arange(n), bins), 1)
+        self.bins[row, :n] = bins
+        self.samples[row, :n] = self.current[:n]
+        self.frame_times[row] = now - self.frame_start
+        self.current[:] = 0
+        self.frames += 1
+        self.frame_start = self.last_mark = None
+
+    def _add_phase(self, phase):
+        index = len(self.phases)
+        if index == self.current.shape[0]:
+            self.current = np.concatenate((self.current, np.zeros(index)))
+            self.samples = np.hstack((self.samples, np.zeros((self.history, index))))
+            # Frames recorded before the phase existed spent nothing in it (bin 0)
+            self.bins = np.hstack((self.bins, np.zeros((self.history, index), dtype=np.intp)))
+            self.counts = np.vstack((self.counts, np.zeros_like(self.counts)))
+        self.counts[index, 0] = min(self.frames, self.history)
+        self.phases.append(phase)
+        self.phase_index[phase] = index
+        return index
+
+    def window(self):
+        """Number of frames currently held in the history"""
+        return min(self.frames, self.history)
+
+    def mean_ms(self, phase):
+        """Mean time in `phase` over the history window"""
+        index = self.phase_index.get(phase)
+        if index is None or self.frames == 0:
+            return 0.0
+        return float(self.samples[:self.window(), index].mean() * 1000)
+
+    def percentile_ms(self, phase, q):
+        """Upper bin edge of the q-th percentile of `phase` times, read from its histogram"""
+        index = self.phase_index.get(phase)
+        if index is None or self.frames == 0:
+            return 0.0
+        counts = self.counts[index]
+        rank = np.searchsorted(np.cumsum(counts), q / 100 * counts.sum())
+        return float(BIN_EDGES_MS[min(rank, len(BIN_EDGES_MS) - 1)])
+
+    def recent_frame_times(self):
+        """Frame times in seconds over the history window, oldest first"""
+        window = self.window()
+        if self.frames <= self.history:
+            return self.frame_times[:window]
+        row = self.frames % self.history
+        return np.concatenate((self.frame_times[row:], self.frame_times[:row]))
+
+# Shared by every game and tank not given a profiler of its own; never enable it or give it a tracer
+DISABLED_PROFILER = FrameProfiler(history=1)
+
+class ProfilerOverlay:
+    """Translucent panel with per-phase ms, a frame-time graph and entity counts.
+
+    Text is rebuilt every `refresh_frames` frames rather than every frame, so
+    the overlay neither flickers nor churns the text cache.
+    """
+    WIDTH = 300
+    GRAPH_HEIGHT = 60
+    GRAPH_MS = 33.3  # Top of the graph; bars above it are clipped
+    BUDGET_MS = 1000 / 60
+    COLUMNS = (6, 200, 260)  # Left edge of the phase name, right edges of the mean and p95 columns
+
+    def __init__(self, profiler, text, refresh_frames=15):
+        self.profiler = profiler
+        self.text = text
+        self.refresh_frames = refresh_frames
+        self.rows = []
+        self.last_refresh = None
+        self.panel = None
+
+    def _refresh(self, counts):
+        profiler = self.profiler
+        frame_times = profiler.recent_frame_times()
+        frame_ms = frame_times.mean() * 1000 if len(frame_times) else 0.0
+        # Each row is (phase, mean, p95); a row with only one cell spans the panel
+        rows = [(f"frame {frame_ms:.2f} ms ({1000 / frame_ms if frame_ms else 0:.0f} fps)",),
+                ("phase", "mean", "p95")]
+        for phase in profiler.phases:
+            rows.append((phase, f"{profiler.mean_ms(phase):.2f}", f"{profiler.percentile_ms(phase, 95):.2f}"))
+        rows.append(("  ".join(f"{name} {value}" for name, value in counts.items()),))
+        self.rows = rows
+        self.last_refresh = profiler.frames
+
+    def draw(self, screen, counts):
+        """Draw the overlay at the top right, returning its rect"""
+        profiler = self.profiler
+        if self.last_refresh is None or profiler.frames - self.last_refresh >= self.refresh_frames:
+            self._refresh(counts)
+
+        line_height = 16
+        height = len(self.rows) * line_height + self.GRAPH_HEIGHT + 12
+        if self.panel is None or self.panel.get_height() != height:
+            self.panel = pygame.Surface((self.WIDTH, height))
+            self.panel.set_alpha(200)
+        panel = self.panel
+        panel.fill((20, 20, 20))
+
+        for i, row in enumerate(self.rows):
+            y = 4 + i * line_height
+            panel.blit(self.text.render(row[0], (200, 255, 200), 18), (self.COLUMNS[0], y))
+            for cell, right in zip(row[1:], self.COLUMNS[1:]):
+                surface = self.text.render(cell, (200, 255, 200), 18)
+                panel.blit(surface, (right - surface.get_width(), y))
+        # Frame-time graph: one bar per recent frame, budget line at 60 FPS
+        graph_top = height - self.GRAPH_HEIGHT - 4
+        frame_ms = profiler.recent_frame_times()[-(self.WIDTH - 12):] * 1000
+        scale = self.GRAPH_HEIGHT / self.GRAPH_MS
+        for x, ms in enumerate(frame_ms):
+            bar = min(self.GRAPH_HEIGHT, int(ms * scale))
+            color = (80, 200, 80) if ms <= self.BUDGET_MS else (230, 80, 60)
+            pygame.draw.line(panel, color, (6 + x, graph_top + self.GRAPH_HEIGHT),
+                             (6 + x, graph_top + self.GRAPH_HEIGHT - bar))
+        budget_y = graph_top + self.GRAPH_HEIGHT - int(self.BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 255, 0), (6, budget_y), (self.WIDTH - 6, budget_y))
+
+        return screen.blit(panel, (screen.get_width() - self.WIDTH - 10, 40))  # Below the stats line
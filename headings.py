@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Precomputed unit vectors for headings in degrees
+"""
+
+import math
+import numpy as np
+
+class HeadingTable:
+    """Lookup table of (cos, sin) for headings on a fixed angular grid.
+
+    Headings that sit exactly on the grid come straight from the table; any
+    other heading falls back to math.cos/math.sin, so results are always
+    bit-for-bit what `math.cos(math.radians(angle))` would give. A single
+    lookup costs about as much as the math, so callers look a heading up once
+    and keep the result: the tank caches its vector until it turns (on the
+    table for its 4 degree steps) and a bullet its velocity; vectors() does
+    whole arrays at once for the batched simulation.
+    """
+    def __init__(self, resolution=1.0):
+        self.resolution = resolution
+        self.steps = round(360 / resolution)
+        # Cover [-360, 720) so angle +/- 180 and negative headings still hit the table
+        self.offset = self.steps
+        self.angles = [(i - self.offset) * resolution for i in range(3 * self.steps)]
+        self.cos = [math.cos(math.radians(angle)) for angle in self.angles]
+        self.sin = [math.sin(math.radians(angle)) for angle in self.angles]
+        self.angle_array = np.array(self.angles)
+        self.cos_array = np.array(self.cos)
+        self.sin_array = np.array(self.sin)
+
+    def vector(self, angle):
+        """(cos, sin) of a heading in degrees"""
+        index = round(angle / self.resolution) + self.offset
+        if 0 <= index < len(self.angles) and self.angles[index] == angle:
+            return self.cos[index], self.sin[index]
+        rad = math.radians(angle)
+        return math.cos(rad), math.sin(rad)
+
+    def vectors(self, angles):
+        """(cos, sin) arrays for an array of headings - each element exactly what vector() gives"""
+        angles = np.asarray(angles, dtype=float)
+        index = np.rint(angles / self.resolution).astype(np.intp) + self.offset
+        np.clip(index, 0, len(self.angles) - 1, out=index)
+        cos = self.cos_array[index]
+        sin = self.sin_array[index]
+        for i in np.flatnonzero(self.angle_array[index] != angles).tolist():
+            rad = math.radians(angles[i])
+            cos[i] = math.cos(rad)
+            sin[i] = math.sin(rad)
+        return cos, sin
+
+# Shared default table used by the game
+HEADINGS = HeadingTable()
+
+def heading_vector(angle):
+    """Unit vector for a heading in degrees, using the default table"""
+    return HEADINGS.vector(angle)
+
+def verify(table=HEADINGS):
+    """Check every table entry, and vectors() on the grid, against the float math; returns mismatches"""
+    mismatches = 0
+    for i, angle in enumerate(table.angles):
+        rad = math.radians((i - table.offset) * table.resolution)
+        if angle != (i - table.offset) * table.resolution:
+            mismatches += 1
+        if (table.cos[i], table.sin[i]) != (math.cos(rad), math.sin(rad)):
+            mismatches += 1
+    mismatches += int(np.count_nonzero(table.angle_array != table.angles))
+    mismatches += int(np.count_nonzero(table.cos_array != table.cos))
+    mismatches += int(np.count_nonzero(table.sin_array != table.sin))
+    cos, sin = table.vectors(table.angle_array)
+    mismatches += int(np.count_nonzero(cos != table.cos_array) + np.count_nonzero(sin != table.sin_array))
+    return mismatches
+
+if __name__ == "__main__":
+    mismatches = verify()
+    print(f"Heading table check: {mismatches} mismatches")
+    raise SystemExit(1 if mismatches else 0)
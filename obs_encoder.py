@@ -0,0 +1,128 @@
+"""
+Grid observations for bots: the game state rasterized into a low-resolution multi-channel array, no rendering
+"""
+
+import math
+import numpy as np
+from sherman_tank_snake import TankSnake, SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE
+
+CHANNELS = ("tank", "heading_x", "heading_y", "trail", "enemies", "trapped", "bullets", "trap")
+
+class GridEncoder:
+    """Writes a GameState into a (len(CHANNELS), rows, cols) float32 array of `cell_size` pixel cells.
+
+    Channels: tank (1 in the head's cell) with its heading as cos/sin in
+    the same cell; trail (remaining lifetime of the freshest segment in each
+    cell, 0-1); enemies and trapped enemies (count per cell); bullets (count
+    per cell); trap (1 in cells whose centre lies inside the armed trap
+    polygon - the same outline the game draws).
+
+    Entities are binned with batched array scatters and the trap is filled
+    with TankSnake.points_in_polygon over precomputed cell centres. Cell
+    indices go into scratch arrays that only grow and the result goes into
+    the `out` array passed to encode() rather than a new array. Encoding is
+    not allocation-free: the trapped-enemy selection and the trap fill (in
+    points_in_polygon) still make NumPy temporaries every step.
+    """
+    def __init__(self, cell_size=GRID_SIZE, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.shape = (len(CHANNELS), self.rows, self.cols)
+        self.channel = {name: i for i, name in enumerate(CHANNELS)}
+        centres_y, centres_x = np.mgrid[0:self.rows, 0:self.cols]
+        self.centre_x = (centres_x + 0.5) * cell_size
+        self.centre_y = (centres_y + 0.5) * cell_size
+        self._reserve(64)
+
+    def _reserve(self, n):
+        """Make the scratch arrays hold at least n entries"""
+        if n <= len(getattr(self, "_cells", ())):
+            return
+        capacity = max(n, 2 * len(getattr(self, "_cells", ())))
+        self._cells = np.zeros(capacity, dtype=np.intp)
+        self._col = np.zeros(capacity)
+        self._row = np.zeros(capacity)
+        self._values = np.zeros(capacity)
+        self._x = np.zeros(capacity)  # Positions gathered from Python objects (bullets)
+        self._y = np.zeros(capacity)
+
+    def _bin(self, xs, ys):
+        """Flat cell index of each position (positions on the far edge go in the last cell)"""
+        n = len(xs)
+        self._reserve(n)
+        col = self._col[:n]
+        row = self._row[:n]
+        np.floor_divide(xs, self.cell_size, out=col)
+        np.clip(col, 0, self.cols - 1, out=col)
+        np.floor_divide(ys, self.cell_size, out=row)
+        np.clip(row, 0, self.rows - 1, out=row)
+        row *= self.cols
+        row += col
+        cells = self._cells[:n]
+        cells[:] = row
+        return cells
+
+    def new_buffer(self):
+        return np.zeros(self.shape, dtype=np.float32)
+
+    def encode(self, state, out=None):
+        """Rasterize `state` into `out` (a new array if None) and return it"""
+        if out is None:
+            out = self.new_buffer()
+        out[...] = 0
+        grid = out.reshape(len(CHANNELS), -1)
+        channel = self.channel
+        tank_snake = state.tank_snake
+
+        # Tank head and heading
+        head_x, head_y = tank_snake.segments.head()
+        head = (min(max(int(head_y // self.cell_size), 0), self.rows - 1) * self.cols +
+                min(max(int(head_x // self.cell_size), 0), self.cols - 1))
+        angle = math.radians(tank_snake.direction)
+        grid[channel["tank"], head] = 1
+        grid[channel["heading_x"], head] = math.cos(angle)
+        grid[channel["heading_y"], head] = math.sin(angle)
+
+        # Trail: freshest remaining lifetime per cell
+        segments = tank_snake.segments
+        trail_x, trail_y, births = segments.views()
+        if len(trail_x):
+            cells = self._bin(trail_x, trail_y)
+            life = self._values[:len(cells)]
+            np.add(births, segments.lifetime - segments.tick, out=life)
+            np.minimum(life, segments.lifetime, out=life)
+            life /= segments.lifetime
+            np.maximum.at(grid[channel["trail"]], cells, life)
+
+        # Enemies, and the trapped ones among them
+        enemies = state.enemies
+        n = enemies.count
+        if n:
+            cells = self._bin(enemies.x[:n], enemies.y[:n])
+            np.add.at(grid[channel["enemies"]], cells, 1)
+            np.add.at(grid[channel["trapped"]], cells[enemies.trapped[:n]], 1)
+
+        bullets = state.bullets
+        if bullets:
+            self._reserve(len(bullets))
+            xs = self._x[:len(bullets)]
+            ys = self._y[:len(bullets)]
+            for i, bullet in enumerate(bullets):
+                xs[i] = bullet.x
+                ys[i] = bullet.y
+            np.add.at(grid[channel["bullets"]], self._bin(xs, ys), 1)
+
+        # Armed trap: fill the cells inside the polygon the game draws, testing only its bounding box
+        if tank_snake.trap_active and len(segments) > 3:
+            poly_x, poly_y, _ = segments.views(min_lifetime=180)
+            if len(poly_x) > 3:
+                size = self.cell_size
+                col0 = max(0, int(poly_x.min() // size))
+                col1 = min(self.cols, int(poly_x.max() // size) + 1)
+                row0 = max(0, int(poly_y.min() // size))
+                row1 = min(self.rows, int(poly_y.max() // size) + 1)
+                inside = TankSnake.points_in_polygon(self.centre_x[row0:row1, col0:col1].ravel(),
+                                                     self.centre_y[row0:row1, col0:col1].ravel(), poly_x, poly_y)
+                out[channel["trap"], row0:row1, col0:col1] = inside.reshape(row1 - row0, col1 - col0)
+        return out
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Whole-game performance regression gate driven by a recorded input sequence
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import contextlib
+import importlib
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from sherman_tank_snake import InputFrame
+
+DEFAULT_MODULES = ["sherman_tank_snake"]
+INPUT_FILE = "perf_input.txt"
+BASELINE_FILE = "perf_baseline.json"
+
+# One letter per InputFrame field in the recorded input file
+INPUT_FLAGS = {"U": "up", "D": "down", "L": "left", "R": "right", "S": "shoot", "T": "trap"}
+
+# Metrics compared against the baseline; True when bigger is better
+METRICS = {
+    "ticks_per_sec": True,
+    "frames_per_sec": True,
+    "tick_p50_ms": False,
+    "tick_p95_ms": False,
+    "tick_p99_ms": False,
+    "draw_p50_ms": False,
+    "draw_p95_ms": False,
+    "draw_p99_ms": False,
+}
+
+def scripted_input(ticks=3600):
+    """The default recorded session: laps, figure-eights, straight runs, shooting and trap presses"""
+    frames = []
+    for tick in range(ticks):
+        phase = (tick // 600) % 3
+        if phase == 0:
+            turn = "L"  # Full 4-degree-per-tick circles, closing the trail every 90 ticks
+        elif phase == 1:
+            turn = "L" if tick % 180 < 90 else "R"  # Figure-eights
+        else:
+            turn = "" if tick % 120 < 80 else "R"  # Long straights with sharp corners
+        flags = "U" + turn
+        if tick % 40 < 20:
+            flags += "S"
+        if tick % 450 == 449:
+            flags += "T"
+        frames.append(flags)
+    return frames
+
+def write_input(path, frames):
+    """Write frames run-length encoded, one '<ticks> <flags>' line per run ('-' for no keys)"""
+    with open(path, "w") as f:
+        f.write("# Recorded input for perf_gate.py: <ticks> <held keys: U D L R S, T = trap press>\n")
+        run_flags, run_length = None, 0
+        for flags in frames + [None]:
+            if flags == run_flags:
+                run_length += 1
+                continue
+            if run_flags is not None:
+                f.write(f"{run_length} {run_flags or '-'}\n")
+            run_flags, run_length = flags, 1
+
+def read_input(path):
+    """Load a recorded input file as a list of InputFrames"""
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            count, flags = line.split()
+            fields = {INPUT_FLAGS[flag]: True for flag in flags if flag != "-"}
+            frames.extend(InputFrame(**fields) for _ in range(int(count)))
+    return frames
+
+class GameStateLoop:
+    """Drives a module through its headless GameState.step() and draw_game(), the functions its main() calls"""
+    def __init__(self, module, seed):
+        self.module = module
+        self.state = module.GameState(seed=seed)
+        # Modules from before the sprite and HUD caches draw without them
+        self.sprites = module.SpriteCache() if hasattr(module, "SpriteCache") else None
+        self.hud = module.Hud() if hasattr(module, "Hud") else None
+
+    def step(self, frame):
+        return self.state.step(frame)
+
+    def draw(self, screen):
+        if self.sprites is None:
+            self.module.draw_game(screen, self.state)
+        else:
+            self.module.draw_game(screen, self.state, self.sprites, self.hud)
+
+    def entity_counts(self):
+        return len(self.state.enemies), len(self.state.bullets), len(self.state.tank_snake.segments)
+
+def run_session(module, frames, seed, screen):
+    """Play the recorded frames once (restarting after a game over); returns raw timings"""
+    tick_times = np.empty(len(frames))
+    draw_times = np.empty(len(frames))
+    restarts = 0
+    peak_enemies = 0
+    loop = GameStateLoop(module, seed)
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        running = loop.step(frame)
+        middle = time.perf_counter()
+        loop.draw(screen)
+        pygame.display.flip()
+        end = time.perf_counter()
+        tick_times[i] = middle - start
+        draw_times[i] = end - middle
+        peak_enemies = max(peak_enemies, loop.entity_counts()[0])
+        if not running:
+            restarts += 1
+            loop = GameStateLoop(module, seed + restarts)
+    return tick_times, draw_times, restarts, peak_enemies
+
+def summarize(tick_times, draw_times):
+    """Throughput and tail latencies for one session"""
+    summary = {
+        "ticks_per_sec": len(tick_times) / tick_times.sum(),
+        "frames_per_sec": len(tick_times) / (tick_times.sum() + draw_times.sum()),
+    }
+    for name, times in (("tick", tick_times), ("draw", draw_times)):
+        for p in (50, 95, 99):
+            summary[f"{name}_p{p}_ms"] = float(np.percentile(times, p) * 1000)
+    return summary
+
+def benchmark_module(name, frames, seed, runs, screen):
+    """Best of `runs` sessions for every metric, to damp scheduler noise"""
+    module = importlib.import_module(name)
+    if not hasattr(module, "GameState") or not hasattr(module, "draw_game"):
+        raise SystemExit(f"❌ {name} has no headless GameState and draw_game() to drive")
+    best = None
+    for _ in range(runs):
+        # The games print kills and hits; the prints still run (timed), their text goes nowhere
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            tick_times, draw_times, restarts, peak_enemies = run_session(module, frames, seed, screen)
+        summary = summarize(tick_times, draw_times)
+        if best is None:
+            best = summary
+        else:
+            for metric, higher_is_better in METRICS.items():
+                pick = max if higher_is_better else min
+                best[metric] = pick(best[metric], summary[metric])
+    best["ticks"] = len(frames)
+    best["restarts"] = restarts
+    best["peak_enemies"] = peak_enemies
+    return best
+
+def compare(results, baseline, tolerance):
+    """List of regressions: metrics worse than the baseline by more than `tolerance` (a fraction)"""
+    failures = []
+    for name, result in results.items():
+        reference = baseline.get("modules", {}).get(name)
+        if reference is None:
+            print(f"  ⚠️  {name}: no baseline entry, not checked")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = reference[metric], result[metric]
+            if higher_is_better:
+                change = (old - new) / old
+            else:
+                change = (new - old) / old
+            status = "❌" if change > tolerance else "✅"
+            print(f"  {status} {name:<26} {metric:<15} baseline {old:10.3f}  now {new:10.3f}  ({-change:+.1%})")
+            if change > tolerance:
+                failures.append((name, metric, old, new))
+    return failures
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Full-loop performance regression gate")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES,
+                        help="game modules to run (default: %(default)s)")
+    parser.add_argument("--input", default=INPUT_FILE,
+                        help="recorded input file (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline JSON to compare against, written on the first run (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown per metric as a fraction (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="sessions per module; the best value of each metric is kept (default: %(default)s)")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="only play the first N recorded ticks")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="game seed (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--record-input", action="store_true",
+                        help="regenerate the recorded input file from the built-in script and exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.record_input:
+        write_input(args.input, scripted_input())
+        print(f"💾 Recorded input written to {args.input}")
+        return 0
+
+    frames = read_input(args.input)[:args.ticks]
+    screen = pygame.display.set_mode((800, 600))
+    print(f"🏁 Performance gate: {len(frames)} recorded ticks, seed {args.seed}, best of {args.runs}")
+
+    results = {}
+    for name in args.modules:
+        result = benchmark_module(name, frames, args.seed, args.runs, screen)
+        results[name] = result
+        print(f"  {name:<26} {result['ticks_per_sec']:10,.0f} ticks/s  {result['frames_per_sec']:8,.0f} frames/s  "
+              f"tick p99 {result['tick_p99_ms']:.3f} ms  draw p99 {result['draw_p99_ms']:.3f} ms"
+              f"  ({result['restarts']} game overs)")
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        # Timings only compare on the machine that took them, so no baseline ships with the repo
+        baseline = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "input": args.input,
+                "ticks": len(frames),
+                "seed": args.seed,
+            },
+            "modules": results,
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        if args.update_baseline:
+            print(f"💾 Baseline written to {args.baseline}")
+        else:
+            print(f"💾 No baseline yet; these results are now {args.baseline}, run again to compare against it")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\n📊 Against {args.baseline} (tolerance {args.tolerance:.0%})")
+    failures = compare(results, baseline, args.tolerance)
+    if failures:
+        print(f"\n❌ {len(failures)} metric(s) regressed beyond {args.tolerance:.0%}")
+        return 1
+    print("\n✅ No performance regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Binary input replays: per-tick input bitfields, periodic state keyframes and an index for seeking
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import numpy as np
+
+MAGIC = b"STSR"
+FORMAT_VERSION = 4  # Bump whenever the header, the record layout or the keyframe snapshot layout changes
+# Magic, format version, game version, spawn seed, simulation ticks per second
+HEADER = struct.Struct("<4sHHQd")
+# Record tag, kind, first tick, payload bytes; the payload follows
+RECORD = struct.Struct("<4sB3xQQ")
+RECORD_MAGIC = b"STRC"
+INPUTS = 1    # Payload: one little-endian uint16 bitfield per tick from the record's tick on
+KEYFRAME = 2  # Payload: a GameState.snapshot() (float64), taken before the record's tick is stepped
+# Footer: the record index, then its offset, entry count and magic
+INDEX_DTYPE = np.dtype([("kind", "<u8"), ("tick", "<u8"), ("offset", "<u8"), ("length", "<u8")])
+TRAILER = struct.Struct("<QQ4s")
+INDEX_MAGIC = b"STSI"
+# Input fields in bit order; bit i of a tick's bitfield is INPUT_BITS[i]
+INPUT_BITS = ("up", "down", "left", "right", "shoot", "trap", "quit")
+
+def pack_input(frame):
+    """Bitfield for an input frame (anything with the INPUT_BITS attributes)"""
+    bits = 0
+    for i, field in enumerate(INPUT_BITS):
+        if getattr(frame, field):
+            bits |= 1 << i
+    return bits
+
+def unpack_input(bits):
+    """Input fields set in a bitfield, as keyword arguments for InputFrame"""
+    return {field: bool(bits >> i & 1) for i, field in enumerate(INPUT_BITS)}
+
+class ReplayRecorder:
+    """Writes a replay: input bitfields a chunk at a time, a keyframe every `keyframe_interval` ticks.
+
+    Ticks collect in a preallocated array, so recording costs the game an
+    array store per tick, plus a state capture every keyframe. Records are
+    self-describing and the index footer is only written by close(), so a
+    session that crashes still leaves a replay that loads (by scanning the
+    records) up to the last chunk written.
+    """
+    def __init__(self, path, seed, game_version, tick_rate=60.0, chunk_ticks=600, keyframe_interval=600):
+        self.path = path
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.keyframe_interval = keyframe_interval
+        self.buffer = np.zeros(chunk_ticks, dtype="<u2")
+        self.pending = 0  # Ticks in the buffer not yet written
+        self.pending_tick = 0  # Tick of the first of them
+        self.ticks = 0
+        self.index = []
+        self.snapshot = None  # Reused for every keyframe
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, game_version, seed, tick_rate))
+
+    def _write_record(self, kind, tick, payload):
+        self.index.append((kind, tick, self.file.tell() + RECORD.size, len(payload)))
+        self.file.write(RECORD.pack(RECORD_MAGIC, kind, tick, len(payload)))
+        self.file.write(payload)
+
+    def record(self, state, frame):
+        """Record the input frame `state` is about to step with"""
+        tick = state.frame_count
+        if self.ticks == 0 or tick % self.keyframe_interval == 0:
+            self.flush()
+            self.snapshot = state.snapshot(self.snapshot)
+            self._write_record(KEYFRAME, tick, self.snapshot[:int(self.snapshot[1])].astype("<f8").tobytes())
+        if self.pending == 0:
+            self.pending_tick = tick
+        self.buffer[self.pending] = pack_input(frame)
+        self.pending += 1
+        self.ticks += 1
+        if self.pending == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """Write the buffered ticks out as one input record"""
+        if self.pending:
+            self._write_record(INPUTS, self.pending_tick, self.buffer[:self.pending].tobytes())
+            self.pending = 0
+        self.file.flush()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        index = np.array(self.index, dtype=INDEX_DTYPE)
+        offset = self.file.tell()
+        self.file.write(index.tobytes())
+        self.file.write(TRAILER.pack(offset, len(index), INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+
+class Replay:
+    """A replay file mapped into memory.
+
+    Only the header and the index are read up front; input bitfields are
+    NumPy views straight onto the mapping and a keyframe is decoded when it
+    is asked for, so seeking into a long session touches a few pages rather
+    than the whole file. Files without a footer (the recording crashed) are
+    indexed by scanning the records instead.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            raise ValueError(f"{path}: too short to be a replay")
+        magic, format_version, self.game_version, self.seed, self.tick_rate = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a replay file")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"{path}: replay format {format_version}, expected {FORMAT_VERSION}")
+        index = self._read_index()
+
+        blocks = [(tick, offset, length // 2) for kind, tick, offset, length in index if kind == INPUTS]
+        self.input_ticks = np.array([tick for tick, _, _ in blocks], dtype=np.int64)
+        self.input_blocks = [np.frombuffer(self.map, dtype="<u2", count=count, offset=offset)
+                             for _, offset, count in blocks]
+        keyframes = [(tick, offset, length) for kind, tick, offset, length in index if kind == KEYFRAME]
+        self.keyframe_ticks = np.array([tick for tick, _, _ in keyframes], dtype=np.int64)
+        self.keyframe_spans = [(offset, length) for _, offset, length in keyframes]
+        self.start_tick = int(self.input_ticks[0]) if blocks else 0
+        self.end_tick = int(self.input_ticks[-1]) + len(self.input_blocks[-1]) if blocks else 0
+
+    @classmethod
+    def load(cls, path):
+        return cls(path)
+
+    def _read_index(self):
+        size = len(self.map)
+        if size >= HEADER.size + TRAILER.size:
+            offset, count, magic = TRAILER.unpack_from(self.map, size - TRAILER.size)
+            if magic == INDEX_MAGIC and offset + count * INDEX_DTYPE.itemsize == size - TRAILER.size:
+                return np.frombuffer(self.map, dtype=INDEX_DTYPE, count=count, offset=offset).tolist()
+        # No footer: walk the records, stopping at the first one cut short
+        index = []
+        position = HEADER.size
+        while position + RECORD.size <= size:
+            tag, kind, tick, length = RECORD.unpack_from(self.map, position)
+            position += RECORD.size
+            if tag != RECORD_MAGIC or kind not in (INPUTS, KEYFRAME) or position + length > size:
+                break
+            index.append((kind, tick, position, length))
+            position += length
+        return index
+
+    def __len__(self):
+        return self.end_tick - self.start_tick
+
+    def input_bits(self, tick):
+        """Input bitfield recorded for `tick`"""
+        block = int(np.searchsorted(self.input_ticks, tick, side="right")) - 1
+        if block < 0 or tick >= self.input_ticks[block] + len(self.input_blocks[block]):
+            raise IndexError(f"tick {tick} is not in the replay")
+        return int(self.input_blocks[block][tick - self.input_ticks[block]])
+
+    def frames(self, frame_class, start=None):
+        """Yield one frame_class(**fields) per recorded tick, from tick `start` (the first by default)"""
+        start = self.start_tick if start is None else start
+        for tick, block in zip(self.input_ticks.tolist(), self.input_blocks):
+            if tick + len(block) <= start:
+                continue
+            for bits in block[max(0, start - tick):].tolist():
+                yield frame_class(**unpack_input(bits))
+
+    def keyframe_before(self, tick):
+        """(keyframe tick, snapshot) of the latest keyframe at or before `tick`, or None"""
+        i = int(np.searchsorted(self.keyframe_ticks, tick, side="right")) - 1
+        if i < 0:
+            return None
+        offset, length = self.keyframe_spans[i]
+        return int(self.keyframe_ticks[i]), np.frombuffer(self.map[offset:offset + length], dtype="<f8")
+
+    def close(self):
+        """Unmap the file; the replay can't be read afterwards"""
+        self.input_blocks = []
+        self.map.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or check a Sherman Tank Snake replay")
+    parser.add_argument("path", help="replay file written with --record")
+    parser.add_argument("--play", action="store_true",
+                        help="run the replay headless and print the final game state")
+    parser.add_argument("--seek", type=int, metavar="TICK", default=None,
+                        help="restore the game at TICK (from the nearest keyframe) and print it")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    print(f"🎞️  {args.path}: ticks {replay.start_tick}-{replay.end_tick}, {len(replay.keyframe_ticks)} keyframes, "
+          f"seed {replay.seed}, game version {replay.game_version}, {replay.tick_rate:g} ticks/s")
+    if not args.play and args.seek is None:
+        return 0
+    import sherman_tank_snake as game
+    if replay.game_version != game.GAME_VERSION:
+        print(f"⚠️  Recorded with game version {replay.game_version}, playing on {game.GAME_VERSION}; "
+              f"the run may not match")
+    if args.seek is not None:
+        state = game.seek_replay(replay, args.seek)
+    else:
+        state = game.play_replay(replay)
+    tank_snake = state.tank_snake
+    head_x, head_y = tank_snake.segments.head()
+    print(f"🏁 tick {state.frame_count}: {len(state.enemies)} enemies, {len(state.bullets)} bullets, "
+          f"damage {tank_snake.damage_level}/{tank_snake.max_damage}, "
+          f"tank at ({head_x:.2f}, {head_y:.2f}), {'running' if state.running else 'game over'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Gym-style reinforcement-learning environment over the headless GameState, with vectorized stepping
+"""
+
+import argparse
+import math
+import multiprocessing
+import random
+import sys
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from sherman_tank_snake import GameState, InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT
+from replay import unpack_input
+from obs_encoder import GridEncoder
+
+# An action is a bitfield over these inputs, laid out as the low bits of a replay tick
+ACTION_BITS = ("up", "down", "left", "right", "shoot", "trap")
+ACTION_COUNT = 1 << len(ACTION_BITS)
+TRAP_BIT = 1 << ACTION_BITS.index("trap")
+# One input frame per action, built once; a frame is only read by GameState.step
+ACTION_FRAMES = [InputFrame(**unpack_input(action)) for action in range(ACTION_COUNT)]
+
+NEAREST_ENEMIES = 8
+TANK_FEATURES = 9
+OBSERVATION_SIZE = TANK_FEATURES + 4 * NEAREST_ENEMIES
+
+def vector_observation(state, out=None):
+    """Fixed-size float32 features for a game: the tank, then the nearest enemies.
+
+    Tank: head x and y (0-1), heading cos and sin, damage, trap armed, trap
+    fuse left, gun ready and trail length (each 0-1). Then for the
+    NEAREST_ENEMIES closest enemies, nearest first: offset from the head
+    across the wrapping screen (x and y, -0.5 to 0.5), trapped, and 1 for a
+    present slot (all zeros when there are fewer enemies).
+    """
+    if out is None:
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+    tank_snake = state.tank_snake
+    head_x, head_y = tank_snake.segments.head()
+    angle = math.radians(tank_snake.direction)
+    out[:TANK_FEATURES] = (
+        head_x / SCREEN_WIDTH,
+        head_y / SCREEN_HEIGHT,
+        math.cos(angle),
+        math.sin(angle),
+        tank_snake.damage_level / tank_snake.max_damage,
+        tank_snake.trap_active,
+        tank_snake.trap_timer / tank_snake.trap_duration if tank_snake.trap_active else 0.0,
+        state.frame_count - state.last_shot_time > state.shot_cooldown,
+        len(tank_snake.segments) / (tank_snake.max_length + 1),
+    )
+    enemies = state.enemies
+    n = enemies.count
+    features = out[TANK_FEATURES:].reshape(NEAREST_ENEMIES, 4)
+    features[:] = 0
+    if n:
+        # Shortest offsets across the screen wrap
+        dx = (enemies.x[:n] - head_x + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+        dy = (enemies.y[:n] - head_y + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+        distance = dx * dx + dy * dy
+        k = min(n, NEAREST_ENEMIES)
+        nearest = np.argpartition(distance, k - 1)[:k] if n > k else np.arange(n)
+        nearest = nearest[np.argsort(distance[nearest])]
+        features[:k, 0] = dx[nearest] / SCREEN_WIDTH
+        features[:k, 1] = dy[nearest] / SCREEN_HEIGHT
+        features[:k, 2] = enemies.trapped[nearest]
+        features[:k, 3] = 1
+    return out
+
+class TankSnakeEnv:
+    """One game as an RL environment: reset(seed) -> observation, step(action) -> (observation, reward, done, info).
+
+    Actions are integers in range(ACTION_COUNT), a bitfield of ACTION_BITS
+    (so 0b10001 drives forward while shooting). Each step holds the action
+    for `frame_skip` ticks, the trap press only on the first. The reward is
+    `kill_reward` per enemy destroyed by bullet or trap minus
+    `damage_penalty` per damage level taken. An episode is done when the
+    tank is destroyed or after `max_steps` steps (info["truncated"] tells
+    which). Remaining keyword arguments configure the GameState (enemy cap,
+    spawn rate, ...); the game runs with a silent event bus.
+    
+    Observations are vector_observation() features, or with
+    observation="grid" an obs_encoder.GridEncoder raster of `cell_size`
+    pixel cells; `observation_shape` gives the shape either way.
+    """
+    def __init__(self, max_steps=3600, frame_skip=1, kill_reward=1.0, damage_penalty=1.0,
+                 observation="vector", cell_size=20, **game_options):
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.kill_reward = kill_reward
+        self.damage_penalty = damage_penalty
+        self.game_options = game_options
+        if observation == "grid":
+            self.encoder = GridEncoder(cell_size)
+            self.observation_shape = self.encoder.shape
+        elif observation == "vector":
+            self.encoder = None
+            self.observation_shape = (OBSERVATION_SIZE,)
+        else:
+            raise ValueError(f"unknown observation type {observation!r}")
+        self.action_count = ACTION_COUNT
+        self.seeds = random.Random()  # Game seeds for each episode; reset(seed) reseeds it
+        self.state = None
+        self.steps = 0
+        self.kills = 0
+        self.damage = 0
+
+    def reset(self, seed=None):
+        """Start a new game; with a seed the episode (and the ones after it) are reproducible"""
+        if seed is not None:
+            self.seeds.seed(seed)
+        self.state = GameState(seed=self.seeds.randrange(1 << 32), **self.game_options)
+        self.steps = 0
+        self.kills = 0
+        self.damage = 0
+        return self.observe()
+
+    def observe(self, out=None):
+        if self.encoder is not None:
+            return self.encoder.encode(self.state, out)
+        return vector_observation(self.state, out)
+
+    def step(self, action, out=None):
+        """Advance one step; the observation is written into `out` when given"""
+        state = self.state
+        frame = ACTION_FRAMES[action]
+        for _ in range(self.frame_skip):
+            if not state.step(frame):
+                break
+            frame = ACTION_FRAMES[action & ~TRAP_BIT]
+        self.steps += 1
+        kills = state.shot_kills + state.trap_kills
+        damage = state.tank_snake.damage_level
+        reward = self.kill_reward * (kills - self.kills) - self.damage_penalty * (damage - self.damage)
+        self.kills = kills
+        self.damage = damage
+        truncated = state.running and self.steps >= self.max_steps
+        done = not state.running or truncated
+        info = {"tick": state.frame_count, "kills": kills, "damage": damage, "truncated": truncated}
+        return self.observe(out), reward, done, info
+
+def _shared_views(buffer, num_envs, observation_shape):
+    """NumPy views onto one block of (shared) memory holding every per-env array"""
+    views = {}
+    offset = 0
+    for name, dtype, shape in (("observations", np.float32, (num_envs, *observation_shape)),
+                               ("rewards", np.float32, (num_envs,)),
+                               ("dones", np.bool_, (num_envs,)),
+                               ("truncated", np.bool_, (num_envs,)),
+                               ("ticks", np.int64, (num_envs,)),
+                               ("kills", np.int64, (num_envs,)),
+                               ("damage", np.int64, (num_envs,)),
+                               ("actions", np.int64, (num_envs,))):
+        offset = -(-offset // 8) * 8  # Keep every array 8-byte aligned
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if buffer is not None:
+            views[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += size
+    return views, offset
+
+class _EnvSlice:
+    """A contiguous run of environments stepped together, writing into shared arrays"""
+    def __init__(self, views, start, stop, env_options):
+        self.views = views
+        self.start = start
+        self.envs = [TankSnakeEnv(**env_options) for _ in range(stop - start)]
+
+    def reset(self, seed):
+        observations = self.views["observations"]
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + self.start + i)
+            env.observe(observations[self.start + i])
+
+    def step(self):
+        views = self.views
+        observations = views["observations"]
+        actions = views["actions"]
+        for i, env in enumerate(self.envs):
+            slot = self.start + i
+            _, reward, done, info = env.step(int(actions[slot]), observations[slot])
+            views["rewards"][slot] = reward
+            views["dones"][slot] = done
+            views["truncated"][slot] = info["truncated"]
+            views["ticks"][slot] = info["tick"]
+            views["kills"][slot] = info["kills"]
+            views["damage"][slot] = info["damage"]
+            if done:
+                env.reset()
+                env.observe(observations[slot])
+
+def _worker(connection, memory_name, num_envs, observation_shape, start, stop, env_options):
+    memory = shared_memory.SharedMemory(name=memory_name)
+    views, _ = _shared_views(memory.buf, num_envs, observation_shape)
+    envs = _EnvSlice(views, start, stop, env_options)
+    try:
+        while True:
+            command, argument = connection.recv()
+            if command == "step":
+                envs.step()
+            elif command == "reset":
+                envs.reset(argument)
+            elif command == "close":
+                break
+            connection.send(None)
+    finally:
+        del envs, views
+        memory.close()
+
+class VectorEnv:
+    """Steps `num_envs` independent games per call, in this process or spread over `workers` processes.
+
+    step(actions) takes one action per env and returns (observations,
+    rewards, dones, infos) as arrays - observations (num_envs,
+    *observation_shape) float32 - plus a dict of tick, kills, damage and
+    truncated arrays. A finished env is reset straight away: its row in
+    `dones` is True, its info arrays describe the episode that ended and its
+    observation is the first of the next one. With workers, every array
+    lives in one shared-memory block that the worker processes write
+    directly, so a step only sends a one-word command down each pipe. The
+    returned arrays are reused by the next step; copy them to keep them.
+    """
+    def __init__(self, num_envs, workers=0, **env_options):
+        self.num_envs = num_envs
+        self.observation_shape = TankSnakeEnv(**env_options).observation_shape
+        self.action_count = ACTION_COUNT
+        self.workers = min(workers, num_envs)
+        self.memory = None
+        self.processes = []
+        self.connections = []
+        _, size = _shared_views(None, num_envs, self.observation_shape)
+        if self.workers:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.views, _ = _shared_views(self.memory.buf, num_envs, self.observation_shape)
+            bounds = np.linspace(0, num_envs, self.workers + 1).astype(int)
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker, daemon=True,
+                    args=(child, self.memory.name, num_envs, self.observation_shape, int(start), int(stop),
+                          env_options))
+                process.start()
+                self.processes.append(process)
+                self.connections.append(parent)
+            self.local = None
+        else:
+            self.views, _ = _shared_views(bytearray(size), num_envs, self.observation_shape)
+            self.local = _EnvSlice(self.views, 0, num_envs, env_options)
+
+    def _command(self, command, argument=None):
+        for connection in self.connections:
+            connection.send((command, argument))
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seed=None):
+        """Reset every env (env i gets seed + i when a seed is given) and return the observations"""
+        if self.local is not None:
+            self.local.reset(seed)
+        else:
+            self._command("reset", seed)
+        return self.views["observations"]
+
+    def step(self, actions):
+        views = self.views
+        views["actions"][:] = actions
+        if self.local is not None:
+            self.local.step()
+        else:
+            self._command("step")
+        infos = {name: views[name] for name in ("ticks", "kills", "damage", "truncated")}
+        return views["observations"], views["rewards"], views["dones"], infos
+
+    def close(self):
+        """Stop the worker processes and free the shared memory"""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        if self.memory is not None:
+            self.views = None
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure VectorEnv throughput with random actions")
+    parser.add_argument("--envs", type=int, default=16, help="games stepped per call (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes, 0 to step in this process (default: %(default)s)")
+    parser.add_argument("--steps", type=int, default=2000, help="vector steps to run (default: %(default)s)")
+    parser.add_argument("--frame-skip", type=int, default=1, help="ticks per step (default: %(default)s)")
+    parser.add_argument("--observation", choices=("vector", "grid"), default="vector",
+                        help="observation encoding (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for games and actions (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    env = VectorEnv(args.envs, workers=args.workers, frame_skip=args.frame_skip, observation=args.observation)
+    rng = np.random.default_rng(args.seed)
+    try:
+        env.reset(args.seed)
+        episodes = 0
+        total_reward = 0.0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, rewards, dones, _ = env.step(rng.integers(0, ACTION_COUNT, args.envs))
+            episodes += int(dones.sum())
+            total_reward += float(rewards.sum())
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+    transitions = args.steps * args.envs
+    print(f"🤖 {transitions:,} transitions in {elapsed:.2f}s: {transitions / elapsed:,.0f}/s "
+          f"({transitions / elapsed * 3600 / 1e6:.1f}M/hour), {episodes} episodes ended, "
+          f"total reward {total_reward:+.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
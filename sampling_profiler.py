@@ -0,0 +1,119 @@
+"""
+Low-overhead sampling profiler with collapsed-stack (flamegraph) output
+"""
+
+import collections
+import os
+import signal
+import sys
+import threading
+import time
+
+class SamplingProfiler:
+    """Samples the main thread's Python stack at a fixed rate.
+
+    Unlike cProfile nothing runs on each call, so the game's many tiny methods
+    are not slowed down relative to the big ones; the cost is one stack walk
+    per sample. Samples are kept as counts per distinct stack and written in
+    the collapsed format flamegraph.pl, speedscope and inferno read
+    ("outer;inner;leaf count" per line).
+
+    A plain Python sampling thread can only look at the main thread when it
+    gets the GIL, which happens almost exclusively where NumPy or pygame
+    release it, so its samples pile up on those calls. Where the OS has
+    interval timers the samples are therefore triggered by a CPU-time
+    SIGPROF timer instead, whose handler runs on the main thread at the next
+    bytecode boundary; elsewhere (Windows) a sampling thread is the fallback.
+    """
+    def __init__(self, interval=0.005, max_depth=256, mode=None):
+        self.interval = interval
+        self.max_depth = max_depth
+        if mode is None:
+            mode = "signal" if hasattr(signal, "setitimer") else "thread"
+        self.mode = mode
+        self.thread_id = threading.main_thread().ident
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.labels = {}  # Code object -> frame label, so a sample is mostly dict lookups
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.previous_handler = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def start(self):
+        """Start sampling (call from the main thread in signal mode)"""
+        self.started = time.perf_counter()
+        if self.mode == "signal":
+            self.previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.started is None:
+            return
+        if self.mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+        else:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.elapsed += time.perf_counter() - self.started
+        self.started = None
+
+    def _label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+    def _sample(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self._sample(frame)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def write_collapsed(self, path):
+        """Write the samples in collapsed-stack format, one stack per line"""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def top_functions(self, n=20):
+        """[(label, self samples, total samples)] for the n functions with the most total samples"""
+        self_counts = collections.Counter()
+        total_counts = collections.Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):  # Recursion counts once per sample
+                total_counts[label] += count
+        ranked = sorted(total_counts, key=lambda label: (-total_counts[label], -self_counts[label]))
+        return [(label, self_counts[label], total_counts[label]) for label in ranked[:n]]
+
+    def summary(self, n=20):
+        """Top-n table by inclusive time, as text"""
+        if not self.samples:
+            return "No samples recorded"
+        lines = [f"{self.samples} samples over {self.elapsed:.1f}s "
+                 f"({self.samples / max(self.elapsed, 1e-9):.0f} Hz)",
+                 f"{'total':>7} {'self':>7}  function"]
+        for label, own, total in self.top_functions(n):
+            lines.append(f"{total / self.samples:7.1%} {own / self.samples:7.1%}  {label}")
+        return "\n".join(lines)
@@ -1,8 +1,25 @@
 import pygame
 import sys
+import time
+import argparse
+import array
 import math
-from collections import deque
 import random
+import numpy as np
+from spatial_hash import SpatialHash
+from trail_buffer import TrailBuffer
+from headings import heading_vector
+from sprite_cache import SpriteCache, TANK_CENTER
+from text_cache import TextCache
+from dirty_rects import DirtyRectRenderer
+from fixed_timestep import FixedTimestep
+from stress import circle_driving, SoakLog
+from frame_profiler import FrameProfiler, ProfilerOverlay, DISABLED_PROFILER
+from trace_export import TraceRecorder
+from event_log import EventBus, ConsoleSink, JsonlSink, NULL_EVENTS
+from sampling_profiler import SamplingProfiler
+from replay import Replay, ReplayRecorder
+from autopilot import Autopilot
 
 # Initialize Pygame
 pygame.init()
@@ -12,6 +29,7 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 GRID_SIZE = 20
+GAME_VERSION = 2  # Bump when a change alters the simulation, so old replays are flagged
 
 # Colors (retro palette)
 BLACK = (0, 0, 0)
@@ -25,14 +43,61 @@ ORANGE = (255, 165, 0)
 GRAY = (128, 128, 128)
 DARK_GREEN = (0, 128, 0)
 
+def lerp_wrapped(previous, current, alpha, span):
+    """Blend previous -> current by alpha, snapping to current when the move wrapped the screen"""
+    blended = previous + (current - previous) * alpha
+    wrapped = abs(current - previous) > span / 2
+    if isinstance(blended, np.ndarray):
+        return np.where(wrapped, current, blended)
+    return current if wrapped else blended
+
+def draw_tank(surface, x, y, cos_a, sin_a, color):
+    """Sherman hull, turret, cannon and tracks centred on (x, y), returning the bounding rect.
+    
+    TankSnake draws with this directly and SpriteCache renders its tank sprites with it.
+    """
+    # Tank body (main hull)
+    tank_rect = pygame.Rect(x - 12, y - 8, 24, 16)
+    drawn = pygame.draw.rect(surface, color, tank_rect)
+    pygame.draw.rect(surface, WHITE, tank_rect, 2)
+    
+    # Tank turret
+    turret_rect = pygame.Rect(x - 8, y - 6, 16, 12)
+    pygame.draw.rect(surface, color, turret_rect)
+    pygame.draw.rect(surface, WHITE, turret_rect, 1)
+    
+    # Tank cannon (pointing in direction)
+    cannon_length = 20
+    cannon_end_x = x + cos_a * cannon_length
+    cannon_end_y = y + sin_a * cannon_length
+    cannon = pygame.draw.line(surface, WHITE, (x, y), (cannon_end_x, cannon_end_y), 3)
+    
+    # Tank tracks
+    track_color = GRAY
+    left_track = pygame.Rect(x - 14, y - 10, 4, 20)
+    right_track = pygame.Rect(x + 10, y - 10, 4, 20)
+    pygame.draw.rect(surface, track_color, left_track)
+    pygame.draw.rect(surface, track_color, right_track)
+    
+    return drawn.unionall([cannon, left_track, right_track])
+
+def draw_enemy(surface, x, y, size, color):
+    """Enemy body with its white outline centred on (x, y), returning the rect drawn (also renders SpriteCache enemies)"""
+    drawn = pygame.draw.circle(surface, color, (x, y), size)
+    pygame.draw.circle(surface, WHITE, (x, y), size, 2)
+    return drawn
+
 class TankSnake:
-    def __init__(self, x, y):
-        self.segments = deque([(x, y, 999)])  # Snake body segments with lifetime (x, y, lifetime)
+    def __init__(self, x, y, max_length=12):
+        self.max_length = max_length  # Increased for better trapping
+        # Snake body segments, head first: (x, y, lifetime) entries in a ring buffer
+        self.segments = TrailBuffer(x, y, lifetime=999, capacity=self.max_length + 1)
         self.direction = 0  # Angle in degrees
+        self.heading_direction = None  # Direction the cached heading vector below belongs to
+        self.heading_cos = self.heading_sin = 0.0
         self.speed = 3
         self.base_speed = 3
         self.segment_size = GRID_SIZE
-        self.max_length = 12  # Increased for better trapping
         self.tank_color = DARK_GREEN
         self.body_color = GREEN
         self.move_counter = 0
@@ -47,9 +112,21 @@ class TankSnake:
         self.max_damage = 2
         self.rotation_speed = 4
         self.base_rotation_speed = 4
-        
+        self.previous_head = (x, y)  # Head position one tick ago, for render interpolation
+        self.profiler = DISABLED_PROFILER  # Until a game shares its own profiler
+        self.events = NULL_EVENTS  # Damage and trap events, dropped until a game shares its own bus
+        
+    def heading(self):
+        """(cos, sin) of the tank's direction, looked up in the heading table only after it turns"""
+        if self.direction != self.heading_direction:
+            self.heading_direction = self.direction
+            self.heading_cos, self.heading_sin = heading_vector(self.direction)
+        return self.heading_cos, self.heading_sin
+    
     def update_movement(self, keys):
         """Update tank movement based on input"""
+        self.previous_head = self.segments.head()
+        
         # Handle rotation
         rotation_change = 0
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -76,7 +153,7 @@ class TankSnake:
         self.update_segments()
         
         # FIXED: Allow tank to wrap around screen edges like classic Snake
-        head_x, head_y, lifetime = self.segments[0]
+        head_x, head_y = self.segments.head()
         
         # Wrap around screen edges
         if head_x < 0:
@@ -89,73 +166,63 @@ class TankSnake:
         elif head_y > SCREEN_HEIGHT:
             head_y = 0
         
-        self.segments[0] = (head_x, head_y, lifetime)
+        self.segments.set_head(head_x, head_y)
     
     def update_segments(self):
-        """Update segment lifetimes and remove expired ones"""
-        for i in range(len(self.segments)):
-            if i == 0:  # Skip head
-                continue
-            x, y, lifetime = self.segments[i]
-            new_lifetime = lifetime - 1
-            if new_lifetime <= 0:
-                # Remove expired segment
-                self.segments.remove((x, y, lifetime))
-                break
-            else:
-                # Update lifetime
-                self.segments[i] = (x, y, new_lifetime)
+        """Age segments by one tick and remove expired ones"""
+        self.segments.advance()
     
     def move_forward(self, speed):
         """Move tank forward/backward"""
-        head_x, head_y, _ = self.segments[0]
+        head_x, head_y = self.segments.head()
         
         # Calculate new position
-        new_x = head_x + math.cos(math.radians(self.direction)) * speed
-        new_y = head_y + math.sin(math.radians(self.direction)) * speed
+        cos_a, sin_a = self.heading()
+        new_x = head_x + cos_a * speed
+        new_y = head_y + sin_a * speed
         
         # Update head position
-        self.segments[0] = (new_x, new_y, 999)
+        self.segments.set_head(new_x, new_y)
         self.move_counter += 1
         
-        # Add new segment periodically with MUCH longer lifetime
+        # Leave a segment behind periodically - it keeps the head's long lifetime
+        # (999 frames, 15+ seconds) for better trap planning
         if self.move_counter >= self.move_threshold:
-            # Extended lifetime for better trap planning - 10+ seconds!
-            segment_lifetime = 600 + (self.max_length * 20)  # 10+ seconds base + length bonus
-            self.segments.appendleft((new_x, new_y, segment_lifetime))
+            self.segments.push_head()
             self.move_counter = 0
             
             # Limit trail length
             if len(self.segments) > self.max_length:
-                self.segments.pop()
+                self.segments.pop_oldest()
     
     def move_backward(self, speed):
         """Move tank backward"""
-        head_x, head_y, _ = self.segments[0]
+        head_x, head_y = self.segments.head()
         
         # Calculate new position (opposite direction)
-        new_x = head_x - math.cos(math.radians(self.direction)) * speed
-        new_y = head_y - math.sin(math.radians(self.direction)) * speed
+        cos_a, sin_a = self.heading()
+        new_x = head_x - cos_a * speed
+        new_y = head_y - sin_a * speed
         
         # Update head position
-        self.segments[0] = (new_x, new_y, 999)
+        self.segments.set_head(new_x, new_y)
         self.move_counter += 1
         
-        # Add new segment periodically
+        # Leave a segment behind periodically - it keeps the head's long lifetime
+        # (999 frames, 15+ seconds) for better trap planning
         if self.move_counter >= self.move_threshold:
-            segment_lifetime = 600 + (self.max_length * 20)  # Extended lifetime
-            self.segments.appendleft((new_x, new_y, segment_lifetime))
+            self.segments.push_head()
             self.move_counter = 0
             
             # Limit trail length
             if len(self.segments) > self.max_length:
-                self.segments.pop()
+                self.segments.pop_oldest()
     
     def take_damage(self):
         """Tank takes damage"""
         if self.damage_level < self.max_damage:
             self.damage_level += 1
-            print(f"Tank damaged! Damage level: {self.damage_level}")
+            self.events.emit("damage", self.damage_level, self.max_damage)
             
             # Apply damage effects
             if self.damage_level >= 1:
@@ -171,11 +238,15 @@ class TankSnake:
         if self.trap_active or len(self.segments) < 8:  # Need more segments for reliable trapping
             return False
         
-        # Check if any enemies are trapped by our current trail
-        trapped_enemies = []
-        for enemy in enemies:
-            if self.is_enemy_trapped(enemy):
-                trapped_enemies.append(enemy)
+        # Check every enemy against our current trail in one batched test
+        if isinstance(enemies, EnemySwarm):
+            xs = enemies.x[:len(enemies)]
+            ys = enemies.y[:len(enemies)]
+        else:
+            xs = np.array([enemy.x for enemy in enemies], dtype=float)
+            ys = np.array([enemy.y for enemy in enemies], dtype=float)
+        trapped_mask = self.trapped_mask(xs, ys)
+        trapped_enemies = [enemies[i] for i in np.flatnonzero(trapped_mask)]
         
         # If we have trapped enemies, auto-activate the trap
         if trapped_enemies:
@@ -184,18 +255,31 @@ class TankSnake:
             self.trapped_enemies = trapped_enemies
             for enemy in trapped_enemies:
                 enemy.trapped = True
-            print(f"🎯 Auto-trap activated! {len(trapped_enemies)} enemies trapped!")
+            self.events.emit("trap_armed", len(trapped_enemies))
             return True
         
         return False
     
+    def trapped_mask(self, xs, ys):
+        """Boolean mask of which positions are trapped inside our trail"""
+        if len(self.segments) < 8:
+            return np.zeros(len(xs), dtype=bool)
+        
+        # Visible trail polygon (zero-copy views), built once for all positions
+        poly_x, poly_y, _ = self.segments.views(min_lifetime=180)
+        if len(poly_x) < 8:
+            return np.zeros(len(xs), dtype=bool)
+        
+        return self.points_in_polygon(xs, ys, poly_x, poly_y)
+    
     def is_enemy_trapped(self, enemy):
         """Check if an enemy is trapped inside our trail using point-in-polygon"""
         if len(self.segments) < 8:
             return False
         
         # Only use segments that are still visible and form a reasonable trail
-        visible_segments = [(x, y) for x, y, lifetime in self.segments if lifetime > 180]  # More lenient visibility
+        poly_x, poly_y, _ = self.segments.views(min_lifetime=180)  # More lenient visibility
+        visible_segments = list(zip(poly_x, poly_y))
         
         if len(visible_segments) < 8:
             return False
@@ -226,13 +310,44 @@ class TankSnake:
         
         return inside
     
+    @staticmethod
+    def points_in_polygon(xs, ys, poly_x, poly_y, block_size=1 << 20):
+        """Batched ray casting - same crossing rules as point_in_polygon, for many points"""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        inside = np.zeros(len(xs), dtype=bool)
+        if len(poly_x) < 3 or len(xs) == 0:
+            return inside
+        
+        # Edge i runs from vertex i to vertex i + 1, closing back to vertex 0
+        p1x = np.asarray(poly_x, dtype=float)
+        p1y = np.asarray(poly_y, dtype=float)
+        p2x = np.roll(p1x, -1)
+        p2y = np.roll(p1y, -1)
+        low_y = np.minimum(p1y, p2y)
+        high_y = np.maximum(p1y, p2y)
+        high_x = np.maximum(p1x, p2x)
+        vertical = p1x == p2x
+        dx = p2x - p1x
+        dy = np.where(p1y != p2y, p2y - p1y, 1.0)  # Horizontal edges never cross the ray
+        
+        # Process points in blocks so points x edges matrices stay bounded
+        rows = max(1, block_size // len(p1x))
+        for start in range(0, len(xs), rows):
+            x = xs[start:start + rows, None]
+            y = ys[start:start + rows, None]
+            crosses = (y > low_y) & (y <= high_y) & (x <= high_x)
+            crosses &= vertical | (x <= (y - p1y) * dx / dy + p1x)
+            inside[start:start + rows] = np.count_nonzero(crosses, axis=1) % 2 == 1
+        return inside
+    
     def activate_trap(self):
         """Manual trap activation (for T key)"""
         if self.trap_active:
             # Early detonation
             destroyed_enemies = self.trapped_enemies.copy()
             self.detonate_trap()
-            print("💥 Manual detonation!")
+            self.events.emit("trap_detonated", "manual", len(destroyed_enemies))
             return destroyed_enemies
         return []
     
@@ -247,6 +362,7 @@ class TankSnake:
             # Detonate trap
             destroyed_enemies = self.trapped_enemies.copy()
             self.detonate_trap()
+            self.events.emit("trap_detonated", "timer", len(destroyed_enemies))
             return destroyed_enemies
         
         return []
@@ -259,22 +375,16 @@ class TankSnake:
     
     def get_trap_center_and_radius(self):
         """Calculate trap center and radius for explosion effect"""
-        if not self.segments:
-            return None, 0
-        
         # Calculate center of trap using visible segments
-        visible_segments = [(x, y) for x, y, lifetime in self.segments if lifetime > 0]
-        if not visible_segments:
+        xs, ys, _ = self.segments.views(min_lifetime=0)
+        if len(xs) == 0:
             return None, 0
         
-        center_x = sum(x for x, y in visible_segments) / len(visible_segments)
-        center_y = sum(y for x, y in visible_segments) / len(visible_segments)
+        center_x = xs.mean()
+        center_y = ys.mean()
         
         # Calculate radius as distance to furthest segment
-        max_distance = 0
-        for x, y in visible_segments:
-            distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-            max_distance = max(max_distance, distance)
+        max_distance = np.sqrt((xs - center_x)**2 + (ys - center_y)**2).max()
         
         return (center_x, center_y), max_distance
     
@@ -283,15 +393,29 @@ class TankSnake:
         # Tank immunity to own trail - this is a key fix!
         return False
     
-    def draw(self, screen):
-        """Draw the tank and its trail"""
+    def draw(self, screen, sprites=None, text=None, head=None):
+        """Draw the tank and its trail (using SpriteCache/TextCache surfaces when given).
+        
+        `head` overrides where the tank itself is drawn (render interpolation).
+        Returns the list of screen rects that were drawn to.
+        """
+        rects = []
+        
         # Draw snake body segments (from tail to head)
-        for i in reversed(range(len(self.segments))):
-            x, y, lifetime = self.segments[i]
+        xs, ys, births = self.segments.views()
+        lifetimes = self.segments.lifetimes(births)
+        for i in reversed(range(len(xs))):
+            x, y, lifetime = xs[i], ys[i], lifetimes[i]
             
             if i == 0:  # Head (tank)
+                if head is not None:
+                    x, y = head
                 # Draw tank
-                self.draw_realistic_tank(screen, x, y)
+                if sprites is not None:
+                    tank_sprite = sprites.tank(self.direction, self.damage_level, self.tank_color, draw_tank)
+                    rects.append(screen.blit(tank_sprite, (x - TANK_CENTER, y - TANK_CENTER)))
+                else:
+                    rects.append(self.draw_realistic_tank(screen, x, y))
             else:  # Body segments
                 if lifetime > 0:  # Only draw visible segments
                     # Make segments smaller as they go back and fade based on lifetime
@@ -310,66 +434,59 @@ class TankSnake:
                     alpha = int(255 * alpha_factor)
                     color = (*self.body_color, alpha)
                     
-                    # Create surface for alpha blending
-                    segment_surface = pygame.Surface((base_size * 2, base_size * 2))
-                    segment_surface.set_alpha(alpha)
-                    segment_surface.fill(self.body_color)
+                    # Pre-rendered segment, or a fresh surface for alpha blending
+                    if sprites is not None:
+                        segment_surface = sprites.segment(base_size, self.body_color, alpha)
+                    else:
+                        segment_surface = pygame.Surface((base_size * 2, base_size * 2))
+                        segment_surface.set_alpha(alpha)
+                        segment_surface.fill(self.body_color)
                     
                     # Draw segment
-                    screen.blit(segment_surface, (x - base_size, y - base_size))
+                    rects.append(screen.blit(segment_surface, (x - base_size, y - base_size)))
+        self.profiler.mark("draw_trail")
         
         # Draw trap connections when active
         if self.trap_active and len(self.segments) > 3:
-            visible_segments = [(x, y) for x, y, lifetime in self.segments if lifetime > 180]  # Updated visibility threshold
-            if len(visible_segments) > 3:
+            poly_x, poly_y, _ = self.segments.views(min_lifetime=180)  # Updated visibility threshold
+            if len(poly_x) > 3:
+                visible_segments = np.column_stack((poly_x, poly_y))
                 # Draw pulsing red outline to show trap area
                 pulse = int(128 + 127 * math.sin(pygame.time.get_ticks() * 0.01))
                 trap_color = (255, pulse // 2, pulse // 2)
                 
                 try:
-                    pygame.draw.polygon(screen, trap_color, visible_segments, 3)
+                    rects.append(pygame.draw.polygon(screen, trap_color, visible_segments, 3))
                 except:
                     pass  # Skip if polygon is invalid
                 
                 # Draw timer
-                font = pygame.font.Font(None, 36)
                 timer_seconds = (self.trap_timer // 60) + 1
                 timer_text = f"TRAP: {timer_seconds}s"
-                text_surface = font.render(timer_text, True, RED)
-                screen.blit(text_surface, (SCREEN_WIDTH - 150, 50))
+                if text is not None:
+                    text_surface = text.render(timer_text, RED, 36)
+                else:
+                    font = pygame.font.Font(None, 36)
+                    text_surface = font.render(timer_text, True, RED)
+                rects.append(screen.blit(text_surface, (SCREEN_WIDTH - 150, 50)))
+            self.profiler.mark("draw_trap")
         
         # Draw damage effects
         if self.damage_level > 0:
-            self.draw_damage_effects(screen)
+            rects.extend(self.draw_damage_effects(screen, sprites, head))
+            self.profiler.mark("draw_effects")
+        
+        return rects
     
     def draw_realistic_tank(self, screen, x, y):
-        """Draw a more realistic Sherman tank"""
-        # Tank body (main hull)
-        tank_rect = pygame.Rect(x - 12, y - 8, 24, 16)
-        pygame.draw.rect(screen, self.tank_color, tank_rect)
-        pygame.draw.rect(screen, WHITE, tank_rect, 2)
-        
-        # Tank turret
-        turret_rect = pygame.Rect(x - 8, y - 6, 16, 12)
-        pygame.draw.rect(screen, self.tank_color, turret_rect)
-        pygame.draw.rect(screen, WHITE, turret_rect, 1)
-        
-        # Tank cannon (pointing in direction)
-        cannon_length = 20
-        cannon_end_x = x + math.cos(math.radians(self.direction)) * cannon_length
-        cannon_end_y = y + math.sin(math.radians(self.direction)) * cannon_length
-        pygame.draw.line(screen, WHITE, (x, y), (cannon_end_x, cannon_end_y), 3)
-        
-        # Tank tracks
-        track_color = GRAY
-        left_track = pygame.Rect(x - 14, y - 10, 4, 20)
-        right_track = pygame.Rect(x + 10, y - 10, 4, 20)
-        pygame.draw.rect(screen, track_color, left_track)
-        pygame.draw.rect(screen, track_color, right_track)
-    
-    def draw_damage_effects(self, screen):
-        """Draw damage effects like smoke and sparks"""
-        head_x, head_y, _ = self.segments[0]
+        """Draw a more realistic Sherman tank, returning its bounding rect"""
+        cos_a, sin_a = self.heading()
+        return draw_tank(screen, x, y, cos_a, sin_a, self.tank_color)
+    
+    def draw_damage_effects(self, screen, sprites=None, head=None):
+        """Draw damage effects like smoke and sparks, returning the rects drawn"""
+        rects = []
+        head_x, head_y = head if head is not None else self.segments.head()
         
         if self.damage_level >= 1:
             # Smoke effects
@@ -377,24 +494,302 @@ class TankSnake:
                 smoke_x = head_x + random.randint(-15, 15)
                 smoke_y = head_y + random.randint(-15, 15)
                 smoke_size = random.randint(3, 8)
-                pygame.draw.circle(screen, GRAY, (int(smoke_x), int(smoke_y)), smoke_size)
+                rects.append(self.draw_circle(screen, sprites, GRAY, smoke_x, smoke_y, smoke_size))
         
         if self.damage_level >= 2:
             # Sparks/fire effects
             for i in range(5):
                 spark_x = head_x + random.randint(-10, 10)
                 spark_y = head_y + random.randint(-10, 10)
-                pygame.draw.circle(screen, ORANGE, (int(spark_x), int(spark_y)), 2)
+                rects.append(self.draw_circle(screen, sprites, ORANGE, spark_x, spark_y, 2))
+        
+        return rects
+    
+    def draw_circle(self, screen, sprites, color, x, y, radius):
+        """Draw a filled effect circle, from the sprite cache when available"""
+        if sprites is not None:
+            return screen.blit(sprites.circle(radius, color), (int(x) - radius, int(y) - radius))
+        return pygame.draw.circle(screen, color, (int(x), int(y)), radius)
+
+# EnemySwarm.update runs per enemy in Python up to this many enemy-trail point pairs (6 enemies x 13
+# trail points is 78), batched above; the measured break-even is about 300 pairs
+SCALAR_PAIRS = 256
+# Batched avoidance tests every enemy-trail pair directly up to this many pairs, through the trail hash
+# above (break-even about 15,000 pairs)
+HASH_MIN_PAIRS = 16384
+# Bullet and tank collisions scan every enemy directly up to this many enemies, query the enemy hash
+# above (break-even about 200 enemies)
+DIRECT_SCAN_ENEMIES = 128
+
+class EnemySwarm:
+    """All enemies stored as parallel NumPy arrays and updated in batched passes"""
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.avoidance_radius = np.zeros(capacity)
+        self.trapped = np.zeros(capacity, dtype=bool)
+        self.prev_x = np.zeros(capacity)  # Positions one tick ago, for render interpolation
+        self.prev_y = np.zeros(capacity)
+        self.enemies = []  # Enemy views, index-aligned with the arrays
+        # Spatial hashes: enemy positions (rebuilt lazily once positions change) and trail points
+        self.enemy_grid = SpatialHash(SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE)
+        self.enemy_grid_valid = False
+        self.trail_grid = SpatialHash(SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE)
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return iter(self.enemies)
+    
+    def __getitem__(self, index):
+        return self.enemies[index]
+    
+    def __contains__(self, enemy):
+        return enemy.swarm is self and enemy.index < self.count and self.enemies[enemy.index] is enemy
+    
+    def _grow(self):
+        """Double the array capacity"""
+        capacity = max(1, len(self.x) * 2)
+        for column in ("x", "y", "speed", "size", "avoidance_radius", "trapped", "prev_x", "prev_y"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, column, new)
+    
+    def add(self, x, y, speed=1.5, size=8, avoidance_radius=50):
+        """Create a new enemy in this swarm and return its view"""
+        enemy = Enemy.__new__(Enemy)
+        enemy.color = RED
+        self._insert(enemy, x, y, speed, size, avoidance_radius, False)
+        return enemy
+    
+    def append(self, enemy):
+        """Move an existing enemy (and its current state) into this swarm"""
+        values = (enemy.x, enemy.y, enemy.speed, enemy.size, enemy.avoidance_radius, enemy.trapped)
+        if enemy in enemy.swarm:
+            enemy.swarm.remove(enemy)
+        self._insert(enemy, *values)
+    
+    def _insert(self, enemy, x, y, speed, size, avoidance_radius, trapped):
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.size[i] = size
+        self.avoidance_radius[i] = avoidance_radius
+        self.trapped[i] = trapped
+        self.prev_x[i] = x
+        self.prev_y[i] = y
+        enemy.swarm = self
+        enemy.index = i
+        self.enemies.append(enemy)
+        self.count += 1
+        self.enemy_grid_valid = False
+    
+    def remove(self, enemy):
+        """Remove an enemy by moving the last enemy into its slot (O(1))"""
+        if enemy not in self:
+            raise ValueError("enemy is not in this swarm")
+        i = enemy.index
+        last = self.count - 1
+        columns = (self.x, self.y, self.speed, self.size, self.avoidance_radius, self.trapped)
+        values = [column[i] for column in columns]
+        if i != last:
+            for column in columns + (self.prev_x, self.prev_y):
+                column[i] = column[last]
+            moved = self.enemies[last]
+            moved.index = i
+            self.enemies[i] = moved
+        self.enemies.pop()
+        self.count = last
+        self.enemy_grid_valid = False
+        
+        # The removed view keeps its last known state in a private swarm
+        EnemySwarm(capacity=1)._insert(enemy, *values)
+    
+    def set_count(self, n):
+        """Resize to `n` enemies for a restore: slots keep their views, new slots get fresh ones, columns are left to the caller"""
+        while len(self.x) < n:
+            self._grow()
+        views = self.enemies
+        del views[n:]
+        for i in range(len(views), n):
+            enemy = Enemy.__new__(Enemy)
+            enemy.color = RED
+            enemy.swarm = self
+            enemy.index = i
+            views.append(enemy)
+        self.count = n
+        self.enemy_grid_valid = False
+    
+    def save_positions(self):
+        """Remember current positions as the previous tick's"""
+        np.copyto(self.prev_x[:self.count], self.x[:self.count])
+        np.copyto(self.prev_y[:self.count], self.y[:self.count])
+    
+    def interpolated_positions(self, alpha):
+        """Positions blended between the previous and current tick (no blending across a wrap)"""
+        n = self.count
+        return (lerp_wrapped(self.prev_x[:n], self.x[:n], alpha, SCREEN_WIDTH),
+                lerp_wrapped(self.prev_y[:n], self.y[:n], alpha, SCREEN_HEIGHT))
+    
+    def grid(self):
+        """Spatial hash of current enemy positions, rebuilt only when they have changed"""
+        if not self.enemy_grid_valid:
+            self.enemy_grid.rebuild(self.x[:self.count], self.y[:self.count])
+            self.enemy_grid_valid = True
+        return self.enemy_grid
+    
+    def update(self, player_pos, trail_x, trail_y):
+        """Avoid trail segments, pursue the player and wrap, for every enemy at once.
+        
+        Small swarms (up to SCALAR_PAIRS enemy-trail pairs, which covers the
+        normal game) take a per-enemy Python pass; NumPy's per-call overhead
+        only pays off above that. Both paths do the same float operations in
+        the same order - each enemy's trail pushes are summed head first - so
+        a game gives the same result whichever path each tick takes.
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.enemy_grid_valid = False
+        if n * len(trail_x) <= SCALAR_PAIRS:
+            self._update_scalar(player_pos, trail_x.tolist(), trail_y.tolist())
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        speed = self.speed[:n]
+        
+        # Avoidance: push away from trail points inside the avoidance radius, testing
+        # every pair directly or, for long trails and big swarms, only hashed neighbours
+        if len(trail_x):
+            if n * len(trail_x) <= HASH_MIN_PAIRS:
+                dx = x[:, None] - trail_x
+                dy = y[:, None] - trail_y
+                distance = np.sqrt(dx * dx + dy * dy)
+                radius = self.avoidance_radius[:n, None]
+                near, point = np.nonzero((distance < radius) & (distance > 0))  # Per enemy, in trail order
+                dx = dx[near, point]
+                dy = dy[near, point]
+                distance = distance[near, point]
+                radius = self.avoidance_radius[near]
+            else:
+                self.trail_grid.rebuild(trail_x, trail_y)
+                near, point = self.trail_grid.query_pairs(x, y, self.avoidance_radius[:n].max())
+                order = np.lexsort((point, near))  # Each enemy's pushes in trail order, as the scalar pass adds them
+                near = near[order]
+                point = point[order]
+                radius = self.avoidance_radius[near]
+                dx = x[near] - trail_x[point]
+                dy = y[near] - trail_y[point]
+                distance = np.sqrt(dx * dx + dy * dy)
+                close = (distance < radius) & (distance > 0)
+                near = near[close]
+                dx = dx[close]
+                dy = dy[close]
+                distance = distance[close]
+                radius = radius[close]
+            push = (radius - distance) / radius * (speed[near] * 2) / distance
+            x += np.bincount(near, weights=dx * push, minlength=n)
+            y += np.bincount(near, weights=dy * push, minlength=n)
+        
+        # Pursuit: head for the player along the shortest wrapped path
+        free = ~self.trapped[:n]
+        player_x, player_y = player_pos
+        dx = player_x - x
+        dy = player_y - y
+        dx = np.where(np.abs(dx) > SCREEN_WIDTH / 2, dx - np.copysign(SCREEN_WIDTH, dx), dx)
+        dy = np.where(np.abs(dy) > SCREEN_HEIGHT / 2, dy - np.copysign(SCREEN_HEIGHT, dy), dy)
+        distance = np.sqrt(dx * dx + dy * dy)
+        chase = free & (distance > 30)
+        safe_distance = np.where(chase, distance, 1.0)
+        x += np.where(chase, dx / safe_distance * speed, 0.0)
+        y += np.where(chase, dy / safe_distance * speed, 0.0)
+        
+        # Screen wrapping (trapped enemies hold still)
+        x[free & (x < 0)] = SCREEN_WIDTH
+        x[free & (x > SCREEN_WIDTH)] = 0
+        y[free & (y < 0)] = SCREEN_HEIGHT
+        y[free & (y > SCREEN_HEIGHT)] = 0
+    
+    def _update_scalar(self, player_pos, trail_x, trail_y):
+        """update() one enemy at a time on Python floats (trail points as lists)"""
+        n = self.count
+        xs = self.x[:n].tolist()
+        ys = self.y[:n].tolist()
+        player_x, player_y = player_pos
+        trail = list(zip(trail_x, trail_y))
+        for i, (x, y, speed, radius, trapped) in enumerate(zip(
+                xs, ys, self.speed[:n].tolist(), self.avoidance_radius[:n].tolist(), self.trapped[:n].tolist())):
+            push_x = push_y = 0.0
+            for point_x, point_y in trail:
+                dx = x - point_x
+                dy = y - point_y
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance < radius and distance > 0:
+                    push = (radius - distance) / radius * (speed * 2) / distance
+                    push_x += dx * push
+                    push_y += dy * push
+            x += push_x
+            y += push_y
+            
+            dx = player_x - x
+            dy = player_y - y
+            if abs(dx) > SCREEN_WIDTH / 2:
+                dx -= math.copysign(SCREEN_WIDTH, dx)
+            if abs(dy) > SCREEN_HEIGHT / 2:
+                dy -= math.copysign(SCREEN_HEIGHT, dy)
+            if not trapped:
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance > 30:
+                    x += dx / distance * speed
+                    y += dy / distance * speed
+                if x < 0:
+                    x = SCREEN_WIDTH
+                elif x > SCREEN_WIDTH:
+                    x = 0
+                if y < 0:
+                    y = SCREEN_HEIGHT
+                elif y > SCREEN_HEIGHT:
+                    y = 0
+            xs[i] = x
+            ys[i] = y
+        self.x[:n] = xs
+        self.y[:n] = ys
+
+class _SwarmColumn:
+    """Exposes one EnemySwarm array as a per-enemy attribute"""
+    def __init__(self, column):
+        self.column = column
+    
+    def __get__(self, enemy, owner):
+        if enemy is None:
+            return self
+        return getattr(enemy.swarm, self.column)[enemy.index]
+    
+    def __set__(self, enemy, value):
+        getattr(enemy.swarm, self.column)[enemy.index] = value
+        enemy.swarm.enemy_grid_valid = False
 
 class Enemy:
+    """A single enemy - a view onto one slot of an EnemySwarm"""
+    x = _SwarmColumn("x")
+    y = _SwarmColumn("y")
+    speed = _SwarmColumn("speed")
+    size = _SwarmColumn("size")
+    trapped = _SwarmColumn("trapped")
+    avoidance_radius = _SwarmColumn("avoidance_radius")  # Increased for better trail avoidance
+    
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.speed = 1.5
-        self.size = 8
+        # Standalone enemies live in a private one-slot swarm until adopted by a game
         self.color = RED
-        self.trapped = False
-        self.avoidance_radius = 50  # Increased for better trail avoidance
+        EnemySwarm(capacity=1)._insert(self, x, y, 1.5, 8, 50, False)
         
     def update(self, player_pos):
         """Update enemy AI - avoid trail segments and pursue player"""
@@ -469,11 +864,14 @@ class Enemy:
                 self.x += avoid_x * avoidance_strength * self.speed * 2
                 self.y += avoid_y * avoidance_strength * self.speed * 2
     
-    def draw(self, screen):
-        """Draw the enemy"""
+    def draw(self, screen, sprites=None, pos=None):
+        """Draw the enemy (at `pos` if given), returning the rect drawn"""
         color = ORANGE if self.trapped else self.color
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size, 2)
+        size = int(self.size)
+        x, y = pos if pos is not None else (self.x, self.y)
+        if sprites is not None:
+            return screen.blit(sprites.enemy(size, color, draw_enemy), (int(x) - size, int(y) - size))
+        return draw_enemy(screen, int(x), int(y), size, color)
 
 class Bullet:
     def __init__(self, x, y, direction):
@@ -483,131 +881,379 @@ class Bullet:
         self.speed = 8
         self.size = 3
         self.color = YELLOW
+        # Heading never changes, so work out the per-tick velocity once
+        cos_a, sin_a = heading_vector(direction)
+        self.velocity_x = cos_a * self.speed
+        self.velocity_y = sin_a * self.speed
+        self.prev_x = x  # Position one tick ago, for render interpolation
+        self.prev_y = y
         
     def update(self):
         """Update bullet position"""
-        self.x += math.cos(math.radians(self.direction)) * self.speed
-        self.y += math.sin(math.radians(self.direction)) * self.speed
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x += self.velocity_x
+        self.y += self.velocity_y
         
         # Check if bullet is off screen
         return (self.x < 0 or self.x > SCREEN_WIDTH or 
                 self.y < 0 or self.y > SCREEN_HEIGHT)
     
-    def draw(self, screen):
-        """Draw the bullet"""
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+    def draw(self, screen, sprites=None, pos=None):
+        """Draw the bullet (at `pos` if given), returning the rect drawn"""
+        x, y = pos if pos is not None else (self.x, self.y)
+        if sprites is not None:
+            sprite = sprites.circle(self.size, self.color)
+            return screen.blit(sprite, (int(x) - self.size, int(y) - self.size))
+        return pygame.draw.circle(screen, self.color, (int(x), int(y)), self.size)
 
-def main():
-    # Set up the display
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Sherman Tank Snake - Competitive Edition")
-    clock = pygame.time.Clock()
-    
-    # Create game objects
-    tank_snake = TankSnake(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-    enemies = []
-    bullets = []
+class InputFrame:
+    """Player input for a single simulation tick"""
+    # Map pygame key codes onto input fields so TankSnake can index a frame like get_pressed()
+    KEY_FIELDS = {
+        pygame.K_UP: "up", pygame.K_w: "up",
+        pygame.K_DOWN: "down", pygame.K_s: "down",
+        pygame.K_LEFT: "left", pygame.K_a: "left",
+        pygame.K_RIGHT: "right", pygame.K_d: "right",
+        pygame.K_SPACE: "shoot",
+    }
     
-    # Spawn initial enemies
-    for i in range(4):
-        enemy = Enemy(random.randint(50, SCREEN_WIDTH - 50), 
-                     random.randint(50, SCREEN_HEIGHT - 50))
-        enemies.append(enemy)
+    def __init__(self, up=False, down=False, left=False, right=False,
+                 shoot=False, trap=False, quit=False, overlay=False):
+        self.up = up
+        self.down = down
+        self.left = left
+        self.right = right
+        self.shoot = shoot
+        self.trap = trap  # T pressed this tick (manual detonation)
+        self.quit = quit  # ESC pressed or window closed this tick
+        self.overlay = overlay  # F3 pressed this frame (profiler overlay toggle, not game input)
     
-    # Game state
-    running = True
-    frame_count = 0
-    last_shot_time = 0
-    shot_cooldown = 15  # Frames between shots
+    def __getitem__(self, key):
+        field = self.KEY_FIELDS.get(key)
+        return field is not None and getattr(self, field)
     
-    print("🎮 Sherman Tank Snake - Competitive Edition")
-    print("🔧 Latest Fixes:")
-    print("   ✅ Extended trail lifetime (10+ seconds)")
-    print("   ✅ Tank immune to own trail")
-    print("   ✅ Screen edge wrapping (like classic Snake)")
-    print("   ✅ Competitive enemy collision damage")
-    print("   ✅ Working trap system")
-    print("\nControls:")
-    print("   WASD/Arrows: Move tank")
-    print("   SPACEBAR: Shoot")
-    print("   T: Manual trap trigger")
-    print("   ESC: Quit")
-    print("\n🎯 Strategy Tips:")
-    print("   • Use screen edges to escape enemies")
-    print("   • Encircle enemies with your trail to trap them")
-    print("   • Avoid direct enemy contact - it damages your tank!")
-    print("   • Use manual trap trigger (T) for tactical detonations")
+    def held(self):
+        """Copy of this frame with the one-shot (trap/quit/overlay) presses cleared"""
+        return InputFrame(self.up, self.down, self.left, self.right, self.shoot)
     
-    while running:
-        frame_count += 1
-        
-        # Handle events
+    @classmethod
+    def from_pygame(cls):
+        """Drain the pygame event queue and read held keys into an input frame"""
+        frame = cls()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                frame.quit = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    running = False
+                    frame.quit = True
                 elif event.key == pygame.K_t:
-                    # Manual trap activation
-                    destroyed = tank_snake.activate_trap()
-                    for enemy in destroyed:
-                        if enemy in enemies:
-                            enemies.remove(enemy)
+                    frame.trap = True
+                elif event.key == pygame.K_F3:
+                    frame.overlay = True
         
-        # Get pressed keys
         keys = pygame.key.get_pressed()
+        for key, field in cls.KEY_FIELDS.items():
+            if keys[key]:
+                setattr(frame, field, True)
+        return frame
+
+# Flat snapshot layout (GameState.snapshot): bump SNAPSHOT_LAYOUT, and replay.FORMAT_VERSION, whenever it changes
+SNAPSHOT_LAYOUT = 2
+SNAPSHOT_HEADER = 6
+SNAPSHOT_SCALARS = 11 + 14 + 7  # Game fields, tank fields, previous head, trail tick/lifetime, RNG version/gauss
+RNG_WORDS = 625  # random.Random state: 624 Mersenne Twister words and the position
+TRAPPED_WIDTH = 7  # Swarm slot (-1 if gone), x, y, speed, size, avoidance radius, trapped
+
+def snapshot_number(value):
+    """Float from a snapshot back to an int when it is whole (ints are what the game normally holds)"""
+    return int(value) if value.is_integer() else value
+
+class GameState:
+    """Headless game simulation - one step() call advances the world by one tick"""
+    def __init__(self, seed=None, max_enemies=6, spawn_interval=300, wave_size=1,
+                 initial_enemies=4, max_length=12, invulnerable=False, profiler=None, events=None):
+        self.rng = random.Random(seed)  # Seeded stream so runs are reproducible
+        self.tank_snake = TankSnake(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, max_length)
+        self.attach(profiler, events)
+        self.enemies = EnemySwarm(capacity=max(16, initial_enemies))
+        self.bullets = []
+        self.running = True
+        self.frame_count = 0
+        self.shot_kills = 0  # Enemies destroyed by bullets
+        self.trap_kills = 0  # Enemies destroyed by trap detonations (timer or manual)
+        self.last_shot_time = 0
+        self.shot_cooldown = 15  # Frames between shots
+        self.trap_check_interval = 30  # Frames between auto-trap checks (1 = every frame)
+        self.max_enemies = max_enemies  # No spawning at or above this count
+        self.spawn_interval = spawn_interval  # Frames between spawn waves
+        self.wave_size = wave_size  # Enemies per spawn wave
+        self.invulnerable = invulnerable  # Enemy contact pushes but never damages (stress runs)
+        
+        # Spawn initial enemies
+        for i in range(initial_enemies):
+            self.spawn_enemy()
+    
+    def attach(self, profiler=None, events=None):
+        """Share a profiler and event bus with the game and its tank (the shared disabled profiler and null bus if None)"""
+        self.profiler = profiler if profiler is not None else DISABLED_PROFILER
+        self.events = events if events is not None else NULL_EVENTS
+        self.tank_snake.profiler = self.profiler
+        self.tank_snake.events = self.events
+    
+    # Scalar attributes captured by snapshot(), in buffer order
+    SNAPSHOT_FIELDS = ("frame_count", "running", "shot_kills", "trap_kills", "last_shot_time", "shot_cooldown", "trap_check_interval",
+                       "max_enemies", "spawn_interval", "wave_size", "invulnerable")
+    TANK_SNAPSHOT_FIELDS = ("direction", "speed", "base_speed", "rotation_speed", "base_rotation_speed",
+                            "move_counter", "move_threshold", "trap_active", "trap_timer", "trap_duration",
+                            "auto_trap_check_timer", "damage_level", "max_damage", "max_length")
+    BOOL_FIELDS = {"running", "invulnerable", "trap_active"}
+    ENEMY_COLUMNS = ("x", "y", "speed", "size", "avoidance_radius", "trapped", "prev_x", "prev_y")
+    BULLET_FIELDS = ("x", "y", "direction", "velocity_x", "velocity_y", "prev_x", "prev_y")
+    
+    def snapshot(self, out=None):
+        """Pack everything step() depends on into a flat float64 array (see restore).
+        
+        Layout: SNAPSHOT_HEADER (layout id, length, enemy/trail/bullet/trapped
+        counts), the scalars, the spawn RNG, then the enemy columns, trail
+        entries (oldest first), bullets and trapped enemies. `out` is reused
+        when it is big enough, so a caller snapshotting every tick allocates
+        nothing; the filled length is out[1].
+        """
+        tank_snake = self.tank_snake
+        enemies = self.enemies
+        segments = tank_snake.segments
+        bullets = self.bullets
+        trapped = tank_snake.trapped_enemies
+        n, m, b, t = enemies.count, segments.count, len(bullets), len(trapped)
+        size = SNAPSHOT_HEADER + SNAPSHOT_SCALARS + RNG_WORDS + len(self.ENEMY_COLUMNS) * n + 3 * m + \
+            len(self.BULLET_FIELDS) * b + TRAPPED_WIDTH * t
+        if out is None or len(out) < size:
+            out = np.empty(size + size // 2)  # Headroom so a growing game doesn't reallocate every time
+        
+        version, words, gauss_next = self.rng.getstate()
+        out[:SNAPSHOT_HEADER] = (SNAPSHOT_LAYOUT, size, n, m, b, t)
+        pos = SNAPSHOT_HEADER
+        scalars = [getattr(self, name) for name in self.SNAPSHOT_FIELDS]
+        scalars += [getattr(tank_snake, name) for name in self.TANK_SNAPSHOT_FIELDS]
+        scalars += [*tank_snake.previous_head, segments.tick, segments.lifetime,
+                    version, gauss_next is not None, gauss_next or 0.0]
+        out[pos:pos + SNAPSHOT_SCALARS] = scalars
+        pos += SNAPSHOT_SCALARS
+        out[pos:pos + RNG_WORDS] = np.frombuffer(array.array("Q", words), dtype=np.uint64)  # Fastest int tuple -> NumPy
+        pos += RNG_WORDS
+        for column in self.ENEMY_COLUMNS:
+            out[pos:pos + n] = getattr(enemies, column)[:n]
+            pos += n
+        for column in segments.entries():
+            out[pos:pos + m] = column
+            pos += m
+        out[pos:pos + len(self.BULLET_FIELDS) * b] = [getattr(bullet, name) for bullet in bullets
+                                                      for name in self.BULLET_FIELDS]
+        pos += len(self.BULLET_FIELDS) * b
+        # Trapped enemies by swarm slot; one no longer in the swarm (shot while trapped) is kept by value
+        out[pos:pos + TRAPPED_WIDTH * t] = [value for enemy in trapped for value in
+                                            (enemy.index if enemy in enemies else -1, enemy.x, enemy.y,
+                                             enemy.speed, enemy.size, enemy.avoidance_radius, enemy.trapped)]
+        return out
+    
+    def restore(self, snapshot):
+        """Return the game in place to the state captured by snapshot(); it then steps on exactly as the original"""
+        layout, size, n, m, b, t = (int(value) for value in snapshot[:SNAPSHOT_HEADER])
+        if layout != SNAPSHOT_LAYOUT or len(snapshot) < size:
+            raise ValueError("not a snapshot of this game version")
+        tank_snake = self.tank_snake
+        enemies = self.enemies
+        segments = tank_snake.segments
+        
+        pos = SNAPSHOT_HEADER
+        scalars = snapshot[pos:pos + SNAPSHOT_SCALARS].tolist()
+        pos += SNAPSHOT_SCALARS
+        for target, names in ((self, self.SNAPSHOT_FIELDS), (tank_snake, self.TANK_SNAPSHOT_FIELDS)):
+            for name in names:
+                value = scalars.pop(0)
+                setattr(target, name, bool(value) if name in self.BOOL_FIELDS else snapshot_number(value))
+        head_x, head_y, trail_tick, lifetime, version, has_gauss, gauss_next = scalars
+        tank_snake.previous_head = (head_x, head_y)
+        segments.lifetime = snapshot_number(lifetime)
+        words = tuple(snapshot[pos:pos + RNG_WORDS].astype(np.int64).tolist())
+        self.rng.setstate((int(version), words, gauss_next if has_gauss else None))
+        pos += RNG_WORDS
+        
+        enemies.set_count(n)
+        for column in self.ENEMY_COLUMNS:
+            getattr(enemies, column)[:n] = snapshot[pos:pos + n]
+            pos += n
+        segments.load(snapshot[pos:pos + m], snapshot[pos + m:pos + 2 * m], snapshot[pos + 2 * m:pos + 3 * m],
+                      int(trail_tick))
+        pos += 3 * m
+        
+        width = len(self.BULLET_FIELDS)
+        bullets = self.bullets
+        del bullets[b:]
+        for i, values in enumerate(snapshot[pos:pos + width * b].reshape(b, width).tolist()):
+            if i == len(bullets):
+                bullets.append(Bullet(0, 0, 0))
+            for name, value in zip(self.BULLET_FIELDS, values):
+                setattr(bullets[i], name, value)
+        pos += width * b
+        
+        tank_snake.trapped_enemies = trapped = []
+        for index, x, y, speed, size, avoidance_radius, is_trapped in \
+                snapshot[pos:pos + TRAPPED_WIDTH * t].reshape(t, TRAPPED_WIDTH).tolist():
+            if index >= 0:
+                trapped.append(enemies[int(index)])
+            else:
+                enemy = Enemy(x, y)
+                enemy.speed, enemy.size, enemy.avoidance_radius = speed, size, avoidance_radius
+                enemy.trapped = bool(is_trapped)
+                trapped.append(enemy)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, profiler=None, events=None):
+        """New game restored from a snapshot"""
+        state = cls(initial_enemies=0, profiler=profiler, events=events)
+        state.restore(snapshot)
+        return state
+    
+    def clone(self, snapshot):
+        """New game of this type restored from a snapshot - subclasses carry over settings snapshots leave out"""
+        return type(self).from_snapshot(snapshot)
+    
+    def spawn_enemy(self):
+        """Spawn an enemy at a random position away from the screen edges"""
+        enemy = self.enemies.add(self.rng.randint(50, SCREEN_WIDTH - 50), 
+                                 self.rng.randint(50, SCREEN_HEIGHT - 50))
+        self.events.emit("enemy_spawned", enemy.x, enemy.y, len(self.enemies))
+        return enemy
+    
+    def step(self, input_frame):
+        """Advance the game by one tick; returns False once the game is over"""
+        self.frame_count += 1
+        self.events.tick = self.frame_count
+        self.enemies.save_positions()
         
-        # Handle shooting
-        if keys[pygame.K_SPACE] and frame_count - last_shot_time > shot_cooldown:
-            head_x, head_y, _ = tank_snake.segments[0]
-            bullet = Bullet(head_x, head_y, tank_snake.direction)
-            bullets.append(bullet)
-            last_shot_time = frame_count
+        profiler = self.profiler
+        
+        self.handle_input(input_frame)
+        profiler.mark("input")
         
         # Update tank
-        tank_snake.update_movement(keys)
+        self.tank_snake.update_movement(input_frame)
+        profiler.mark("movement")
+        
+        self.update_traps()
+        profiler.mark("trap")
+        self.update_bullets()
+        profiler.mark("bullets")
+        self.update_enemies()
+        profiler.mark("enemies")
+        self.spawn_enemies()
+        profiler.mark("spawn")
+        
+        return self.running
+    
+    def handle_input(self, input_frame):
+        """Quit, manual trap detonation and shooting"""
+        tank_snake = self.tank_snake
+        if input_frame.quit:
+            self.running = False
+        if input_frame.trap:
+            # Manual trap activation
+            destroyed = tank_snake.activate_trap()
+            for enemy in destroyed:
+                if enemy in self.enemies:
+                    self.enemies.remove(enemy)
+                    self.trap_kills += 1
+        
+        # Handle shooting
+        if input_frame.shoot and self.frame_count - self.last_shot_time > self.shot_cooldown:
+            head_x, head_y = tank_snake.segments.head()
+            bullet = Bullet(head_x, head_y, tank_snake.direction)
+            self.bullets.append(bullet)
+            self.last_shot_time = self.frame_count
+    
+    def update_traps(self):
+        """Auto-trap check and trap countdown"""
+        tank_snake = self.tank_snake
+        enemies = self.enemies
         
-        # Auto-check for traps every 30 frames (0.5 seconds)
-        if frame_count % 30 == 0:
+        # Auto-check for traps every 30 frames (0.5 seconds) by default
+        if self.frame_count % self.trap_check_interval == 0:
             tank_snake.check_auto_trap(enemies)
+            self.profiler.mark("auto_trap")
         
         # Update trap system
         destroyed_enemies = tank_snake.update_trap(enemies)
         for enemy in destroyed_enemies:
             if enemy in enemies:
                 enemies.remove(enemy)
-                print(f"💥 Enemy destroyed by trap! Remaining: {len(enemies)}")
-        
-        # Update bullets
+                self.trap_kills += 1
+                self.events.emit("trap_kill", len(enemies))
+    
+    def update_bullets(self):
+        """Move bullets and resolve hits - against every enemy in a small swarm, nearby grid cells in a big one"""
+        enemies = self.enemies
+        bullets = self.bullets
+        if not bullets:
+            return
+        n = len(enemies)
+        xs = enemies.x[:n].tolist()
+        ys = enemies.y[:n].tolist()
+        sizes = enemies.size[:n].tolist()
+        grid = enemies.grid() if n > DIRECT_SCAN_ENEMIES else None
+        max_enemy_size = max(sizes, default=0)
+        shot = set()
+        shot_enemies = []
         for bullet in bullets[:]:
             if bullet.update():
                 bullets.remove(bullet)
-            else:
-                # Check bullet-enemy collisions
-                for enemy in enemies[:]:
-                    distance = math.sqrt((bullet.x - enemy.x)**2 + (bullet.y - enemy.y)**2)
-                    if distance < bullet.size + enemy.size:
-                        bullets.remove(bullet)
-                        enemies.remove(enemy)
-                        print(f"🎯 Enemy shot! Remaining: {len(enemies)}")
-                        break
-        
-        # Update enemies
-        player_pos = tank_snake.segments[0][:2]  # Get x, y from (x, y, lifetime)
-        for enemy in enemies[:]:
-            enemy.avoid_trail_segments(tank_snake.segments)
-            enemy.update(player_pos)
-            
-            # FIXED: Proper enemy-tank collision with damage
-            head_x, head_y, _ = tank_snake.segments[0]
-            distance = math.sqrt((enemy.x - head_x)**2 + (enemy.y - head_y)**2)
-            if distance < 25:  # Tank body collision
-                print(f"💥 Tank hit by enemy! Distance: {distance:.1f}")
-                if tank_snake.take_damage():
-                    print("💀 Tank destroyed!")
-                    running = False
+                continue
+            # Check bullet-enemy collisions, lowest slot first
+            candidates = range(n) if grid is None else grid.query_point(bullet.x, bullet.y, bullet.size + max_enemy_size)
+            for index in candidates:
+                if index in shot:
+                    continue
+                dx = bullet.x - xs[index]
+                dy = bullet.y - ys[index]
+                distance = math.sqrt(dx * dx + dy * dy)
+                if distance < bullet.size + sizes[index]:
+                    bullets.remove(bullet)
+                    shot.add(index)
+                    shot_enemies.append(enemies[index])
+                    self.events.emit("enemy_shot", len(enemies) - len(shot_enemies))
                     break
+        for enemy in shot_enemies:
+            enemies.remove(enemy)
+        self.shot_kills += len(shot_enemies)
+    
+    def update_enemies(self):
+        """Enemy AI and enemy-tank collisions"""
+        tank_snake = self.tank_snake
+        enemies = self.enemies
+        
+        # Trail avoidance and pursuit in one batched pass
+        player_pos = tank_snake.segments.head()
+        trail_x, trail_y, _ = tank_snake.segments.views()
+        enemies.update(player_pos, trail_x, trail_y)
+        
+        # FIXED: Proper enemy-tank collision with damage (every enemy of a small swarm, else those near the tank)
+        head_x, head_y = tank_snake.segments.head()
+        n = len(enemies)
+        xs = enemies.x[:n].tolist()
+        ys = enemies.y[:n].tolist()
+        for index in range(n) if n <= DIRECT_SCAN_ENEMIES else enemies.grid().query_point(head_x, head_y, 25):
+            enemy = enemies[index]
+            dx = xs[index] - head_x
+            dy = ys[index] - head_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance < 25:  # Tank body collision
+                if not self.invulnerable:
+                    self.events.emit("tank_hit", distance)
+                    if tank_snake.take_damage():
+                        self.events.emit("tank_destroyed")
+                        self.running = False
+                        break
                 # Don't remove enemy immediately - let them bounce off
                 # Push enemy away to prevent multiple hits
                 if distance > 0:
@@ -619,52 +1265,447 @@ def main():
                     # Keep enemy on screen after push
                     enemy.x = max(enemy.size, min(SCREEN_WIDTH - enemy.size, enemy.x))
                     enemy.y = max(enemy.size, min(SCREEN_HEIGHT - enemy.size, enemy.y))
+    
+    def spawn_enemies(self):
+        """Spawn a new wave of enemies occasionally"""
+        if len(self.enemies) < self.max_enemies and self.frame_count % self.spawn_interval == 0:  # Every 5 seconds by default
+            for _ in range(min(self.wave_size, self.max_enemies - len(self.enemies))):
+                self.spawn_enemy()
+
+INSTRUCTIONS = [
+    "WASD: Move | SPACE: Shoot | T: Manual Trap",
+    "Encircle enemies with your trail to auto-trap them!",
+    "Tank is immune to its own trail!"
+]
+
+def stats_text(state):
+    """HUD stats line for a game state"""
+    tank_snake = state.tank_snake
+    text = f"Enemies: {len(state.enemies)} | Damage: {tank_snake.damage_level}/{tank_snake.max_damage}"
+    if tank_snake.trap_active:
+        text += f" | TRAP ACTIVE: {(tank_snake.trap_timer // 60) + 1}s"
+    return text
+
+class Hud:
+    """Stats line and instructions, re-rendered only when the shown values change"""
+    def __init__(self, text=None):
+        self.text = text if text is not None else TextCache()
+        self.stats_key = None
+        self.stats_surface = None
+    
+    def stats_surface_for(self, state):
+        """Rendered stats line, reusing the last surface while the numbers are unchanged"""
+        tank_snake = state.tank_snake
+        trap_seconds = (tank_snake.trap_timer // 60) + 1 if tank_snake.trap_active else None
+        key = (len(state.enemies), tank_snake.damage_level, tank_snake.max_damage, trap_seconds)
+        if key != self.stats_key:
+            self.stats_surface = self.text.render(stats_text(state), WHITE, 36)
+            self.stats_key = key
+        return self.stats_surface
+    
+    def draw(self, screen, state):
+        """Draw the HUD, returning the rects drawn"""
+        rects = [screen.blit(self.stats_surface_for(state), (10, 10))]
         
-        # Spawn new enemies occasionally
-        if len(enemies) < 6 and frame_count % 300 == 0:  # Every 5 seconds
-            enemy = Enemy(random.randint(50, SCREEN_WIDTH - 50), 
-                         random.randint(50, SCREEN_HEIGHT - 50))
-            enemies.append(enemy)
-        
-        # Draw everything
+        # Instructions
+        if state.frame_count < 300:  # Show for first 5 seconds
+            for i, instruction in enumerate(INSTRUCTIONS):
+                surface = self.text.render(instruction, YELLOW, 24)
+                rects.append(screen.blit(surface, (10, SCREEN_HEIGHT - 80 + i * 25)))
+        return rects
+
+def draw_game(screen, state, sprites=None, hud=None, clear=True, alpha=1.0):
+    """Render the current game state onto the screen surface.
+    
+    Returns the rects drawn to. Pass clear=False when a DirtyRectRenderer has
+    already erased last frame's drawings instead of clearing the whole screen.
+    With alpha < 1 the tank, enemies and bullets are drawn that fraction of
+    the way from their previous-tick to their current positions.
+    """
+    tank_snake = state.tank_snake
+    enemies = state.enemies
+    profiler = state.profiler
+    
+    if clear:
         screen.fill(BLACK)
-        
-        # Draw tank and trail
-        tank_snake.draw(screen)
-        
-        # Draw enemies
+    profiler.mark("draw_clear")
+    
+    # Draw tank and trail
+    head = None
+    if alpha < 1.0:
+        (prev_x, prev_y), (head_x, head_y) = tank_snake.previous_head, tank_snake.segments.head()
+        head = (lerp_wrapped(prev_x, head_x, alpha, SCREEN_WIDTH),
+                lerp_wrapped(prev_y, head_y, alpha, SCREEN_HEIGHT))
+    rects = tank_snake.draw(screen, sprites, hud.text if hud is not None else None, head)
+    
+    # Draw enemies
+    if alpha < 1.0:
+        xs, ys = enemies.interpolated_positions(alpha)
+        for enemy, x, y in zip(enemies, xs, ys):
+            rects.append(enemy.draw(screen, sprites, (x, y)))
+    else:
         for enemy in enemies:
-            enemy.draw(screen)
-        
-        # Draw bullets
-        for bullet in bullets:
-            bullet.draw(screen)
-        
-        # Draw UI
-        font = pygame.font.Font(None, 36)
-        
-        # Game stats
-        stats_text = f"Enemies: {len(enemies)} | Damage: {tank_snake.damage_level}/{tank_snake.max_damage}"
-        if tank_snake.trap_active:
-            stats_text += f" | TRAP ACTIVE: {(tank_snake.trap_timer // 60) + 1}s"
-        
-        text_surface = font.render(stats_text, True, WHITE)
-        screen.blit(text_surface, (10, 10))
-        
-        # Instructions
-        if frame_count < 300:  # Show for first 5 seconds
-            instruction_font = pygame.font.Font(None, 24)
-            instructions = [
-                "WASD: Move | SPACE: Shoot | T: Manual Trap",
-                "Encircle enemies with your trail to auto-trap them!",
-                "Tank is immune to its own trail!"
-            ]
-            for i, instruction in enumerate(instructions):
-                inst_surface = instruction_font.render(instruction, True, YELLOW)
-                screen.blit(inst_surface, (10, SCREEN_HEIGHT - 80 + i * 25))
-        
+            rects.append(enemy.draw(screen, sprites))
+    profiler.mark("draw_enemies")
+    
+    # Draw bullets
+    for bullet in state.bullets:
+        pos = None
+        if alpha < 1.0:
+            pos = (bullet.prev_x + (bullet.x - bullet.prev_x) * alpha,
+                   bullet.prev_y + (bullet.y - bullet.prev_y) * alpha)
+        rects.append(bullet.draw(screen, sprites, pos))
+    profiler.mark("draw_bullets")
+    
+    # Draw UI
+    if hud is not None:
+        rects.extend(hud.draw(screen, state))
+        profiler.mark("draw_hud")
+        return rects
+    
+    font = pygame.font.Font(None, 36)
+    text_surface = font.render(stats_text(state), True, WHITE)
+    rects.append(screen.blit(text_surface, (10, 10)))
+    
+    # Instructions
+    if state.frame_count < 300:  # Show for first 5 seconds
+        instruction_font = pygame.font.Font(None, 24)
+        for i, instruction in enumerate(INSTRUCTIONS):
+            inst_surface = instruction_font.render(instruction, True, YELLOW)
+            rects.append(screen.blit(inst_surface, (10, SCREEN_HEIGHT - 80 + i * 25)))
+    profiler.mark("draw_hud")
+    return rects
+
+def entity_counts(state):
+    """Entity counts shown on the profiler overlay"""
+    enemies = state.enemies
+    return {
+        "enemies": len(enemies),
+        "trapped": int(enemies.trapped[:len(enemies)].sum()),
+        "bullets": len(state.bullets),
+        "trail": len(state.tank_snake.segments),
+    }
+
+def present_frame(screen, state, sprites, hud, renderer=None, overlay=None, alpha=1.0):
+    """Draw the game (and the profiler overlay while it is on) and put it on the display"""
+    profiler = state.profiler
+    if renderer is not None:
+        renderer.erase()
+    rects = draw_game(screen, state, sprites, hud, clear=renderer is None, alpha=alpha)
+    if overlay is not None and profiler.enabled:
+        rects.append(overlay.draw(screen, entity_counts(state)))
+        profiler.mark("overlay")
+    if renderer is not None:
+        renderer.present(rects)
+    else:
         pygame.display.flip()
-        clock.tick(FPS)
+    profiler.mark("flip")
+
+def seek_replay(replay, tick, events=None, profiler=None):
+    """GameState at `tick` of a replay: the nearest earlier keyframe, stepped forward with the recorded input"""
+    tick = max(replay.start_tick, min(tick, replay.end_tick))
+    keyframe = replay.keyframe_before(tick)
+    if keyframe is not None:
+        state = GameState.from_snapshot(keyframe[1], profiler=profiler, events=events)
+    else:
+        state = GameState(seed=replay.seed, profiler=profiler, events=events)
+    frames = replay.frames(InputFrame, start=state.frame_count)
+    while state.running and state.frame_count < tick:
+        state.step(next(frames))
+    return state
+
+def play_replay(replay, events=None, profiler=None):
+    """Run a replay headless to its end (or game over); returns the final GameState"""
+    return seek_replay(replay, replay.end_tick, events, profiler)
+
+def close_trace(tracer):
+    """Finish the trace file, if one is being recorded"""
+    if tracer is None:
+        return
+    tracer.close()
+    dropped = f" ({tracer.dropped} dropped)" if tracer.dropped else ""
+    print(f"💾 {tracer.written} trace events written to {tracer.path}{dropped}")
+
+def close_events(events, event_log):
+    """Write out the events still buffered and close the event sinks, `event_log` the JSON Lines one if any"""
+    events.close()
+    if event_log is not None:
+        dropped = f" ({events.dropped} dropped)" if events.dropped else ""
+        print(f"💾 {event_log.written} game events written to {event_log.path}{dropped}")
+
+def parse_args(argv=None):
+    """Command line options for the interactive game"""
+    parser = argparse.ArgumentParser(description="Sherman Tank Snake")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only redraw and present the screen regions that changed")
+    parser.add_argument("--tick-rate", type=float, default=None,
+                        help=f"simulation ticks per second; game rules count ticks, so this sets the game speed "
+                             f"(default: {FPS}, or the rate a replay was recorded at)")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="render frame cap, 0 for uncapped (default: %(default)s)")
+    parser.add_argument("--max-catchup", type=int, default=5,
+                        help="most simulation ticks run per rendered frame (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for enemy spawns (default: random)")
+    parser.add_argument("--profile-overlay", action="store_true",
+                        help="start with the frame profiler overlay shown (F3 toggles it)")
+    parser.add_argument("--trace", metavar="PATH", default=None,
+                        help="record frame phases and game events to a Chrome trace JSON file")
+    parser.add_argument("--event-log", metavar="PATH", default=None,
+                        help="write game events to a JSON Lines file")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record the session's input to a binary replay file")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="play back a replay file instead of reading the keyboard")
+    parser.add_argument("--replay-start", type=int, metavar="TICK", default=0,
+                        help="start playback at this tick, restored from the nearest keyframe")
+    parser.add_argument("--replay-speed", type=float, metavar="X", default=1.0,
+                        help="replay playback speed multiplier (default: %(default)s)")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="let the lookahead autopilot drive the tank (in stress mode, instead of scripted circles)")
+    parser.add_argument("--autopilot-budget", type=float, metavar="MS", default=5.0,
+                        help="autopilot search time per tick in milliseconds (default: %(default)s)")
+    
+    profile = parser.add_argument_group("sampling profiler")
+    profile.add_argument("--profile", action="store_true",
+                         help="sample the game loop's stack and write a flamegraph file on exit")
+    profile.add_argument("--profile-rate", type=float, default=200,
+                         help="samples per second (default: %(default)s)")
+    profile.add_argument("--profile-output", default="profile.collapsed",
+                         help="collapsed-stack output file (default: %(default)s)")
+    profile.add_argument("--profile-top", type=int, default=20,
+                         help="functions listed in the summary (default: %(default)s)")
+    
+    stress = parser.add_argument_group("stress/soak mode")
+    stress.add_argument("--stress", action="store_true",
+                        help="raise the enemy and trail caps and drive the tank in scripted circles")
+    stress.add_argument("--enemies", type=int, default=1000,
+                        help="enemy cap in stress mode (default: %(default)s)")
+    stress.add_argument("--wave-size", type=int, default=100,
+                        help="enemies spawned per wave in stress mode (default: %(default)s)")
+    stress.add_argument("--wave-interval", type=int, default=60,
+                        help="ticks between spawn waves in stress mode (default: %(default)s)")
+    stress.add_argument("--trail", type=int, default=1000,
+                        help="trail segment cap in stress mode (default: %(default)s)")
+    stress.add_argument("--soak-ticks", type=int, default=0,
+                        help="stop after this many ticks, 0 to run until closed (default: %(default)s)")
+    stress.add_argument("--log-interval", type=int, default=60,
+                        help="ticks per logged sample (default: %(default)s)")
+    stress.add_argument("--stress-log", default="stress_log.csv",
+                        help="CSV file for logged samples, '' for console only (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.tick_rate is not None and args.tick_rate <= 0:
+        parser.error("--tick-rate must be positive")
+    if args.tick_rate is not None and args.replay:
+        parser.error("--tick-rate can't be used with --replay, which plays at its recorded rate; "
+                     "use --replay-speed instead")
+    if args.replay_speed <= 0:
+        parser.error("--replay-speed must be positive")
+    return args
+
+def stress_state(args, profiler=None, events=None):
+    """GameState with the enemy and trail caps raised for stress/soak runs"""
+    state = GameState(seed=args.seed, max_enemies=args.enemies, spawn_interval=args.wave_interval,
+                      wave_size=args.wave_size, max_length=args.trail, invulnerable=True,
+                      profiler=profiler, events=events)
+    tank_snake = state.tank_snake
+    tank_snake.move_threshold = 1  # A segment every tick so the trail actually reaches its cap
+    tank_snake.segments.lifetime = max(tank_snake.segments.lifetime, args.trail)
+    return state
+
+def make_autopilot(args):
+    """The lookahead autopilot when --autopilot is given, else None"""
+    if not args.autopilot:
+        return None
+    return Autopilot(InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT, budget=args.autopilot_budget / 1000, seed=args.seed)
+
+def report_autopilot(autopilot):
+    """Print how fast the autopilot's rollouts ran the simulation"""
+    if autopilot is not None:
+        print(f"🤖 Autopilot: {autopilot.decisions} decisions, {autopilot.rollout_ticks:,} rollout ticks "
+              f"at {autopilot.rollout_rate():,.0f} ticks/s")
+
+def run_stress(args, screen, clock, sprites, hud, renderer, overlay, events):
+    """Soak loop: one tick per frame, scripted driving, logging frame time, memory and entity counts"""
+    profiler = overlay.profiler
+    state = stress_state(args, profiler, events)
+    autopilot = make_autopilot(args)
+    log = SoakLog(args.stress_log or None, args.log_interval)
+    print(f"🔥 Stress mode: up to {args.enemies} enemies ({args.wave_size} every {args.wave_interval} ticks), "
+          f"{args.trail} trail segments")
+    
+    while state.running:
+        profiler.begin_frame()
+        input_frame = InputFrame.from_pygame()
+        if input_frame.overlay:
+            profiler.set_enabled(not profiler.enabled)
+        keys = autopilot.drive(state) if autopilot is not None else circle_driving(state.frame_count)
+        for field, held in keys.items():
+            setattr(input_frame, field, held)
+        profiler.mark("events")
+        
+        start = time.perf_counter()
+        state.step(input_frame)
+        middle = time.perf_counter()
+        present_frame(screen, state, sprites, hud, renderer, overlay)
+        log.record(state, middle - start, time.perf_counter() - middle)
+        
+        if args.soak_ticks and state.frame_count >= args.soak_ticks:
+            break
+        clock.tick(args.fps)
+        profiler.mark("idle")
+        profiler.end_frame()
+    
+    log.sample(state)
+    log.close()
+    if args.stress_log:
+        print(f"💾 {log.samples} samples written to {args.stress_log}")
+    report_autopilot(autopilot)
+
+def run_game(args, screen, clock, sprites, hud, renderer, overlay, events):
+    """Interactive loop: keyboard input, fixed-timestep simulation, interpolated rendering"""
+    # Create game state
+    profiler = overlay.profiler
+    replay = recorder = None
+    seed = args.seed
+    if args.replay:
+        replay = Replay.load(args.replay)
+        seed = replay.seed
+        if replay.game_version != GAME_VERSION:
+            print(f"⚠️  Replay recorded with game version {replay.game_version}, this is {GAME_VERSION}; "
+                  f"playback may diverge")
+    elif seed is None:
+        seed = random.randrange(1 << 32)  # Pick the seed up front so it can be logged and recorded
+    # Game rules count ticks, so the tick rate is the game speed; a replay keeps the one it was recorded at
+    tick_rate = replay.tick_rate if replay is not None else args.tick_rate or FPS
+    if args.record:
+        recorder = ReplayRecorder(args.record, seed, GAME_VERSION, tick_rate)
+    if replay is not None:
+        # Catching up to the start tick replays events the viewer never sees, so do it silently
+        state = seek_replay(replay, args.replay_start)
+        state.attach(profiler, events)
+    else:
+        state = GameState(seed=seed, profiler=profiler, events=events)
+    autopilot = make_autopilot(args) if replay is None else None
+    
+    print("🎮 Sherman Tank Snake - Competitive Edition")
+    print("🔧 Latest Fixes:")
+    print("   ✅ Extended trail lifetime (10+ seconds)")
+    print("   ✅ Tank immune to own trail")
+    print("   ✅ Screen edge wrapping (like classic Snake)")
+    print("   ✅ Competitive enemy collision damage")
+    print("   ✅ Working trap system")
+    print("\nControls:")
+    print("   WASD/Arrows: Move tank")
+    print("   SPACEBAR: Shoot")
+    print("   T: Manual trap trigger")
+    print("   F3: Frame profiler overlay")
+    print("   ESC: Quit")
+    print("\n🎯 Strategy Tips:")
+    print("   • Use screen edges to escape enemies")
+    print("   • Encircle enemies with your trail to trap them")
+    print("   • Avoid direct enemy contact - it damages your tank!")
+    print("   • Use manual trap trigger (T) for tactical detonations")
+    if replay is not None:
+        print(f"\n🎞️  Replaying {args.replay} from tick {state.frame_count} of {replay.end_tick}, seed {seed}, "
+              f"{tick_rate:g} ticks/s")
+    else:
+        print(f"\n🎲 Seed {seed}, {tick_rate:g} ticks/s")
+    
+    # Simulation runs at a fixed tick rate; rendering interpolates between ticks
+    if replay is not None:
+        tick_rate *= args.replay_speed
+    timestep = FixedTimestep(tick_rate, args.max_catchup)
+    pending = InputFrame()  # One-shot presses waiting for the next tick
+    replay_frames = replay.frames(InputFrame, start=state.frame_count) if replay is not None else None
+    try:
+        while state.running:
+            profiler.begin_frame()
+            input_frame = InputFrame.from_pygame()
+            if input_frame.overlay:
+                profiler.set_enabled(not profiler.enabled)
+            if replay_frames is not None and input_frame.quit:
+                break  # ESC or closing the window stops playback
+            input_frame.trap = input_frame.trap or pending.trap
+            input_frame.quit = input_frame.quit or pending.quit
+            profiler.mark("events")
+            for _ in range(timestep.advance()):
+                if replay_frames is not None:
+                    input_frame = next(replay_frames, None)
+                    if input_frame is None:
+                        print(f"🏁 Replay finished at tick {state.frame_count}")
+                        state.running = False
+                        break
+                if autopilot is not None:
+                    for field, held in autopilot.drive(state).items():
+                        setattr(input_frame, field, held)
+                if recorder is not None:
+                    recorder.record(state, input_frame)
+                if not state.step(input_frame):
+                    break
+                input_frame = input_frame.held()
+            pending = input_frame
+            
+            present_frame(screen, state, sprites, hud, renderer, overlay, timestep.alpha)
+            clock.tick(args.fps)
+            profiler.mark("idle")
+            profiler.end_frame()
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"💾 {recorder.ticks} ticks of input recorded to {args.record} (seed {seed})")
+        report_autopilot(autopilot)
+
+def close_profile(sampler, args):
+    """Stop the sampling profiler and write its flamegraph input and summary"""
+    if sampler is None:
+        return
+    sampler.stop()
+    sampler.write_collapsed(args.profile_output)
+    print(f"\n🔬 Sampling profile ({args.profile_output}, collapsed stacks for flamegraph.pl/speedscope)")
+    print(sampler.summary(args.profile_top))
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # Set up the display
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Sherman Tank Snake - Competitive Edition")
+    clock = pygame.time.Clock()
+    sprites = SpriteCache()  # After set_mode so sprites match the display format
+    hud = Hud()
+    renderer = DirtyRectRenderer(screen, BLACK) if args.dirty_rects else None
+    # Phase timings cost next to nothing until the overlay is switched on with F3
+    profiler = FrameProfiler(enabled=args.profile_overlay)
+    overlay = ProfilerOverlay(profiler, hud.text)
+    tracer = None
+    if args.trace:
+        tracer = TraceRecorder(args.trace)
+        profiler.tracer = tracer
+    # Game events are buffered and written by a background thread, never from the frame itself
+    events = EventBus()
+    if not args.stress:  # Per-enemy messages would swamp the console (and the timings) in stress mode
+        events.add_sink(ConsoleSink())
+    event_log = None
+    if args.event_log:
+        event_log = JsonlSink(args.event_log)
+        events.add_sink(event_log)
+    if tracer is not None:
+        events.subscribe(tracer.on_event)
+    sampler = None
+    if args.profile:
+        sampler = SamplingProfiler(1.0 / args.profile_rate)
+        sampler.start()
+    
+    try:
+        if args.stress:
+            run_stress(args, screen, clock, sprites, hud, renderer, overlay, events)
+        else:
+            run_game(args, screen, clock, sprites, hud, renderer, overlay, events)
+    finally:
+        close_events(events, event_log)
+        close_trace(tracer)
+        close_profile(sampler, args)
     
     pygame.quit()
     sys.exit()
@@ -348,8 +348,8 @@ class TankSnake:
         # Draw tank barrel (thicker and more detailed)
         barrel_length = self.segment_size * 1.8
         barrel_width = 4
-        end_x = x + math.cos(rad) * barrel_length
-        end_y = y + math.sin(rad) * barrel_length
+        end_x = x + cos_a * barrel_length
+        end_y = y + sin_a * barrel_length
         
         # Draw barrel shadow/outline
         pygame.draw.line(screen, BLACK, (int(x), int(y)), (int(end_x), int(end_y)), barrel_width + 2)
@@ -482,11 +482,14 @@ class Bullet:
         self.speed = 8
         self.color = RED
         self.size = 3
+        # Heading never changes, so work out the per-tick velocity once
+        rad = math.radians(direction)
+        self.velocity_x = math.cos(rad) * self.speed
+        self.velocity_y = math.sin(rad) * self.speed
     
     def update(self):
-        rad = math.radians(self.direction)
-        self.x += math.cos(rad) * self.speed
-        self.y += math.sin(rad) * self.speed
+        self.x += self.velocity_x
+        self.y += self.velocity_y
     
     def is_off_screen(self):
         return (self.x < 0 or self.x > SCREEN_WIDTH or 
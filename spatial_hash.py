@@ -0,0 +1,86 @@
+"""
+Uniform spatial hash over the wrapping play field
+"""
+
+import math
+import numpy as np
+
+class SpatialHash:
+    """Bucket points into square cells so proximity queries only touch nearby cells.
+
+    The grid wraps at the screen edges like the game world does, so a query near
+    the left edge also sees points near the right edge. Points are stored by
+    their index in the arrays passed to rebuild(); callers do their own exact
+    distance test on the candidates.
+    """
+    def __init__(self, width, height, cell_size):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.num_cells = self.cols * self.rows
+        self.order = np.zeros(0, dtype=np.intp)  # Point indices sorted by cell
+        self.cell_start = np.zeros(self.num_cells + 1, dtype=np.intp)
+        self.count = 0
+
+    def cell_coords(self, xs, ys):
+        """Wrapped (column, row) cell coordinates of each point"""
+        cx = np.floor_divide(xs, self.cell_size).astype(np.intp) % self.cols
+        cy = np.floor_divide(ys, self.cell_size).astype(np.intp) % self.rows
+        return cx, cy
+
+    def rebuild(self, xs, ys):
+        """Re-bucket all points (counting sort by cell id)"""
+        self.count = len(xs)
+        if self.count == 0:
+            self.cell_start[:] = 0
+            return
+        cx, cy = self.cell_coords(xs, ys)
+        cells = cy * self.cols + cx
+        self.order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=self.num_cells)
+        self.cell_start[0] = 0
+        np.cumsum(counts, out=self.cell_start[1:])
+
+    def _axis_offsets(self, reach, size):
+        """Cell offsets along one axis, never visiting a wrapped cell twice"""
+        if 2 * reach + 1 >= size:
+            return np.arange(size)
+        return np.arange(-reach, reach + 1)
+
+    def query_pairs(self, qx, qy, radius):
+        """Candidate (query index, point index) pairs for every query point.
+
+        Every point within `radius` of a query point is guaranteed to be in the
+        result; some further away ones are too.
+        """
+        if self.count == 0 or len(qx) == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        reach = max(0, math.ceil(radius / self.cell_size))
+        off_x = self._axis_offsets(reach, self.cols)
+        off_y = self._axis_offsets(reach, self.rows)
+
+        cx, cy = self.cell_coords(qx, qy)
+        nx = (cx[:, None] + off_x[None, :]) % self.cols
+        ny = (cy[:, None] + off_y[None, :]) % self.rows
+        cells = (ny[:, :, None] * self.cols + nx[:, None, :]).reshape(len(qx), -1)
+
+        starts = self.cell_start[cells].ravel()
+        counts = self.cell_start[cells + 1].ravel() - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        # Expand each (query, cell) block into its run of sorted point slots
+        query_idx = np.repeat(np.arange(len(qx)), cells.shape[1])
+        query_idx = np.repeat(query_idx, counts)
+        block_first = np.cumsum(counts) - counts
+        slots = np.repeat(starts - block_first, counts) + np.arange(total)
+        return query_idx, self.order[slots]
+
+    def query_point(self, x, y, radius):
+        """Candidate point indices near a single position, in ascending order"""
+        _, points = self.query_pairs(np.array([x], dtype=float), np.array([y], dtype=float), radius)
+        points.sort()
+        return points
@@ -0,0 +1,90 @@
+"""
+Pre-rendered sprite cache for the tank, trail segments, enemies and effects
+"""
+
+from collections import OrderedDict
+import pygame
+from headings import heading_vector
+
+# Tank sprites are square with the tank centre here (room for the 20px cannon)
+TANK_CENTER = 24
+
+def to_display_format(surface, alpha=False):
+    """Convert a surface to the display's pixel format (if a display is set) for fast blits"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+class SpriteCache:
+    """Builds each sprite once and hands back the same surface on every frame.
+
+    Trail segments are keyed by size, colour and alpha (quantized to
+    `alpha_step`), enemies by state and the tank by heading (quantized to
+    `heading_step` degrees) and damage level. Tank headings are the only key
+    space that can grow large, so those sprites are kept in an LRU of at most
+    `max_tank_sprites` entries.
+
+    The tank and enemy sprites are drawn by the routine the game draws them
+    live with, passed in as `draw`, so a cached sprite always looks like the
+    uncached drawing.
+    """
+    def __init__(self, alpha_step=4, heading_step=1, max_tank_sprites=128):
+        self.alpha_step = alpha_step
+        self.heading_step = heading_step
+        self.max_tank_sprites = max_tank_sprites
+        self.segments = {}
+        self.circles = {}
+        self.enemies = {}
+        self.tanks = OrderedDict()
+
+    def segment(self, size, color, alpha):
+        """Square trail segment of half-width `size` with per-surface alpha"""
+        alpha = min(255, round(alpha / self.alpha_step) * self.alpha_step)
+        key = (size, color, alpha)
+        sprite = self.segments.get(key)
+        if sprite is None:
+            sprite = to_display_format(pygame.Surface((size * 2, size * 2)))
+            sprite.set_alpha(alpha)
+            sprite.fill(color)
+            self.segments[key] = sprite
+        return sprite
+
+    def circle(self, radius, color):
+        """Filled circle (smoke, sparks, bullets), blitted centred on its position"""
+        key = (radius, color)
+        sprite = self.circles.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            sprite = to_display_format(sprite, alpha=True)
+            self.circles[key] = sprite
+        return sprite
+
+    def enemy(self, size, color, draw):
+        """Enemy body drawn by `draw(surface, x, y, size, color)`; colour encodes normal or trapped"""
+        key = (size, color)
+        sprite = self.enemies.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            draw(sprite, size, size, size, color)
+            sprite = to_display_format(sprite, alpha=True)
+            self.enemies[key] = sprite
+        return sprite
+
+    def tank(self, direction, damage_level, color, draw):
+        """Tank drawn by `draw(surface, x, y, cos_a, sin_a, color)` for a heading (centre at TANK_CENTER)"""
+        heading = round(direction / self.heading_step) * self.heading_step % 360
+        key = (heading, damage_level, color)
+        sprite = self.tanks.get(key)
+        if sprite is not None:
+            self.tanks.move_to_end(key)
+            return sprite
+
+        sprite = pygame.Surface((TANK_CENTER * 2, TANK_CENTER * 2), pygame.SRCALPHA)
+        draw(sprite, TANK_CENTER, TANK_CENTER, *heading_vector(heading), color)
+        sprite = to_display_format(sprite, alpha=True)
+
+        self.tanks[key] = sprite
+        if len(self.tanks) > self.max_tank_sprites:
+            self.tanks.popitem(last=False)
+        return sprite
@@ -0,0 +1,115 @@
+"""
+Stress/soak helpers: scripted circle driving and periodic frame, memory and entity logging
+"""
+
+import csv
+import os
+import sys
+import time
+
+def circle_driving(tick, loop_ticks=80, straight_ticks=30):
+    """Held keys for a tick of scripted driving - tight loops that drift across the screen.
+
+    The tank turns 4 degrees a tick, so `loop_ticks` of turning closes most of
+    a circle; the straight run between loops moves the next loop along, so the
+    trail keeps closing around fresh groups of enemies instead of one spot.
+    """
+    phase = tick % (loop_ticks + straight_ticks)
+    return {
+        "up": True,
+        "left": phase < loop_ticks,
+        "shoot": tick % 30 < 10,
+    }
+
+def rss_megabytes():
+    """Resident set size of this process in MB (peak RSS where current is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class SoakLog:
+    """Aggregates per-frame timings and writes one sample every `interval` frames.
+
+    Each sample holds mean/max tick and draw times, frame rate, RSS and the
+    entity counts at that moment, written as a CSV row (when a path is given)
+    and echoed to `stream` (the console by default).
+    """
+    FIELDS = ["tick", "elapsed_s", "fps", "tick_ms_mean", "tick_ms_max", "draw_ms_mean", "draw_ms_max",
+              "frame_ms_max", "rss_mb", "enemies", "trapped", "bullets", "segments"]
+
+    def __init__(self, path=None, interval=60, stream=None):
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stdout
+        self.file = open(path, "w", newline="") if path else None
+        self.writer = csv.writer(self.file) if self.file else None
+        if self.writer:
+            self.writer.writerow(self.FIELDS)
+        self.start_time = time.perf_counter()
+        self.samples = 0
+        self._reset()
+
+    def _reset(self):
+        self.frames = 0
+        self.window_start = time.perf_counter()
+        self.tick_total = self.tick_max = 0.0
+        self.draw_total = self.draw_max = 0.0
+        self.frame_max = 0.0
+
+    def record(self, state, tick_seconds, draw_seconds):
+        """Account for one frame; writes a sample every `interval` frames"""
+        self.frames += 1
+        self.tick_total += tick_seconds
+        self.draw_total += draw_seconds
+        self.tick_max = max(self.tick_max, tick_seconds)
+        self.draw_max = max(self.draw_max, draw_seconds)
+        self.frame_max = max(self.frame_max, tick_seconds + draw_seconds)
+        if self.frames >= self.interval:
+            self.sample(state)
+
+    def sample(self, state):
+        """Write one row for the frames recorded since the last sample"""
+        if self.frames == 0:
+            return
+        now = time.perf_counter()
+        enemies = state.enemies
+        rss = rss_megabytes()
+        row = [
+            state.frame_count,
+            round(now - self.start_time, 3),
+            round(self.frames / max(now - self.window_start, 1e-9), 1),
+            round(self.tick_total / self.frames * 1000, 3),
+            round(self.tick_max * 1000, 3),
+            round(self.draw_total / self.frames * 1000, 3),
+            round(self.draw_max * 1000, 3),
+            round(self.frame_max * 1000, 3),
+            round(rss, 1) if rss is not None else "",
+            len(enemies),
+            int(enemies.trapped[:len(enemies)].sum()),
+            len(state.bullets),
+            len(state.tank_snake.segments),
+        ]
+        if self.writer:
+            self.writer.writerow(row)
+            self.file.flush()
+        if self.stream:
+            print(f"🔥 tick {row[0]:>7} | {row[2]:>6} fps | tick {row[3]:>8} ms (max {row[4]}) | "
+                  f"draw {row[5]:>8} ms (max {row[6]}) | {row[8]} MB | "
+                  f"{row[9]} enemies ({row[10]} trapped), {row[11]} bullets, {row[12]} segments",
+                  file=self.stream, flush=True)
+        self.samples += 1
+        self._reset()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Parameter sweeps and bot tournaments: seeded headless games fanned out over a process pool
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import collections
+import importlib
+import itertools
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from sherman_tank_snake import GameState, InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT
+from stress import circle_driving
+from rl_env import ACTION_FRAMES, ACTION_COUNT, TRAP_BIT
+from autopilot import Autopilot
+from event_log import EventBus
+
+# Sweepable parameters, by where they live: GameState arguments, TankSnake attributes, per-enemy swarm columns
+GAME_PARAMETERS = ("max_enemies", "spawn_interval", "wave_size", "initial_enemies", "max_length")
+TANK_PARAMETERS = ("trap_duration", "move_threshold", "base_speed", "base_rotation_speed", "max_damage")
+ENEMY_PARAMETERS = {"enemy_speed": "speed", "avoidance_radius": "avoidance_radius", "enemy_size": "size"}
+PARAMETERS = GAME_PARAMETERS + TANK_PARAMETERS + tuple(ENEMY_PARAMETERS)
+
+# Per-game result fields, in results-file order after the parameters
+RESULT_FIELDS = ("seed", "ticks", "survived", "shot_kills", "trap_kills", "damage_events", "tank_hits", "traps_armed")
+SUMMARY_FIELDS = ("ticks", "shot_kills", "trap_kills", "damage_events", "tank_hits", "traps_armed")
+
+class TunedGameState(GameState):
+    """A GameState with sweep parameters applied: tank attributes set, enemy columns given to every spawn"""
+    def __init__(self, seed=None, parameters=None, **options):
+        parameters = dict(parameters or {})
+        self.enemy_options = {ENEMY_PARAMETERS[name]: parameters.pop(name)
+                              for name in ENEMY_PARAMETERS if name in parameters}
+        tank_options = {name: parameters.pop(name) for name in TANK_PARAMETERS if name in parameters}
+        unknown = set(parameters) - set(GAME_PARAMETERS)
+        if unknown:
+            raise ValueError(f"unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+        super().__init__(seed, **parameters, **options)
+        tank_snake = self.tank_snake
+        for name, value in tank_options.items():
+            setattr(tank_snake, name, value)
+        if "base_speed" in tank_options:
+            tank_snake.speed = tank_snake.base_speed
+        if "base_rotation_speed" in tank_options:
+            tank_snake.rotation_speed = tank_snake.base_rotation_speed
+
+    def clone(self, snapshot):
+        clone = super().clone(snapshot)
+        clone.enemy_options = dict(self.enemy_options)
+        return clone
+
+    def spawn_enemy(self):
+        enemy = super().spawn_enemy()
+        for name, value in self.enemy_options.items():
+            setattr(enemy, name, value)
+        return enemy
+
+def circle_policy(seed):
+    """stress.circle_driving: tight loops drifting across the screen, shooting in bursts"""
+    def policy(state):
+        return InputFrame(**circle_driving(state.frame_count))
+    return policy
+
+def random_policy(seed, hold_ticks=15):
+    """A random action bitfield held for `hold_ticks` ticks at a time (trap pressed on the first only)"""
+    rng = random.Random(seed)
+    action = 0
+    def policy(state):
+        nonlocal action
+        if state.frame_count % hold_ticks == 0:
+            action = rng.randrange(ACTION_COUNT)
+            return ACTION_FRAMES[action]
+        return ACTION_FRAMES[action & ~TRAP_BIT]
+    return policy
+
+def idle_policy(seed):
+    """No input at all - a baseline for how long enemies take to find a parked tank"""
+    frame = InputFrame()
+    return lambda state: frame
+
+def autopilot_policy(seed, rollouts=12):
+    """The lookahead autopilot with a fixed rollout count per decision, so results don't depend on machine speed"""
+    pilot = Autopilot(InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT, budget=None, rollouts=rollouts, seed=seed)
+    return lambda state: InputFrame(**pilot.drive(state))
+
+# Built-in policies by name; each is a factory policy(seed) -> callable(state) -> InputFrame
+POLICIES = {
+    "circle": circle_policy,
+    "random": random_policy,
+    "idle": idle_policy,
+    "autopilot": autopilot_policy,
+}
+
+def load_policy(name):
+    """A policy factory by built-in name or as 'module:function'"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"unknown policy {name!r} (built in: {', '.join(POLICIES)}, or module:function)")
+    return getattr(importlib.import_module(module), function)
+
+def play_game(parameters, seed, policy, max_ticks, game_options=None):
+    """Play one seeded game to the end (or max_ticks) and return its result dict"""
+    event_counts = collections.Counter()
+    state = TunedGameState(seed, parameters, events=EventBus(), **(game_options or {}))
+    state.events.subscribe(lambda event: event_counts.update((event.kind,)))
+    drive = load_policy(policy)(seed)
+    while state.frame_count < max_ticks and state.step(drive(state)):
+        pass
+    return {
+        "seed": seed,
+        "ticks": state.frame_count,
+        "survived": state.running,
+        "shot_kills": state.shot_kills,
+        "trap_kills": state.trap_kills,
+        "damage_events": event_counts["damage"],
+        "tank_hits": event_counts["tank_hit"],
+        "traps_armed": event_counts["trap_armed"],
+    }
+
+def run_chunk(point, parameters, seeds, policy, max_ticks, game_options):
+    """Work unit for a pool process: several games of one grid point"""
+    return point, [play_game(parameters, seed, policy, max_ticks, game_options) for seed in seeds]
+
+def grid_points(grid):
+    """Every combination of a {parameter: [values]} grid, as parameter dicts in grid order"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def work_units(points, games, seed, chunk_size):
+    """(point index, seeds) chunks; every grid point plays the same seeds, so points differ only by parameters"""
+    seeds = list(range(seed, seed + games))
+    return [(point, seeds[start:start + chunk_size])
+            for point in range(len(points)) for start in range(0, games, chunk_size)]
+
+def summarize(parameters, results):
+    """Summary statistics for one grid point's games"""
+    summary = {"parameters": parameters, "games": len(results),
+               "survival_rate": float(np.mean([result["survived"] for result in results])) if results else 0.0}
+    for field in SUMMARY_FIELDS:
+        values = np.array([result[field] for result in results], dtype=float)
+        summary[field] = {"mean": float(values.mean()), "std": float(values.std()), "min": float(values.min()),
+                          "median": float(np.median(values)), "max": float(values.max())} if len(values) else None
+    return summary
+
+def run_sweep(grid, games=100, policy="circle", max_ticks=3600, seed=0, workers=None, chunk_size=None,
+              results_path=None, game_options=None, progress=None):
+    """Play `games` seeded games at every point of `grid`, returning one summary per point.
+
+    Chunks of `chunk_size` games go to a ProcessPoolExecutor of `workers`
+    processes (every core by default; 0 plays in this process). Each game's
+    result is appended to `results_path` as a JSON line - its parameters and
+    RESULT_FIELDS - as soon as its chunk finishes, so a long sweep can be
+    watched or cut short without losing what is done. `progress(done, total)`
+    is called after each chunk.
+    """
+    points = grid_points(grid)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if chunk_size is None:
+        # A few chunks per worker keeps every core busy to the end without drowning in tiny tasks
+        chunk_size = max(1, min(64, -(-len(points) * games // (max(workers, 1) * 8))))
+    units = work_units(points, games, seed, chunk_size)
+    results = [[] for _ in points]
+    total = len(points) * games
+    done = 0
+    output = open(results_path, "w") if results_path else None
+    try:
+        if workers:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = [pool.submit(run_chunk, point, points[point], seeds, policy, max_ticks, game_options)
+                       for point, seeds in units]
+            finished = (future.result() for future in as_completed(futures))
+        else:
+            pool = None
+            finished = (run_chunk(point, points[point], seeds, policy, max_ticks, game_options)
+                        for point, seeds in units)
+        try:
+            for point, chunk in finished:
+                results[point].extend(chunk)
+                if output:
+                    for result in chunk:
+                        output.write(json.dumps({**points[point], **result}) + "\n")
+                    output.flush()
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        if output:
+            output.close()
+    return [summarize(parameters, point_results) for parameters, point_results in zip(points, results)]
+
+def parse_value(text):
+    """A grid value from the command line: int, then float, else the string itself"""
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_grid(specs):
+    """{parameter: [values]} from 'name=v1,v2,...' specs"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in PARAMETERS or not values:
+            raise ValueError(f"bad --param {spec!r}: expected NAME=V1,V2,... with NAME one of {', '.join(PARAMETERS)}")
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+def format_summary(summary):
+    parameters = " ".join(f"{name}={value}" for name, value in summary["parameters"].items()) or "(defaults)"
+    ticks = summary["ticks"]
+    return (f"{parameters}: {summary['games']} games, survived {summary['survival_rate']:.0%}, "
+            f"ticks {ticks['mean']:.0f}±{ticks['std']:.0f}, shot kills {summary['shot_kills']['mean']:.2f}, "
+            f"trap kills {summary['trap_kills']['mean']:.2f}, damage {summary['damage_events']['mean']:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep game parameters over many seeded headless games")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"a grid axis (repeatable); NAME is one of {', '.join(PARAMETERS)}")
+    parser.add_argument("--games", type=int, default=100, help="games per grid point (default: %(default)s)")
+    parser.add_argument("--policy", default="circle",
+                        help=f"bot driving every game: {', '.join(POLICIES)} or module:function (default: %(default)s)")
+    parser.add_argument("--ticks", type=int, default=3600, help="tick limit per game (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, 0 to play in this process (default: every core)")
+    parser.add_argument("--chunk", type=int, default=None, help="games per work unit (default: automatic)")
+    parser.add_argument("--results", default="sweep_results.jsonl",
+                        help="per-game results, one JSON line each (default: %(default)s)")
+    parser.add_argument("--summary", default=None, help="also write the summaries to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.param)
+        load_policy(args.policy)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    def progress(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"\r⏳ {done}/{total} games ({done / elapsed:,.0f}/s)", end="", flush=True)
+
+    summaries = run_sweep(grid, args.games, args.policy, args.ticks, args.seed, args.workers, args.chunk,
+                          args.results, progress=progress)
+    elapsed = time.perf_counter() - start
+    print()
+    for summary in summaries:
+        print(format_summary(summary))
+    total = len(summaries) * args.games
+    print(f"🏁 {total} games in {elapsed:.1f}s ({total / elapsed:,.0f} games/s); results in {args.results}")
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summaries, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
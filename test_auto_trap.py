@@ -0,0 +1,46 @@
+"""
+Tests for the batched auto-trap point-in-polygon test against the per-enemy ray casting it replaced
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from sherman_tank_snake import TankSnake
+
+def scalar_inside(xs, ys, poly_x, poly_y):
+    tank_snake = TankSnake(400, 300)
+    polygon = list(zip(poly_x.tolist(), poly_y.tolist()))
+    return np.array([tank_snake.point_in_polygon((x, y), polygon) for x, y in zip(xs.tolist(), ys.tolist())])
+
+def trail_polygon(seed, points):
+    """A closed-ish loop with jitter, snapped to a coarse grid so it has vertical and horizontal edges"""
+    rng = np.random.default_rng(seed)
+    angle = np.linspace(0, 2 * np.pi, points, endpoint=False)
+    radius = 150 + rng.normal(0, 30, points)
+    return np.round(400 + radius * np.cos(angle), -1), np.round(300 + radius * np.sin(angle), -1)
+
+@pytest.mark.parametrize("seed, points", [(0, 3), (1, 8), (2, 40), (3, 200)])
+def test_batched_matches_scalar(seed, points):
+    poly_x, poly_y = trail_polygon(seed, points)
+    rng = np.random.default_rng(seed + 100)
+    xs = rng.uniform(150, 650, 500)
+    ys = rng.uniform(50, 550, 500)
+    # Points exactly on vertices and on the grid lines the edges run along
+    xs[:points] = poly_x
+    ys[:points] = poly_y
+    xs[points:points + 50] = np.round(xs[points:points + 50], -1)
+    expected = scalar_inside(xs, ys, poly_x, poly_y)
+    assert np.array_equal(TankSnake.points_in_polygon(xs, ys, poly_x, poly_y), expected)
+    # Blocks of a few points at a time give the same answer
+    assert np.array_equal(TankSnake.points_in_polygon(xs, ys, poly_x, poly_y, block_size=points * 7), expected)
+
+def test_degenerate_inputs():
+    assert TankSnake.points_in_polygon([1.0], [1.0], [0.0, 5.0], [0.0, 5.0]).tolist() == [False]
+    assert len(TankSnake.points_in_polygon([], [], [0.0, 5.0, 5.0], [0.0, 0.0, 5.0])) == 0
+
+def test_trapped_mask_needs_a_long_enough_trail():
+    tank_snake = TankSnake(400, 300)
+    assert not tank_snake.trapped_mask(np.array([400.0]), np.array([300.0])).any()
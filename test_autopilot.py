@@ -0,0 +1,54 @@
+"""
+Tests for the lookahead autopilot: it drives a real game, reproducibly with a fixed rollout count
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+
+from autopilot import DRIVE_FIELDS, Autopilot
+from sherman_tank_snake import SCREEN_HEIGHT, SCREEN_WIDTH, GameState, InputFrame
+
+def drive(ticks, seed=0, **options):
+    """Let an autopilot play `ticks` ticks; returns its decisions, the autopilot and the game"""
+    pilot = Autopilot(InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT, seed=seed, **options)
+    state = GameState(seed=seed)
+    decisions = []
+    for _ in range(ticks):
+        keys = pilot.drive(state)
+        decisions.append(keys)
+        if not state.step(InputFrame(**keys)):
+            break
+    return decisions, pilot, state
+
+def test_drives_a_game_with_held_keys():
+    decisions, pilot, state = drive(60, budget=None, rollouts=4)
+    assert all(set(keys) == set(DRIVE_FIELDS) for keys in decisions)
+    assert pilot.decisions == 6  # One every `interval` ticks
+    assert pilot.rollout_ticks > 0 and state.frame_count == 60
+    # Rollouts run in a private clone, never in the real game
+    assert pilot.clone is not state
+
+def test_fixed_rollout_count_is_reproducible():
+    first, _, first_state = drive(80, seed=3, budget=None, rollouts=6)
+    second, _, second_state = drive(80, seed=3, budget=None, rollouts=6)
+    assert first == second
+    assert first_state.tank_snake.segments.head() == second_state.tank_snake.segments.head()
+
+def test_time_budget_bounds_the_search():
+    reads = []
+    def clock():
+        reads.append(None)
+        return len(reads) * 0.0001  # Every read of the clock takes a tenth of a millisecond
+    pilot = Autopilot(InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT, budget=0.005, seed=0, clock=clock)
+    state = GameState(seed=0)
+    for _ in range(20):
+        state.step(InputFrame(**pilot.drive(state)))
+    # The search reads the clock about once per rollout tick, so each 5 ms budget buys about 50 ticks
+    assert pilot.decisions == 2
+    assert 20 * 40 < pilot.rollout_ticks < 20 * 60 + 2 * pilot.interval
+
+def test_needs_a_budget_or_a_rollout_count():
+    with pytest.raises(ValueError):
+        Autopilot(InputFrame, SCREEN_WIDTH, SCREEN_HEIGHT, budget=None)
@@ -0,0 +1,15 @@
+"""
+Tests for GameBatch: many games stepped as arrays stay bit-identical to GameState, tick for tick
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import batched_sim
+
+def test_game_batch_matches_game_state():
+    assert batched_sim.verify(num_games=6, ticks=600, seed=0) is None
+
+def test_game_batch_matches_game_state_with_many_enemies():
+    assert batched_sim.verify(num_games=3, ticks=300, seed=7, max_enemies=300, spawn_interval=10,
+                              wave_size=60, max_length=80, invulnerable=True) is None
@@ -0,0 +1,58 @@
+"""
+Tests for EnemySwarm.update: the per-enemy scalar pass, the dense batched pass and the hashed batched pass agree
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+import sherman_tank_snake as game
+
+def make_swarm(seed, enemies, trapped=0):
+    """A swarm of enemies scattered over (and just past) the screen, some trapped"""
+    rng = np.random.default_rng(seed)
+    swarm = game.EnemySwarm()
+    for i in range(enemies):
+        enemy = swarm.add(rng.uniform(-5, game.SCREEN_WIDTH + 5), rng.uniform(-5, game.SCREEN_HEIGHT + 5),
+                          speed=rng.uniform(1, 3), avoidance_radius=rng.uniform(30, 60))
+        enemy.trapped = i < trapped
+    return swarm
+
+def make_trail(seed, points):
+    """A wandering trail, head first, the way TrailBuffer.views() hands it over"""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(0, 8, points)) % game.SCREEN_WIDTH + 0.0
+    y = np.cumsum(rng.normal(0, 8, points)) % game.SCREEN_HEIGHT + 0.0
+    return x, y
+
+def run(monkeypatch, scalar_pairs, hash_min_pairs, enemies, points, ticks=20):
+    """Swarm columns after `ticks` updates with the given path thresholds"""
+    monkeypatch.setattr(game, "SCALAR_PAIRS", scalar_pairs)
+    monkeypatch.setattr(game, "HASH_MIN_PAIRS", hash_min_pairs)
+    swarm = make_swarm(enemies, enemies, trapped=enemies // 5)
+    trail_x, trail_y = make_trail(points, points)
+    for tick in range(ticks):
+        swarm.update((400.0 + tick, 300.0 - tick), trail_x, trail_y)
+    n = swarm.count
+    return swarm.x[:n].copy(), swarm.y[:n].copy()
+
+@pytest.mark.parametrize("enemies, points", [(1, 1), (6, 13), (20, 40), (60, 0)])
+def test_scalar_pass_matches_batched_pass(monkeypatch, enemies, points):
+    scalar = run(monkeypatch, 10 ** 9, 10 ** 9, enemies, points)
+    batched = run(monkeypatch, -1, 10 ** 9, enemies, points)
+    assert np.array_equal(scalar[0], batched[0]) and np.array_equal(scalar[1], batched[1])
+
+@pytest.mark.parametrize("enemies, points", [(6, 13), (80, 200), (300, 60)])
+def test_dense_avoidance_matches_hashed_avoidance(monkeypatch, enemies, points):
+    dense = run(monkeypatch, -1, 10 ** 9, enemies, points)
+    hashed = run(monkeypatch, -1, -1, enemies, points)
+    assert np.array_equal(dense[0], hashed[0]) and np.array_equal(dense[1], hashed[1])
+
+def test_trapped_enemies_hold_still_without_a_trail(monkeypatch):
+    monkeypatch.setattr(game, "SCALAR_PAIRS", 10 ** 9)
+    swarm = make_swarm(0, 5, trapped=5)
+    before = swarm.x[:5].copy()
+    swarm.update((0.0, 0.0), np.zeros(0), np.zeros(0))
+    assert np.array_equal(swarm.x[:5], before)
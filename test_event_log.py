@@ -0,0 +1,80 @@
+"""
+Tests for the game event bus: draining to sinks, dropping on overflow and the JSON Lines sink
+"""
+
+import json
+
+import pytest
+
+from event_log import EventBus, JsonlSink, NullEventBus
+
+class ListSink:
+    """Keeps every event it is handed"""
+    def __init__(self):
+        self.events = []
+        self.closed = False
+
+    def write(self, event):
+        self.events.append(event)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def test_drain_hands_events_to_sinks_in_order():
+    events = EventBus(capacity=16)
+    sink = ListSink()
+    events.sinks.append(sink)  # Without the writer thread, so the test decides when to drain
+    for tick in range(5):
+        events.tick = tick
+        events.emit("enemy_shot", 10 - tick)
+    events.drain()
+    assert [(event.kind, event.tick, event.fields) for event in sink.events] == \
+        [("enemy_shot", tick, {"remaining": 10 - tick}) for tick in range(5)]
+    events.emit("trap_detonated", "manual", 3)
+    events.drain()
+    assert sink.events[-1].fields == {"trigger": "manual", "enemies": 3}
+    assert len(sink.events) == 6 and events.dropped == 0
+
+def test_events_overwritten_before_a_drain_are_dropped_and_counted():
+    events = EventBus(capacity=8)
+    sink = ListSink()
+    events.sinks.append(sink)
+    for i in range(30):
+        events.emit("enemy_shot", i)
+    events.drain()
+    assert events.dropped > 0
+    assert len(sink.events) + events.dropped == 30
+    # What got through is the newest events, still in order
+    assert [event.fields["remaining"] for event in sink.events] == list(range(30 - len(sink.events), 30))
+
+def test_close_drains_through_the_writer_thread_and_closes_sinks():
+    events = EventBus(flush_interval=60)
+    sink = ListSink()
+    events.add_sink(sink)
+    events.emit("tank_destroyed")
+    events.close()
+    assert [event.kind for event in sink.events] == ["tank_destroyed"] and sink.closed
+
+def test_jsonl_sink_counts_the_lines_it_writes(tmp_path):
+    path = tmp_path / "events.jsonl"
+    events = EventBus()
+    sink = JsonlSink(path)
+    events.add_sink(sink)
+    events.emit("damage", 1, 2)
+    events.emit("tank_hit", 12.5)
+    events.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sink.written == len(lines) == 2
+    assert lines[1]["kind"] == "tank_hit" and lines[1]["distance"] == 12.5
+
+def test_null_bus_refuses_listeners():
+    events = NullEventBus()
+    events.emit("tank_destroyed")
+    assert events.recent() == []
+    with pytest.raises(ValueError):
+        events.subscribe(print)
+    with pytest.raises(ValueError):
+        events.add_sink(ListSink())
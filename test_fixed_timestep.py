@@ -0,0 +1,54 @@
+"""
+Tests for FixedTimestep: ticks paid out per frame, the catch-up limit and the interpolation fraction
+"""
+
+import pytest
+
+from fixed_timestep import FixedTimestep
+
+class FakeClock:
+    """A clock the test moves by hand"""
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def make(tick_rate=60, max_steps=5):
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate, max_steps, clock=clock)
+    assert timestep.advance() == 1  # The first call runs one tick straight away
+    return timestep, clock
+
+def test_pays_out_whole_ticks_and_keeps_the_remainder():
+    timestep, clock = make(tick_rate=100)
+    clock.now += 0.035
+    assert timestep.advance() == 3
+    assert timestep.alpha == pytest.approx(0.5)
+    clock.now += 0.006
+    assert timestep.advance() == 1
+    assert timestep.alpha == pytest.approx(0.1)
+
+def test_alpha_stays_below_one_between_ticks():
+    timestep, clock = make(tick_rate=50)
+    clock.now += 0.019
+    assert timestep.advance() == 0
+    assert 0.0 < timestep.alpha < 1.0
+    assert timestep.alpha == pytest.approx(0.95)
+
+def test_a_stall_is_capped_at_max_steps_and_the_backlog_dropped():
+    timestep, clock = make(tick_rate=100, max_steps=4)
+    clock.now += 1.0025  # 100 ticks late, plus a quarter tick
+    assert timestep.advance() == 4
+    assert timestep.dropped_ticks == 96
+    assert timestep.alpha == pytest.approx(0.25)
+    # Afterwards the game carries on in real time rather than chasing the backlog
+    clock.now += 0.02
+    assert timestep.advance() == 2
+    assert timestep.dropped_ticks == 96
+
+def test_exactly_max_steps_behind_drops_nothing():
+    timestep, clock = make(tick_rate=10, max_steps=3)
+    clock.now += 0.35
+    assert timestep.advance() == 3
+    assert timestep.dropped_ticks == 0
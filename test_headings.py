@@ -0,0 +1,30 @@
+"""
+Tests for the heading lookup table and the tank's cached heading vector
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import math
+
+import numpy as np
+
+import headings
+from sherman_tank_snake import TankSnake
+
+def test_table_self_check():
+    assert headings.verify() == 0
+    assert headings.verify(headings.HeadingTable(resolution=0.5)) == 0
+
+def test_vectors_match_the_math_on_and_off_the_grid():
+    angles = np.array([0.0, 4.0, -4.0, 180.0 + 356.0, 3.2, 2.56, 719.0, -360.0])
+    cos, sin = headings.HEADINGS.vectors(angles)
+    assert cos.tolist() == [math.cos(math.radians(angle)) for angle in angles.tolist()]
+    assert sin.tolist() == [math.sin(math.radians(angle)) for angle in angles.tolist()]
+
+def test_tank_heading_follows_every_turn():
+    tank_snake = TankSnake(400, 300)
+    for direction in (0, 4, 4, 359.2, 3.2 * 7 % 360):
+        tank_snake.direction = direction
+        rad = math.radians(direction)
+        assert tank_snake.heading() == (math.cos(rad), math.sin(rad))
@@ -0,0 +1,66 @@
+"""
+Tests for GridEncoder: the raster's shape and dtype, and each channel against the game state it encodes
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from obs_encoder import CHANNELS, GridEncoder
+from sherman_tank_snake import GameState, InputFrame, TankSnake
+from stress import circle_driving
+
+def play(state, ticks):
+    for _ in range(ticks):
+        if not state.step(InputFrame(**circle_driving(state.frame_count))):
+            break
+    return state
+
+def channel(grid, name):
+    return grid[CHANNELS.index(name)]
+
+def test_shape_dtype_and_reused_buffer():
+    encoder = GridEncoder()
+    assert encoder.shape == (len(CHANNELS), 30, 40)
+    state = play(GameState(seed=2), 200)
+    grid = encoder.encode(state)
+    assert grid.shape == encoder.shape and grid.dtype == np.float32
+    out = encoder.new_buffer()
+    out[...] = 7  # Stale values from a previous step must not survive
+    assert encoder.encode(state, out) is out
+    assert np.array_equal(out, grid)
+
+@pytest.mark.parametrize("cell_size", [20, 37])
+def test_channels_count_what_is_in_the_game(cell_size):
+    encoder = GridEncoder(cell_size)
+    state = play(GameState(seed=5, max_enemies=60, spawn_interval=20, wave_size=10), 600)
+    grid = encoder.encode(state)
+    enemies = state.enemies
+    n = enemies.count
+    assert channel(grid, "tank").sum() == 1
+    assert channel(grid, "enemies").sum() == n
+    assert channel(grid, "trapped").sum() == enemies.trapped[:n].sum()
+    assert channel(grid, "bullets").sum() == len(state.bullets)
+    trail = channel(grid, "trail")
+    assert 0 < trail.max() <= 1 and trail.min() >= 0
+    head_x, head_y = state.tank_snake.segments.head()
+    row = min(int(head_y // cell_size), encoder.rows - 1)
+    col = min(int(head_x // cell_size), encoder.cols - 1)
+    assert channel(grid, "tank")[row, col] == 1
+
+def test_trap_channel_matches_the_drawn_polygon():
+    encoder = GridEncoder()
+    state = GameState(seed=1, initial_enemies=6)
+    for _ in range(2000):
+        play(state, 1)
+        if state.tank_snake.trap_active:
+            break
+    else:
+        pytest.skip("the trap never armed on this seed")
+    poly_x, poly_y, _ = state.tank_snake.segments.views(min_lifetime=180)
+    expected = TankSnake.points_in_polygon(encoder.centre_x.ravel(), encoder.centre_y.ravel(), poly_x, poly_y)
+    trap = channel(encoder.encode(state), "trap")
+    assert np.array_equal(trap.ravel() == 1, expected)
+    assert expected.any()
@@ -0,0 +1,89 @@
+"""
+Tests for binary input replays: playing a recording back, or seeking into it, reproduces the session
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from replay import Replay, ReplayRecorder, pack_input, unpack_input, INPUT_BITS, TRAILER
+from sherman_tank_snake import GAME_VERSION, GameState, InputFrame, play_replay, seek_replay
+from stress import circle_driving
+
+def same_snapshot(a, b):
+    """Whether two snapshots hold the same game (arrays may carry unused room past the size in slot 1)"""
+    return int(a[1]) == int(b[1]) and np.array_equal(a[:int(a[1])], b[:int(b[1])])
+
+def record(path, ticks, seed=4, keyframe_interval=600, chunk_ticks=600, checkpoints=()):
+    """Play `ticks` ticks of circle driving into a replay; returns the live state and snapshots at `checkpoints`"""
+    recorder = ReplayRecorder(path, seed, GAME_VERSION, 60.0, chunk_ticks=chunk_ticks,
+                              keyframe_interval=keyframe_interval)
+    state = GameState(seed=seed)
+    snapshots = {}
+    for _ in range(ticks):
+        if state.frame_count in checkpoints:
+            snapshots[state.frame_count] = state.snapshot()
+        frame = InputFrame(**circle_driving(state.frame_count))
+        recorder.record(state, frame)
+        if not state.step(frame):
+            break
+    recorder.close()
+    return state, snapshots
+
+def test_input_bits_round_trip():
+    for bits in range(1 << len(INPUT_BITS)):
+        assert pack_input(InputFrame(**unpack_input(bits))) == bits
+
+def test_playback_reproduces_the_recorded_game(tmp_path):
+    path = tmp_path / "session.rpl"
+    live, _ = record(path, 2000)
+    replay = Replay.load(path)
+    assert (replay.seed, replay.game_version, replay.tick_rate) == (4, GAME_VERSION, 60.0)
+    assert replay.end_tick == live.frame_count
+    assert same_snapshot(play_replay(replay).snapshot(), live.snapshot())
+    replay.close()
+
+def test_a_recording_without_its_index_still_plays(tmp_path):
+    path = tmp_path / "crashed.rpl"
+    live, _ = record(path, 700, chunk_ticks=100)
+    data = path.read_bytes()
+    index_offset = TRAILER.unpack_from(data, len(data) - TRAILER.size)[0]
+    # Cut the footer and half of the last input record, as a crash mid-write would
+    path.write_bytes(data[:index_offset - 100])
+    replay = Replay.load(path)
+    assert 0 < replay.end_tick < live.frame_count
+    _, expected = record(tmp_path / "again.rpl", replay.end_tick + 1, checkpoints=(replay.end_tick,))
+    assert same_snapshot(play_replay(replay).snapshot(), expected[replay.end_tick])
+    replay.close()
+
+def test_rejects_files_that_are_not_replays(tmp_path):
+    path = tmp_path / "junk.rpl"
+    path.write_bytes(b"not a replay at all, just some bytes")
+    with pytest.raises(ValueError):
+        Replay.load(path)
+
+# Seeking
+
+@pytest.mark.parametrize("keyframe_interval", [100, 600])
+def test_seek_matches_simulating_from_the_start(tmp_path, keyframe_interval):
+    path = tmp_path / "session.rpl"
+    checkpoints = (0, 1, 99, 100, 101, 250, 599, 600, 1234)
+    live, snapshots = record(path, 1500, keyframe_interval=keyframe_interval, checkpoints=checkpoints)
+    replay = Replay.load(path)
+    # Jump around out of order, so no seek can lean on the one before it
+    for tick in sorted(snapshots, key=lambda tick: (tick * 7919) % 13):
+        state = seek_replay(replay, tick)
+        assert state.frame_count == tick
+        assert same_snapshot(state.snapshot(), snapshots[tick])
+    assert same_snapshot(seek_replay(replay, replay.end_tick).snapshot(), live.snapshot())
+    replay.close()
+
+def test_seek_clamps_to_the_recorded_ticks(tmp_path):
+    path = tmp_path / "session.rpl"
+    live, snapshots = record(path, 300, checkpoints=(0,))
+    replay = Replay.load(path)
+    assert same_snapshot(seek_replay(replay, -50).snapshot(), snapshots[0])
+    assert same_snapshot(seek_replay(replay, 10 ** 6).snapshot(), live.snapshot())
+    replay.close()
@@ -0,0 +1,75 @@
+"""
+Tests for the RL environments: observation shapes and dtypes, step results and vectorized stepping
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from obs_encoder import CHANNELS
+from rl_env import ACTION_COUNT, OBSERVATION_SIZE, TankSnakeEnv, VectorEnv
+
+def random_actions(seed, steps, num_envs=None):
+    return np.random.default_rng(seed).integers(0, ACTION_COUNT, steps if num_envs is None else (steps, num_envs))
+
+@pytest.mark.parametrize("observation, shape", [("vector", (OBSERVATION_SIZE,)), ("grid", (len(CHANNELS), 30, 40))])
+def test_observations_have_the_advertised_shape_and_dtype(observation, shape):
+    env = TankSnakeEnv(observation=observation)
+    assert env.observation_shape == shape
+    observation = env.reset(seed=0)
+    assert observation.shape == shape and observation.dtype == np.float32
+    out = np.zeros(shape, dtype=np.float32)
+    for action in random_actions(1, 50):
+        observation, reward, done, info = env.step(int(action), out)
+        assert observation is out
+        assert isinstance(reward, float) and isinstance(done, bool)
+        assert set(info) == {"tick", "kills", "damage", "truncated"}
+        if done:
+            break
+    assert np.isfinite(out).all()
+
+def test_unknown_observation_type_is_rejected():
+    with pytest.raises(ValueError):
+        TankSnakeEnv(observation="pixels")
+
+def test_seeded_episodes_repeat():
+    def episode():
+        env = TankSnakeEnv(max_steps=200)
+        observations = [env.reset(seed=7).copy()]
+        for action in random_actions(2, 200):
+            observation, _, done, _ = env.step(int(action))
+            observations.append(observation.copy())
+            if done:
+                break
+        return np.array(observations)
+    assert np.array_equal(episode(), episode())
+
+def test_episodes_truncate_at_max_steps():
+    env = TankSnakeEnv(max_steps=5, invulnerable=True)
+    env.reset(seed=0)
+    results = [env.step(0) for _ in range(5)]
+    assert [done for _, _, done, _ in results] == [False] * 4 + [True]
+    assert results[-1][3]["truncated"]
+
+def test_vector_env_arrays():
+    envs = VectorEnv(3, max_steps=20)
+    observations = envs.reset(seed=0)
+    assert observations.shape == (3, OBSERVATION_SIZE) and observations.dtype == np.float32
+    for actions in random_actions(3, 30, num_envs=3):
+        observations, rewards, dones, infos = envs.step(actions)
+        assert rewards.shape == dones.shape == (3,)
+        assert rewards.dtype == np.float32 and dones.dtype == np.bool_
+        assert all(infos[name].shape == (3,) for name in ("ticks", "kills", "damage", "truncated"))
+    envs.close()
+
+def test_vector_env_workers_match_in_process_stepping():
+    def run(workers):
+        envs = VectorEnv(4, workers=workers, max_steps=40, observation="grid", cell_size=40)
+        observations = [envs.reset(seed=3).copy()]
+        for actions in random_actions(4, 60, num_envs=4):
+            observations.append(envs.step(actions)[0].copy())
+        envs.close()
+        return np.array(observations)
+    assert np.array_equal(run(0), run(2))
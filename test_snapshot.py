@@ -0,0 +1,59 @@
+"""
+Tests for GameState snapshots: round-trips, in-place restores and layout checks
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from sherman_tank_snake import GameState, InputFrame
+from stress import circle_driving
+
+def play(state, ticks):
+    """Step a game `ticks` ticks with the stress-mode circle driving"""
+    for _ in range(ticks):
+        if not state.step(InputFrame(**circle_driving(state.frame_count))):
+            break
+    return state
+
+def same_snapshot(a, b):
+    """Whether two snapshots hold the same game (arrays may carry unused room past the size in slot 1)"""
+    return int(a[1]) == int(b[1]) and np.array_equal(a[:int(a[1])], b[:int(b[1])])
+
+def test_snapshot_round_trip_continues_identically():
+    state = play(GameState(seed=3), 400)
+    clone = GameState.from_snapshot(state.snapshot())
+    assert same_snapshot(clone.snapshot(), state.snapshot())
+    play(state, 300)
+    play(clone, 300)
+    assert same_snapshot(clone.snapshot(), state.snapshot())
+
+def test_restore_rewinds_in_place_with_a_reused_buffer():
+    state = play(GameState(seed=5, max_enemies=40, spawn_interval=30, wave_size=4), 300)
+    buffer = state.snapshot()
+    expected = play(GameState.from_snapshot(buffer), 200).snapshot()
+    play(state, 500)
+    state.restore(buffer)
+    assert state.snapshot(buffer) is buffer
+    assert same_snapshot(play(state, 200).snapshot(), expected)
+
+def test_snapshot_keeps_the_trap_on_the_same_enemies():
+    state = GameState(seed=1, initial_enemies=6)
+    for _ in range(2000):
+        play(state, 1)
+        if state.tank_snake.trap_active:
+            break
+    else:
+        pytest.skip("the trap never armed on this seed")
+    trapped = state.enemies.trapped[:state.enemies.count].copy()
+    clone = GameState.from_snapshot(state.snapshot())
+    assert clone.tank_snake.trap_active
+    assert np.array_equal(clone.enemies.trapped[:clone.enemies.count], trapped)
+
+def test_restore_rejects_another_layout():
+    buffer = GameState(seed=0).snapshot()
+    buffer[0] += 1
+    with pytest.raises(ValueError):
+        GameState(seed=0).restore(buffer)
@@ -0,0 +1,67 @@
+"""
+Tests for SpatialHash and the collision paths that use it
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+import sherman_tank_snake as game
+from spatial_hash import SpatialHash
+from stress import circle_driving
+
+def brute_force_neighbours(xs, ys, x, y, radius, width, height):
+    """Indices within `radius` of (x, y) across the wrapping field"""
+    dx = (xs - x + width / 2) % width - width / 2
+    dy = (ys - y + height / 2) % height - height / 2
+    return set(np.flatnonzero(dx * dx + dy * dy < radius * radius).tolist())
+
+def test_spatial_hash_empty():
+    grid = SpatialHash(800, 600, 40)
+    grid.rebuild(np.zeros(0), np.zeros(0))
+    assert len(grid.query_point(10, 10, 50)) == 0
+    query, points = grid.query_pairs(np.array([1.0]), np.array([1.0]), 50)
+    assert len(query) == len(points) == 0
+
+def test_spatial_hash_sees_across_the_wrap():
+    grid = SpatialHash(800, 600, 40)
+    xs = np.array([2.0, 798.0, 400.0, 2.0])
+    ys = np.array([2.0, 598.0, 300.0, 597.0])
+    grid.rebuild(xs, ys)
+    assert {0, 1, 3} <= set(grid.query_point(0.0, 0.0, 10).tolist())
+    assert 2 not in grid.query_point(0.0, 0.0, 10).tolist()
+
+def test_spatial_hash_candidates_cover_every_neighbour():
+    rng = np.random.default_rng(0)
+    width, height = 800, 600
+    # Points on and beyond the field edges, as positions are before wrapping
+    xs = rng.uniform(-20, width + 20, 500)
+    ys = rng.uniform(-20, height + 20, 500)
+    xs[:4] = (0.0, width, 40.0, width - 40.0)
+    grid = SpatialHash(width, height, 40)
+    grid.rebuild(xs, ys)
+    for radius in (5, 40, 55, 1000):
+        for x, y in ((0.0, 0.0), (width, height), (400.0, 300.0), (39.999, 40.0)):
+            candidates = grid.query_point(x, y, radius)
+            assert np.all(np.diff(candidates) > 0)  # Ascending, no index twice
+            assert brute_force_neighbours(xs, ys, x, y, radius, width, height) <= set(candidates.tolist())
+
+def test_spatial_hash_field_smaller_than_a_cell():
+    grid = SpatialHash(30, 30, 40)
+    assert grid.num_cells == 1
+    grid.rebuild(np.array([1.0, 29.0]), np.array([29.0, 1.0]))
+    assert grid.query_point(15, 15, 1).tolist() == [0, 1]
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_hashed_collisions_match_direct_scans(monkeypatch, seed):
+    def play(direct_scan_enemies):
+        monkeypatch.setattr(game, "DIRECT_SCAN_ENEMIES", direct_scan_enemies)
+        state = game.GameState(seed, max_enemies=300, spawn_interval=10, wave_size=40, max_length=60)
+        for _ in range(400):
+            if not state.step(game.InputFrame(**circle_driving(state.frame_count))):
+                break
+        snapshot = state.snapshot()
+        return snapshot[:int(snapshot[1])]
+    assert np.array_equal(play(10 ** 9), play(-1))
@@ -0,0 +1,43 @@
+"""
+Tests for SpriteCache: cached sprites look like the live drawing they stand in for
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import sherman_tank_snake as game
+from sprite_cache import SpriteCache, TANK_CENTER
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+def canvas():
+    surface = pygame.Surface((80, 80))
+    surface.fill(game.BLACK)
+    return surface
+
+@pytest.mark.parametrize("direction", [0, 8, 90, 212])
+def test_tank_sprite_matches_live_drawing(direction):
+    tank_snake = game.TankSnake(400, 300)
+    tank_snake.direction = direction
+    live = canvas()
+    tank_snake.draw_realistic_tank(live, 40, 40)
+    cached = canvas()
+    sprite = SpriteCache().tank(direction, tank_snake.damage_level, tank_snake.tank_color, game.draw_tank)
+    cached.blit(sprite, (40 - TANK_CENTER, 40 - TANK_CENTER))
+    assert pygame.image.tobytes(cached, "RGB") == pygame.image.tobytes(live, "RGB")
+
+def test_enemy_sprite_matches_live_drawing():
+    live = canvas()
+    game.draw_enemy(live, 40, 40, 12, game.RED)
+    cached = canvas()
+    cached.blit(SpriteCache().enemy(12, game.RED, game.draw_enemy), (40 - 12, 40 - 12))
+    assert pygame.image.tobytes(cached, "RGB") == pygame.image.tobytes(live, "RGB")
+
+def test_tank_sprites_are_reused_per_heading():
+    sprites = SpriteCache()
+    first = sprites.tank(90, 0, game.GREEN, game.draw_tank)
+    assert sprites.tank(90, 0, game.GREEN, game.draw_tank) is first
@@ -0,0 +1,45 @@
+"""
+Tests for the parameter sweep: tuned games, and small sweeps in this process and across worker processes
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import json
+
+import numpy as np
+import pytest
+
+from sweep import TunedGameState, parse_grid, run_sweep
+
+def test_tuned_games_apply_parameters_and_keep_them_in_clones():
+    state = TunedGameState(3, {"enemy_speed": 0.5, "enemy_size": 9, "base_speed": 4.0, "max_enemies": 30})
+    assert state.tank_snake.speed == 4.0
+    n = state.enemies.count
+    assert n and np.all(state.enemies.speed[:n] == 0.5) and np.all(state.enemies.size[:n] == 9)
+    clone = state.clone(state.snapshot())
+    clone.spawn_enemy()
+    n = clone.enemies.count
+    assert clone.enemies.speed[n - 1] == 0.5 and clone.enemies.size[n - 1] == 9
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        TunedGameState(0, {"warp_factor": 9})
+    with pytest.raises(ValueError):
+        parse_grid(["warp_factor=1,2"])
+    assert parse_grid(["enemy_speed=1.5,2"]) == {"enemy_speed": [1.5, 2]}
+
+def test_sweep_smoke_run(tmp_path):
+    path = tmp_path / "results.jsonl"
+    summaries = run_sweep({"enemy_speed": [1.5, 2.5]}, games=2, policy="circle", max_ticks=200, workers=0,
+                          results_path=path)
+    assert [summary["parameters"] for summary in summaries] == [{"enemy_speed": 1.5}, {"enemy_speed": 2.5}]
+    assert all(summary["games"] == 2 and 0 < summary["ticks"]["max"] <= 200 for summary in summaries)
+    results = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(results) == 4 and {result["seed"] for result in results} == {0, 1}
+
+def test_worker_processes_give_the_same_results():
+    grid = {"wave_size": [2, 6]}
+    in_process = run_sweep(grid, games=3, policy="random", max_ticks=300, workers=0)
+    pooled = run_sweep(grid, games=3, policy="random", max_ticks=300, workers=2, chunk_size=1)
+    assert pooled == in_process
@@ -0,0 +1,78 @@
+"""
+Tests for TrailBuffer, the ring buffer behind the tank's trail
+"""
+
+import pytest
+
+from trail_buffer import TrailBuffer
+
+def test_trail_wraps_around_the_ring_without_growing():
+    trail = TrailBuffer(0.0, 0.0, capacity=4)
+    for i in range(1, 11):
+        trail.set_head(float(i), float(-i))
+        trail.push_head()
+        trail.pop_oldest()
+    assert trail.capacity == 4
+    assert len(trail) == 1
+    assert trail.head() == (10.0, -10.0)
+
+def test_trail_views_are_contiguous_across_the_wrap():
+    trail = TrailBuffer(0.0, 0.0, capacity=4)
+    for i in range(1, 6):
+        trail.set_head(float(i), 0.0)
+        trail.push_head()
+        if len(trail) > 3:
+            trail.pop_oldest()
+    assert trail.start + trail.count > trail.capacity  # The live entries straddle the end of the ring
+    xs, _, _ = trail.views()
+    assert xs.tolist() == [5.0, 5.0, 4.0]
+    assert [entry[0] for entry in trail] == [5.0, 5.0, 4.0]
+
+def test_trail_grows_when_full_keeping_order():
+    trail = TrailBuffer(0.0, 0.0, capacity=2)
+    trail.push_head()
+    trail.pop_oldest()  # Move the ring start off slot 0 before growing
+    assert trail.start == 1
+    for i in range(1, 6):
+        trail.set_head(float(i), 0.0)
+        trail.push_head()
+    assert trail.capacity >= len(trail) == 6
+    xs, _, _ = trail.entries()
+    assert xs.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 5.0]
+    assert [entry[0] for entry in trail] == xs[::-1].tolist()
+
+def test_trail_expiry_keeps_the_head():
+    trail = TrailBuffer(0.0, 0.0, lifetime=3, capacity=4)
+    trail.push_head()
+    trail.push_head()
+    for _ in range(10):
+        trail.advance()
+    assert len(trail) == 1
+    assert trail[0][2] == 3  # The head never ages
+
+def test_trail_index_out_of_range():
+    trail = TrailBuffer(1.0, 2.0)
+    assert trail[-1] == trail[0]
+    with pytest.raises(IndexError):
+        trail[1]
+
+def test_views_skip_segments_close_to_expiry():
+    trail = TrailBuffer(0.0, 0.0, lifetime=10, capacity=4)
+    for i in range(1, 5):
+        trail.advance()
+        trail.set_head(float(i), 0.0)
+        trail.push_head()
+    xs, _, births = trail.views(min_lifetime=7)
+    assert xs.tolist() == [4.0, 4.0, 3.0, 2.0]  # The segment left at tick 1 has 7 ticks left
+    assert trail.lifetimes(births).tolist() == [10, 10, 9, 8]
+
+def test_load_round_trips_entries():
+    trail = TrailBuffer(0.0, 0.0, capacity=2)
+    for i in range(1, 4):
+        trail.advance()
+        trail.set_head(float(i), float(i))
+        trail.push_head()
+    saved = [column.copy() for column in trail.entries()]
+    other = TrailBuffer(9.0, 9.0, capacity=2)
+    other.load(*saved, trail.tick)
+    assert list(other) == list(trail)
@@ -0,0 +1,40 @@
+"""
+Font and rendered-text cache
+"""
+
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """Loads each font once and keeps rendered strings around for reuse.
+
+    Rendered surfaces are keyed by (font, size, string, colour) and evicted
+    least-recently-used once more than `max_entries` are held, so text that
+    changes every frame (timers, counters) cannot grow the cache without bound.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.rendered = OrderedDict()
+
+    def font(self, size, name=None):
+        """pygame Font for a file name (None = default font) and size, loaded once"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, color, size, name=None):
+        """Antialiased surface for a string, rendered on first use only"""
+        key = (name, size, text, color)
+        surface = self.rendered.get(key)
+        if surface is not None:
+            self.rendered.move_to_end(key)
+            return surface
+        surface = self.font(size, name).render(text, True, color)
+        self.rendered[key] = surface
+        if len(self.rendered) > self.max_entries:
+            self.rendered.popitem(last=False)
+        return surface
@@ -0,0 +1,138 @@
+"""
+Chrome trace (chrome://tracing, Perfetto) export of frame phases and game events
+"""
+
+import json
+import threading
+import time
+import numpy as np
+
+COMPLETE = 0  # "X": a phase with a start and a duration
+INSTANT = 1   # "i": a point-in-time game event
+
+class TraceRecorder:
+    """Records trace events into a preallocated ring and streams them to a JSON file.
+
+    The game thread only writes into fixed-size arrays (timestamp, duration,
+    interned name, kind) plus a slot for event args; a background thread wakes
+    every `flush_interval` seconds, formats whatever has been recorded since
+    its last pass and appends it to the file. If the writer falls more than
+    `capacity` events behind, the oldest ones are dropped and counted in
+    `dropped` rather than stalling the frame.
+
+    The file uses the JSON array trace format, which viewers load even when
+    the closing bracket is missing, so a crashed session is still readable.
+    """
+    def __init__(self, path, capacity=1 << 16, flush_interval=0.5, clock=time.perf_counter):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.origin = clock()
+        self.start = np.zeros(capacity)
+        self.duration = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.name_id = np.zeros(capacity, dtype=np.int32)
+        self.args = [None] * capacity
+        self.names = []
+        self.name_ids = {}
+        self.head = 0  # Events ever recorded; the next one goes in slot head % capacity
+        self.tail = 0  # Events already handed to the file
+        self.dropped = 0
+        self.written = 0
+
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.first = True
+        self.stop = threading.Event()
+        self.lock = threading.Lock()  # Serializes flushes (writer thread vs close)
+        self.thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self.thread.start()
+
+    def _name(self, name):
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+        return name_id
+
+    def _record(self, kind, name, start, duration, args):
+        slot = self.head % self.capacity
+        self.start[slot] = start
+        self.duration[slot] = duration
+        self.kind[slot] = kind
+        self.name_id[slot] = self._name(name)
+        self.args[slot] = args
+        self.head += 1
+
+    def complete(self, name, start, end):
+        """A phase that ran from `start` to `end` (clock seconds)"""
+        self._record(COMPLETE, name, start, end - start, None)
+
+    def instant(self, name, args=None):
+        """A game event happening now, with optional JSON-serializable args"""
+        self._record(INSTANT, name, self.clock(), 0.0, args)
+
+    def on_event(self, event):
+        """EventBus subscriber: each game event becomes an instant on the timeline"""
+        self._record(INSTANT, event.kind, event.time, 0.0, event.fields)
+
+    def _run(self):
+        while not self.stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write everything recorded since the last flush to the file"""
+        with self.lock:
+            if self.file is None:
+                return
+            head = self.head
+            tail = max(self.tail, head - self.capacity)
+            if head == tail:
+                return
+            slots = np.arange(tail, head) % self.capacity
+            start = (self.start[slots] - self.origin) * 1e6
+            duration = self.duration[slots] * 1e6
+            kind = self.kind[slots]
+            name_id = self.name_id[slots]
+            args = [self.args[slot] for slot in slots]
+            # The game may have lapped the ring while we copied; discard anything overwritten
+            # (including the slot it may be half-way through writing)
+            valid_from = min(len(slots), max(0, self.head + 1 - self.capacity - tail))
+            self.dropped += (tail - self.tail) + valid_from
+            self.tail = head
+
+            lines = []
+            for i in range(valid_from, len(slots)):
+                event = {"name": self.names[name_id[i]], "pid": 1, "tid": 1, "ts": round(start[i], 3)}
+                if kind[i] == COMPLETE:
+                    event["ph"] = "X"
+                    event["cat"] = "phase"
+                    event["dur"] = round(duration[i], 3)
+                else:
+                    event["ph"] = "i"
+                    event["cat"] = "game"
+                    event["s"] = "g"
+                    if args[i]:
+                        event["args"] = args[i]
+                lines.append(json.dumps(event))
+            if not lines:
+                return
+            if not self.first:
+                self.file.write(",\n")
+            self.file.write(",\n".join(lines))
+            self.file.flush()
+            self.first = False
+            self.written += len(lines)
+
+    def close(self):
+        """Stop the writer thread, flush what is left and finish the file"""
+        self.stop.set()
+        self.thread.join()
+        self.flush()
+        with self.lock:
+            if self.file is not None:
+                self.file.write("\n]\n")
+                self.file.close()
+                self.file = None
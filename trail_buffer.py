@@ -0,0 +1,135 @@
+"""
+Array-backed ring buffer for the tank's trail
+"""
+
+import numpy as np
+
+class TrailBuffer:
+    """Trail positions stored in preallocated arrays, newest entry is the tank head.
+
+    Each entry keeps the tick it was left behind (its birth) instead of a
+    countdown, so ageing the trail is a single tick increment and expiry just
+    advances the tail. Storage is mirrored (every slot is written twice,
+    `capacity` apart) so any run of entries is one contiguous slice and the
+    views returned below never copy.
+
+    Indexing follows the old deque of (x, y, lifetime) tuples: index 0 is the
+    head and higher indices are older segments.
+    """
+    def __init__(self, x, y, lifetime=999, capacity=16):
+        self.lifetime = lifetime
+        self.capacity = max(2, capacity)
+        self._x = np.zeros(2 * self.capacity)
+        self._y = np.zeros(2 * self.capacity)
+        self._birth = np.zeros(2 * self.capacity)
+        self.start = 0  # Slot of the oldest entry
+        self.count = 0
+        self.tick = 0
+        self._append(x, y)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("trail index out of range")
+        slot = self.start + self.count - 1 - index
+        return (self._x[slot], self._y[slot], self.lifetime_at(self._birth[slot]))
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def lifetime_at(self, birth):
+        """Remaining lifetime of an entry born at `birth` (the head never ages)"""
+        return min(self.lifetime, self.lifetime - (self.tick - birth))
+
+    def _append(self, x, y):
+        if self.count == self.capacity:
+            self._grow()
+        slot = (self.start + self.count) % self.capacity
+        for column, value in ((self._x, x), (self._y, y), (self._birth, np.inf)):
+            column[slot] = value
+            column[slot + self.capacity] = value
+        self.count += 1
+
+    def _grow(self):
+        """Double capacity, laying the entries out from slot 0 again"""
+        xs, ys, births = (self._x[self.start:self.start + self.count].copy(),
+                          self._y[self.start:self.start + self.count].copy(),
+                          self._birth[self.start:self.start + self.count].copy())
+        self.capacity *= 2
+        self._x = np.zeros(2 * self.capacity)
+        self._y = np.zeros(2 * self.capacity)
+        self._birth = np.zeros(2 * self.capacity)
+        for column, values in ((self._x, xs), (self._y, ys), (self._birth, births)):
+            column[:self.count] = values
+            column[self.capacity:self.capacity + self.count] = values
+        self.start = 0
+
+    def _head_slot(self):
+        return (self.start + self.count - 1) % self.capacity
+
+    def head(self):
+        """(x, y) of the tank head"""
+        slot = self._head_slot()
+        return self._x[slot], self._y[slot]
+
+    def set_head(self, x, y):
+        """Move the tank head"""
+        slot = self._head_slot()
+        self._x[slot] = self._x[slot + self.capacity] = x
+        self._y[slot] = self._y[slot + self.capacity] = y
+
+    def push_head(self):
+        """Leave the current head behind as a trail segment and start a new head on top of it"""
+        slot = self._head_slot()
+        self._birth[slot] = self._birth[slot + self.capacity] = self.tick
+        self._append(self._x[slot], self._y[slot])
+
+    def pop_oldest(self):
+        """Drop the oldest trail segment"""
+        if self.count > 1:
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+
+    def advance(self):
+        """Age every segment by one tick and drop the ones that expired"""
+        self.tick += 1
+        while self.count > 1 and self.lifetime - (self.tick - self._birth[self.start]) <= 0:
+            self.pop_oldest()
+
+    def views(self, min_lifetime=0):
+        """Zero-copy (xs, ys, births) views, head first, of entries with lifetime > min_lifetime"""
+        births = self._birth[self.start:self.start + self.count]
+        # Births increase from oldest to head, so the visible entries are a suffix
+        first = np.searchsorted(births, self.tick - self.lifetime + min_lifetime, side="right")
+        end = self.start + self.count
+        begin = self.start + first
+        return (self._x[begin:end][::-1], self._y[begin:end][::-1], self._birth[begin:end][::-1])
+
+    def entries(self):
+        """Zero-copy (xs, ys, births) views, oldest first, for saving the trail"""
+        end = self.start + self.count
+        return self._x[self.start:end], self._y[self.start:end], self._birth[self.start:end]
+
+    def load(self, xs, ys, births, tick):
+        """Replace the contents with saved entries (oldest first) at trail tick `tick`"""
+        count = len(xs)
+        if count > self.capacity:
+            self.capacity = count
+            self._x = np.zeros(2 * count)
+            self._y = np.zeros(2 * count)
+            self._birth = np.zeros(2 * count)
+        for column, values in ((self._x, xs), (self._y, ys), (self._birth, births)):
+            column[:count] = values
+            column[self.capacity:self.capacity + count] = values
+        self.start = 0
+        self.count = count
+        self.tick = tick
+
+    def lifetimes(self, births):
+        """Remaining lifetimes for a births view (head reports the full lifetime)"""
+        return np.minimum(self.lifetime, self.lifetime - (self.tick - births))